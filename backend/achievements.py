@@ -0,0 +1,180 @@
+# backend/achievements.py
+
+import json
+from collections import namedtuple
+from typing import List, Optional
+
+from sqlalchemy import case, func, update
+from sqlalchemy.orm import Session
+
+from backend.database import SessionLocal, insert_if_missing
+from backend.models import (Exercise, ProgressLog, SavedExercise, UserAchievement, UserCounters,
+                            UserStreak, WorkoutLog)
+
+# The four categories the app files exercises under (see the add/edit workout screens)
+CATEGORIES = ("with equipment", "without equipment", "outdoor", "wellness")
+
+# Event names a rule can subscribe to
+WORKOUT = "workout"
+PROGRESS = "progress"
+SAVED = "saved"
+
+# A badge is awarded the first time `check` holds after one of its `events` arrives
+Rule = namedtuple("Rule", ["badge", "events", "check"])
+
+RULES = [
+    Rule("First Workout", {WORKOUT}, lambda c: c.workouts_completed >= 1),
+    Rule("10 Workouts", {WORKOUT}, lambda c: c.workouts_completed >= 10),
+    Rule("50 Workouts", {WORKOUT}, lambda c: c.workouts_completed >= 50),
+    Rule("First Check-In", {PROGRESS}, lambda c: c.progress_logged >= 1),
+    Rule("7-Day Streak", {WORKOUT, PROGRESS}, lambda c: c.longest_streak >= 7),
+    Rule("30-Day Streak", {WORKOUT, PROGRESS}, lambda c: c.longest_streak >= 30),
+    Rule("Tried Every Category", {WORKOUT}, lambda c: set(CATEGORIES) <= c.categories),
+    Rule("Collector", {SAVED}, lambda c: c.saved_count >= 10),
+]
+
+
+class CounterView:
+    """Read-only snapshot of a user's counters handed to rule checks."""
+
+    def __init__(self, counters: UserCounters, streak: Optional[UserStreak]):
+        self.workouts_completed = counters.workouts_completed or 0
+        self.progress_logged = counters.progress_logged or 0
+        self.saved_count = counters.saved_count or 0
+        self.categories = set(json.loads(counters.categories_tried or "[]"))
+        self.longest_streak = streak.longest_streak if streak else 0
+
+
+def _counters(db: Session, user_id: int) -> Optional[UserCounters]:
+    """The user's counters as they are in the database now, not as an earlier get() saw them."""
+    return db.get(UserCounters, user_id, populate_existing=True)
+
+
+def _update_counters(db: Session, user_id: int, **values):
+    """Creates the row if needed, then applies `values` (column expressions) in one UPDATE.
+
+    Concurrent requests each add their own increment instead of writing back a total
+    they read earlier, and the UPDATE holds the row lock until the caller commits.
+    """
+    insert_if_missing(db, UserCounters, {"user_id": user_id, "workouts_completed": 0, "progress_logged": 0,
+                                         "saved_count": 0, "categories_tried": "[]"})
+    db.execute(update(UserCounters).where(UserCounters.user_id == user_id).values(**values)
+               .execution_options(synchronize_session=False))
+
+
+def evaluate(db: Session, user_id: int, event: Optional[str] = None) -> List[str]:
+    """Awards any newly satisfied badges. Only rules listening to `event` are checked
+    (all rules when event is None). Returns the badges awarded by this call. The caller commits."""
+    rules = [rule for rule in RULES if event is None or event in rule.events]
+    if not rules:
+        return []
+
+    awarded = {
+        badge for (badge,) in db.query(UserAchievement.badge).filter(UserAchievement.user_id == user_id)
+    }
+    view = CounterView(_counters(db, user_id) or UserCounters(), db.get(UserStreak, user_id))
+
+    new_badges = []
+    for rule in rules:
+        if rule.badge not in awarded and rule.check(view):
+            db.add(UserAchievement(user_id=user_id, badge=rule.badge))
+            new_badges.append(rule.badge)
+    if new_badges:
+        db.flush()
+    return new_badges
+
+
+def on_workout_logged(db: Session, user_id: int, exercise: Exercise) -> List[str]:
+    _update_counters(db, user_id, workouts_completed=UserCounters.workouts_completed + 1)
+
+    try:
+        tags = json.loads(exercise.tags) if exercise.tags else []
+    except json.decoder.JSONDecodeError:
+        tags = []
+    # Read after the UPDATE above took the row lock, so no concurrent workout can
+    # rewrite the list between this read and the write below
+    tried = set(json.loads(_counters(db, user_id).categories_tried or "[]"))
+    new = {tag.lower() for tag in tags if tag.lower() in CATEGORIES} - tried
+    if new:
+        _update_counters(db, user_id, categories_tried=json.dumps(sorted(tried | new)))
+
+    return evaluate(db, user_id, WORKOUT)
+
+
+def on_progress_logged(db: Session, user_id: int) -> List[str]:
+    _update_counters(db, user_id, progress_logged=UserCounters.progress_logged + 1)
+    return evaluate(db, user_id, PROGRESS)
+
+
+def on_saved_toggled(db: Session, user_id: int, saved: bool) -> List[str]:
+    if saved:
+        _update_counters(db, user_id, saved_count=UserCounters.saved_count + 1)
+        return evaluate(db, user_id, SAVED)
+    _update_counters(db, user_id,
+                     saved_count=case((UserCounters.saved_count > 0, UserCounters.saved_count - 1), else_=0))
+    return []
+
+
+def get_achievements(db: Session, user_id: int) -> List[str]:
+    rows = (
+        db.query(UserAchievement.badge)
+        .filter(UserAchievement.user_id == user_id)
+        .order_by(UserAchievement.awarded_at, UserAchievement.id)
+        .all()
+    )
+    return [row.badge for row in rows]
+
+
+def backfill_achievements(db: Session) -> int:
+    """Seeds counters from history for users that predate the engine, then evaluates every rule.
+    Run backfill_streaks() first so streak badges see the right longest streak."""
+    totals = {}
+
+    def bump(field, rows):
+        for user_id, count in rows:
+            totals.setdefault(user_id, {})[field] = count
+
+    bump("workouts_completed",
+         db.query(WorkoutLog.user_id, func.count(WorkoutLog.id)).group_by(WorkoutLog.user_id))
+    bump("progress_logged",
+         db.query(ProgressLog.user_id, func.count(ProgressLog.id)).group_by(ProgressLog.user_id))
+    bump("saved_count",
+         db.query(SavedExercise.user_id, func.count(SavedExercise.id)).group_by(SavedExercise.user_id))
+
+    categories = {}
+    tried = (
+        db.query(WorkoutLog.user_id, Exercise.tags)
+        .join(Exercise, Exercise.id == WorkoutLog.exercise_id)
+        .distinct()
+    )
+    for user_id, tags in tried:
+        try:
+            tag_list = json.loads(tags) if tags else []
+        except json.decoder.JSONDecodeError:
+            tag_list = []
+        categories.setdefault(user_id, set()).update(t.lower() for t in tag_list if t.lower() in CATEGORIES)
+
+    for user_id in set(totals) | set(categories):
+        counts = totals.get(user_id, {})
+        db.merge(UserCounters(
+            user_id=user_id,
+            workouts_completed=counts.get("workouts_completed", 0),
+            progress_logged=counts.get("progress_logged", 0),
+            saved_count=counts.get("saved_count", 0),
+            categories_tried=json.dumps(sorted(categories.get(user_id, set()))),
+        ))
+    db.flush()
+
+    for user_id in set(totals) | set(categories):
+        evaluate(db, user_id)
+    db.commit()
+    return len(set(totals) | set(categories))
+
+
+# ✅ Backfill job for existing users: python -m backend.achievements
+if __name__ == "__main__":
+    session = SessionLocal()
+    try:
+        print(f"✅ Backfilled achievement counters for {backfill_achievements(session)} users.")
+    finally:
+        session.close()
@@ -0,0 +1,97 @@
+# backend/async_database.py
+
+import os
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from backend.database import DATABASE_URL, ENGINE_PROFILES, engine_profile
+from backend.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Set ASYNC_DB=1 to serve the hot routes from backend/routes/async_api.py instead of the
+# threadpool-bound sync handlers. Requires the async driver for your database.
+ASYNC_DB_ENABLED = os.getenv("ASYNC_DB", "0").lower() in ("1", "true", "yes")
+
+# Sync driver name -> async driver used for the same database
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+    "mariadb": "mariadb+aiomysql",
+}
+
+
+def async_url(url: str) -> str:
+    """Rewrites e.g. mysql+mysqlconnector://... to mysql+aiomysql://..."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    return parsed.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+
+def build_async_engine(url: str, profile: Optional[str] = None, **overrides) -> AsyncEngine:
+    """Async counterpart of build_engine(): same profile, async driver and pool."""
+    profile = profile or os.getenv("DB_PROFILE") or engine_profile(url)
+    options = dict(ENGINE_PROFILES[profile])
+    pragmas = options.pop("pragmas", {})
+    # The sync profiles use a QueuePool subclass; async engines need their own adapted pool
+    if options.get("poolclass") is not StaticPool:
+        options.pop("poolclass", None)
+    if profile != "sqlite_memory":
+        options.pop("connect_args", None)
+    options.update(overrides)
+
+    new_engine = create_async_engine(async_url(url), **options)
+
+    if pragmas:
+        @event.listens_for(new_engine.sync_engine, "connect")
+        def _apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+    return new_engine
+
+
+# Created lazily so the async driver is only needed when ASYNC_DB is on
+async_engine: Optional[AsyncEngine] = None
+AsyncSessionLocal: Optional[async_sessionmaker] = None
+
+
+def init_async_db(url: str = DATABASE_URL):
+    global async_engine, AsyncSessionLocal
+    if async_engine is None:
+        async_engine = build_async_engine(url)
+        AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+        logger.info("Async database engine ready", extra={"driver": async_engine.url.drivername})
+    return async_engine
+
+
+def own_session(bind: AsyncEngine) -> AsyncSession:
+    """A session not tied to any request, for loads shared between requests (single-flight).
+
+    The request that starts a coalesced load may disconnect, and get_async_db() then
+    closes its session while other requests still wait on the load.
+    """
+    if bind is async_engine:
+        return AsyncSessionLocal()
+    return AsyncSession(bind, expire_on_commit=False, autoflush=False)
+
+
+async def dispose_async_db():
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
+# Dependency to get an async database session
+async def get_async_db():
+    init_async_db()
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,183 @@
+# backend/catalog.py
+
+import json
+import os
+from collections import Counter
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend import serializers
+from backend.async_database import own_session
+from backend.database import exercise_to_dict, insert_if_missing, insert_returning, update_returning
+from backend.invalidation import bus
+from backend.models import CatalogState, Exercise, ExerciseTombstone
+from backend.singleflight import CoalescingCache
+
+CATALOG_CACHE_SIZE = int(os.getenv("CATALOG_CACHE_SIZE", "16"))
+# Safety net for writes that bypass the routes; route writes invalidate through the bus
+CATALOG_CACHE_TTL = float(os.getenv("CATALOG_CACHE_TTL", "300"))
+
+# Full exercise list and facet counts, keyed by engine so each database (and test) has its own
+catalog_cache = CoalescingCache("catalog", maxsize=CATALOG_CACHE_SIZE, ttl=CATALOG_CACHE_TTL)
+bus.subscribe("catalog", lambda key: catalog_cache.invalidate())
+
+EXERCISE_DETAIL_CACHE_SIZE = int(os.getenv("EXERCISE_DETAIL_CACHE_SIZE", "512"))
+EXERCISE_DETAIL_CACHE_TTL = float(os.getenv("EXERCISE_DETAIL_CACHE_TTL", "600"))
+
+# (engine, exercise_id) -> serialized GET /exercise/{id} body, or None for an unknown id
+exercise_details = CoalescingCache(
+    "exercise_detail", maxsize=EXERCISE_DETAIL_CACHE_SIZE, ttl=EXERCISE_DETAIL_CACHE_TTL)
+
+
+def _drop_exercise_detail(key: str):
+    exercise_id = int(key.split(":", 1)[1])
+    exercise_details.invalidate_where(lambda cached: cached[1] == exercise_id)
+
+
+bus.subscribe("exercise:", _drop_exercise_detail)
+
+
+def current_version(db: Session) -> int:
+    state = db.get(CatalogState, 1)
+    return state.version if state else 0
+
+
+def bump_version(db: Session) -> int:
+    """Increments the catalog version inside the caller's transaction and returns it.
+
+    The UPDATE takes a row lock, so concurrent catalog writes get distinct,
+    commit-ordered versions. The row is seeded with the tables (ensure_catalog_state);
+    a database created some other way gets it here with an insert-or-ignore, which
+    two first writers can both run safely.
+    """
+    version = update_returning(db, CatalogState, 1, {"version": CatalogState.version + 1}, CatalogState.version)
+    if version is None:
+        insert_if_missing(db, CatalogState, {"id": 1, "version": 0})
+        version = update_returning(db, CatalogState, 1, {"version": CatalogState.version + 1}, CatalogState.version)
+    return version.version
+
+
+def insert_exercise(db: Session, values: dict):
+    """Adds an exercise stamped with a new catalog version; returns its row. The caller commits."""
+    row = insert_returning(db, Exercise, {**values, "version": bump_version(db)}, *Exercise.__table__.c)
+    # SQLite can reuse the id of a deleted row
+    db.query(ExerciseTombstone).filter(ExerciseTombstone.exercise_id == row.id).delete()
+    return row
+
+
+def update_exercise(db: Session, exercise_id: int, values: dict):
+    """Applies `values` and a new catalog version; returns the updated row, or None if there is no such exercise."""
+    return update_returning(db, Exercise, exercise_id, {**values, "version": bump_version(db)}, *Exercise.__table__.c)
+
+
+def record_delete(db: Session, exercise_id: int) -> int:
+    """Leaves a tombstone for a deleted exercise. The caller commits."""
+    version = bump_version(db)
+    db.merge(ExerciseTombstone(exercise_id=exercise_id, version=version))
+    return version
+
+
+def changes_since(db: Session, since: int) -> dict:
+    """Upserts and deletions after version `since`.
+
+    The whole catalog comes back ("full": true) when since <= 0 or when `since` is
+    ahead of the server, e.g. a client that synced against a database since replaced.
+
+    Clients apply `deleted` first, then `upserts`, and store `version` for the next call.
+    """
+    version = current_version(db)
+    full = since <= 0 or since > version
+    if full:
+        exercises = db.query(Exercise).all()
+        deleted = []
+    else:
+        exercises = db.query(Exercise).filter(Exercise.version > since).all()
+        deleted = [
+            exercise_id for (exercise_id,) in
+            db.query(ExerciseTombstone.exercise_id).filter(ExerciseTombstone.version > since)
+        ]
+    return {
+        "version": version,
+        "full": full,
+        "upserts": [exercise_to_dict(ex) for ex in exercises],
+        "deleted": deleted,
+    }
+
+
+def all_exercises(db: Session) -> list:
+    """exercise_to_dict() of every exercise. Shared by all callers; do not mutate."""
+    return catalog_cache.get_or_load(
+        (db.get_bind(), "all"), lambda: [exercise_to_dict(ex) for ex in db.scalars(select(Exercise))])
+
+
+async def all_exercises_async(db: AsyncSession) -> list:
+    bind = db.bind
+
+    async def load():
+        async with own_session(bind) as session:
+            return [exercise_to_dict(ex) for ex in (await session.scalars(select(Exercise)))]
+
+    return await catalog_cache.get_or_load_async((bind, "all"), load)
+
+
+def search_exercises(db: Session, search_query: Optional[str]) -> list:
+    """Name search; searches are too varied to cache, so only the full list goes through catalog_cache."""
+    if not search_query:
+        return all_exercises(db)
+    query = select(Exercise).where(Exercise.name.ilike(f"%{search_query.lower()}%"))
+    return [exercise_to_dict(ex) for ex in db.scalars(query)]
+
+
+def facet_counts(db: Session) -> dict:
+    """Exercises per toughness and per tag, for filter chips."""
+    def load():
+        toughness = {
+            level: count for level, count in
+            db.execute(select(Exercise.toughness, func.count()).group_by(Exercise.toughness))
+            if level is not None
+        }
+        tags = Counter()
+        for (raw,) in db.execute(select(Exercise.tags)):
+            tags.update(json.loads(raw) if raw else [])
+        return {"toughness": toughness, "tags": dict(tags.most_common())}
+
+    return catalog_cache.get_or_load((db.get_bind(), "facets"), load)
+
+
+def exercise_detail(exercise: Exercise) -> dict:
+    """GET /exercise/{exercise_id} payload; unparseable tags come back as []."""
+    try:
+        tags = json.loads(exercise.tags) if exercise.tags else []
+    except json.decoder.JSONDecodeError:
+        tags = []
+    return {
+        "name": exercise.name,
+        "image_url": exercise.media_url,
+        "description": exercise.description,
+        "tags": tags,
+        "suggested_reps": exercise.suggested_reps,
+        "toughness": exercise.toughness,
+    }
+
+
+def _detail_body(exercise: Optional[Exercise]) -> Optional[bytes]:
+    return None if exercise is None else serializers.exercise_detail.dump_json(exercise_detail(exercise))
+
+
+def exercise_detail_body(db: Session, exercise_id: int) -> Optional[bytes]:
+    """Serialized detail JSON, or None when the id doesn't exist (cached as well, until an add reuses it)."""
+    return exercise_details.get_or_load(
+        (db.get_bind(), exercise_id), lambda: _detail_body(db.get(Exercise, exercise_id)))
+
+
+async def exercise_detail_body_async(db: AsyncSession, exercise_id: int) -> Optional[bytes]:
+    bind = db.bind
+
+    async def load():
+        async with own_session(bind) as session:
+            return _detail_body(await session.get(Exercise, exercise_id))
+
+    return await exercise_details.get_or_load_async((bind, exercise_id), load)
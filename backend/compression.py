@@ -0,0 +1,121 @@
+# backend/compression.py
+
+import gzip
+import hashlib
+import os
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.cache import LRUCache
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+# Bodies smaller than this go out as-is; below ~1 KB the headers outweigh the savings
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+COMPRESSION_CACHE_SIZE = int(os.getenv("COMPRESSION_CACHE_SIZE", "64"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+
+COMPRESSIBLE_TYPES = ("application/json", "application/msgpack")
+# Responses shared by every client; their compressed bodies are cached by content digest,
+# so the catalog is compressed once per version instead of once per request
+CACHEABLE_ROUTES = {"/exercises/", "/exercise/{exercise_id}"}
+
+compressed_bodies = LRUCache(maxsize=COMPRESSION_CACHE_SIZE)
+
+
+def accepted_encoding(accept_encoding: str):
+    """Picks br or gzip from an Accept-Encoding header (honouring q=0), or None."""
+    offered = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        offered[name.strip()] = q
+    wildcard = offered.get("*", 0)
+    for encoding in (("br",) if brotli is not None else ()) + ("gzip",):
+        if offered.get(encoding, wildcard) > 0:
+            return encoding
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+def _vary(headers: MutableHeaders, header: str) -> str:
+    current = headers.get("vary")
+    return f"{current}, {header}" if current else header
+
+
+class CompressionMiddleware:
+    """gzip/brotli for JSON and MessagePack bodies of COMPRESSIBLE_TYPES.
+
+    Plain ASGI: other responses, event streams included, go straight through without
+    buffering or an extra task. Compressible ones are held until their last chunk.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = accepted_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        held = None  # the http.response.start of a response being buffered
+        chunks = []
+
+        async def send_compressed(message: Message):
+            nonlocal held
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                media_type = headers.get("content-type", "").split(";")[0]
+                if (media_type in COMPRESSIBLE_TYPES and message["status"] == 200
+                        and "content-encoding" not in headers):
+                    held = message
+                    return
+            elif message["type"] == "http.response.body" and held is not None:
+                chunks.append(message.get("body", b""))
+                if message.get("more_body", False):
+                    return
+                message = self._compressed(scope, held, b"".join(chunks), encoding)
+                await send(held)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+    @staticmethod
+    def _compressed(scope: Scope, start: Message, body: bytes, encoding: str) -> Message:
+        """Rewrites `start`'s headers in place (repeated ones such as Set-Cookie kept) and returns the body message."""
+        headers = MutableHeaders(scope=start)
+        del headers["content-length"]
+        if len(body) >= COMPRESSION_MIN_BYTES:
+            route = getattr(scope.get("route"), "path", None)
+            if scope["method"] == "GET" and route in CACHEABLE_ROUTES:
+                key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+                compressed = compressed_bodies.get(key)
+                if compressed is None:
+                    compressed = compress(body, encoding)
+                    compressed_bodies.set(key, compressed)
+            else:
+                compressed = compress(body, encoding)
+            body = compressed
+            headers["vary"] = _vary(headers, "Accept-Encoding")
+            headers["content-encoding"] = encoding
+        headers["content-length"] = str(len(body))
+        return {"type": "http.response.body", "body": body}
@@ -1,36 +1,339 @@
 from pydantic import BaseModel
-from typing import List
-from sqlalchemy import create_engine
+from typing import List, Optional
+from sqlalchemy import create_engine, event, insert, inspect, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import IntegrityError, TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
+from fastapi import HTTPException, Request
+from sqlalchemy.pool import QueuePool, StaticPool
+import json
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
+from backend.invalidation import bus
+from backend.logger import get_logger
+from backend.singleflight import CoalescingCache
+
+logger = get_logger(__name__)
+
 # Load environment variables from the .env file
 load_dotenv()
 
 # Retrieve the DATABASE_URL from environment variables
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Optional read replica for GET endpoints; falls back to the primary when unset
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL")
+# How long a writer's reads stay pinned to the primary after a write
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+# Profiles kept by get_user_data(); about 1 KB each
+USER_PROFILE_CACHE_SIZE = int(os.getenv("USER_PROFILE_CACHE_SIZE", "10000"))
+USER_PROFILE_CACHE_TTL = float(os.getenv("USER_PROFILE_CACHE_TTL", "300"))
+# Unknown ids are remembered for less time, in case a user is created outside signup
+USER_PROFILE_NEGATIVE_TTL = float(os.getenv("USER_PROFILE_NEGATIVE_TTL", "30"))
+
+
+class PoolStats:
+    """Counters for how long requests wait to check a connection out of the pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, waited: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "total_wait_ms": round(self.total_wait * 1000, 3),
+                "avg_wait_ms": round(self.total_wait * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records checkout wait time in `self.stats`."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        self.stats.record(time.perf_counter() - start)
+        return record
+
+
+# Tuned defaults per backend. Pool settings can be overridden with the DB_* environment
+# variables read in build_engine(); "pragmas" are applied to every new SQLite connection.
+ENGINE_PROFILES = {
+    "sqlite_file": {
+        "poolclass": TimedQueuePool,
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "connect_args": {"check_same_thread": False},
+        "pragmas": {
+            "journal_mode": "WAL",      # readers no longer block the writer
+            "synchronous": "NORMAL",    # fsync on checkpoint, not on every commit (safe with WAL)
+            "busy_timeout": 5000,       # wait up to 5 s for the write lock instead of failing with "database is locked"
+            "temp_store": "MEMORY",
+            "cache_size": -20000,       # ~20 MB page cache per connection
+        },
+    },
+    "sqlite_memory": {
+        # One shared connection, otherwise every checkout would see an empty database
+        "poolclass": StaticPool,
+        "connect_args": {"check_same_thread": False},
+    },
+    "postgres": {
+        "poolclass": TimedQueuePool,
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 10,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+    },
+    "mysql": {
+        "poolclass": TimedQueuePool,
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 10,
+        "pool_pre_ping": True,
+        "pool_recycle": 3600,           # stay under the server's wait_timeout
+    },
+}
+
+# Environment overrides: variable name -> (engine argument, parser)
+_POOL_ENV = {
+    "DB_POOL_SIZE": ("pool_size", int),
+    "DB_MAX_OVERFLOW": ("max_overflow", int),
+    "DB_POOL_TIMEOUT": ("pool_timeout", float),
+    "DB_POOL_RECYCLE": ("pool_recycle", int),
+    "DB_POOL_PRE_PING": ("pool_pre_ping", lambda v: v.lower() in ("1", "true", "yes")),
+}
+
+
+def engine_profile(url: str) -> str:
+    """Picks the ENGINE_PROFILES key for a database URL."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "sqlite":
+        memory = parsed.database in (None, "", ":memory:") or "mode=memory" in str(parsed)
+        return "sqlite_memory" if memory else "sqlite_file"
+    if backend == "postgresql":
+        return "postgres"
+    if backend in ("mysql", "mariadb"):
+        return "mysql"
+    raise ValueError(f"No engine profile for database backend '{backend}'")
+
+
+def build_engine(url: str, profile: Optional[str] = None, **overrides) -> Engine:
+    """Creates an engine with the tuned profile for its backend.
+
+    Precedence: explicit keyword overrides, then DB_* environment variables,
+    then the profile defaults. DB_PROFILE forces a profile by name.
+    """
+    profile = profile or os.getenv("DB_PROFILE") or engine_profile(url)
+    options = {key: value for key, value in ENGINE_PROFILES[profile].items()}
+    pragmas = options.pop("pragmas", {})
+
+    if options.get("poolclass") is not StaticPool:
+        for env_name, (option, parse) in _POOL_ENV.items():
+            if os.getenv(env_name):
+                options[option] = parse(os.getenv(env_name))
+    pragmas = overrides.pop("pragmas", pragmas)
+    options.update(overrides)
+
+    new_engine = create_engine(url, **options)
+
+    if pragmas:
+        @event.listens_for(new_engine, "connect")
+        def _apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+    return new_engine
+
+
+def pool_stats(target: Optional[Engine] = None) -> dict:
+    """Pool occupancy plus checkout-wait timings (when the pool records them)."""
+    pool = (target or engine).pool
+    stats = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            "idle": pool.checkedin(),
+        })
+    if isinstance(pool, TimedQueuePool):
+        stats.update(pool.stats.snapshot())
+    return stats
+
 
 # SQLAlchemy base and engine setup
 Base = declarative_base()
-engine = create_engine(DATABASE_URL)
+engine = build_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+read_engine = build_engine(READ_DATABASE_URL) if READ_DATABASE_URL else engine
+
+
+class WriteTracker:
+    """Remembers who wrote recently so their reads can be pinned to the primary.
+
+    Keys are "user:<id>" for per-user data and "catalog" for exercises. Marks
+    arrive from other workers over the invalidation bus, so a pinned user may
+    still hit another worker's replica session for the propagation delay.
+    """
+
+    def __init__(self, window: float = READ_YOUR_WRITES_SECONDS):
+        self.window = window
+        self._lock = threading.Lock()
+        self._last_write = {}
+
+    def mark(self, key: str):
+        with self._lock:
+            self._last_write[key] = time.monotonic()
+
+    def is_pinned(self, key: str) -> bool:
+        with self._lock:
+            written = self._last_write.get(key)
+            if written is None:
+                return False
+            if time.monotonic() - written > self.window:
+                del self._last_write[key]
+                return False
+            return True
+
+
+write_tracker = WriteTracker()
+bus.subscribe("user:", write_tracker.mark)
+bus.subscribe("catalog", write_tracker.mark)
+
+
+def mark_user_write(user_id: int):
+    """Call after committing per-user data: pins the user's reads and invalidates their cached entries."""
+    bus.publish(f"user:{user_id}")
+
+
+def mark_catalog_write(exercise_id: Optional[int] = None):
+    """Call after committing an exercise write: pins catalog reads and invalidates catalog caches."""
+    if exercise_id is None:
+        bus.publish("catalog")
+    else:
+        bus.publish("catalog", f"exercise:{exercise_id}")
+
+
+class RoutingSession(Session):
+    """Session that reads from the replica and sends flushes and DML to the primary.
+
+    Setting session.info["primary"] = True pins every statement to the primary.
+    """
+
+    def __init__(self, primary: Engine = None, replica: Engine = None, **kwargs):
+        super().__init__(**kwargs)
+        self.primary = primary or engine
+        self.replica = replica or read_engine
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self.info.get("primary") or self._flushing or (clause is not None and clause.is_dml):
+            return self.primary
+        return self.replica
+
+
+ReadSessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False)
+
+
+# Dependency for read-only endpoints: replica, unless the caller wrote within the window
+def get_read_db(request: Request):
+    user_id = request.path_params.get("user_id")
+    key = f"user:{user_id}" if user_id is not None else "catalog"
+    db = ReadSessionLocal()
+    if write_tracker.is_pinned(key):
+        db.info["primary"] = True
+    try:
+        yield db
+    finally:
+        db.close()
 
 # Dependency to get the database session
 def get_db():
+    db = SessionLocal()
     try:
-        db = SessionLocal()
-        print("✅ Database session started.")
         yield db
-    except Exception as e:
-        print(f"🚨 Database session error: {e}")
+    except HTTPException:
+        raise
+    except Exception:
+        logger.exception("Database session error")
+        raise
     finally:
         db.close()
-        print("✅ Database session closed.")
 
 # Create all tables
 def create_db():
     Base.metadata.create_all(bind=engine)
+    ensure_columns(engine)
+    ensure_indexes(engine)
+    ensure_catalog_state(engine)
+
+def ensure_columns(target: Engine):
+    """Adds model columns missing from existing tables (nullable or with a server default).
+
+    There are no migrations in this project; this covers additive changes like
+    Exercise.version so existing databases keep working after an upgrade.
+    """
+    existing = inspect(target)
+    with target.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not existing.has_table(table.name):
+                continue
+            present = {column["name"] for column in existing.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in present:
+                    continue
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(target.dialect)}"
+                if column.server_default is not None:
+                    ddl += f" DEFAULT {column.server_default.arg}"
+                if not column.nullable and column.server_default is not None:
+                    ddl += " NOT NULL"
+                conn.exec_driver_sql(ddl)
+                logger.info("Added missing column", extra={"table": table.name, "column": column.name})
+
+def ensure_indexes(target: Engine):
+    """Creates model indexes missing from existing tables (create_all skips tables that exist)."""
+    with target.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+def ensure_catalog_state(target: Engine):
+    """Seeds the single catalog_state row, so catalog writes only ever UPDATE it."""
+    from backend.models import CatalogState  # imported here to avoid a circular import
+    with Session(target) as db:
+        insert_if_missing(db, CatalogState, {"id": 1, "version": 0})
+        db.commit()
 
 # ✅ Schema for exercise creation (used in endpoints)
 class ExerciseCreate(BaseModel):
@@ -45,22 +348,107 @@ class ExerciseCreate(BaseModel):
         from_attributes = True
 
 # ✅ Helper function to fetch user data
+# (engine, user_id) -> user_to_dict() or None; dropped on every "user:<id>" invalidation
+user_profiles = CoalescingCache("user_profile", maxsize=USER_PROFILE_CACHE_SIZE, ttl=USER_PROFILE_CACHE_TTL,
+                                negative_ttl=USER_PROFILE_NEGATIVE_TTL)
+
+
+def _drop_user_profile(key: str):
+    user_id = int(key.split(":", 1)[1])
+    user_profiles.invalidate_where(lambda cached: cached[1] == user_id)
+
+
+bus.subscribe("user:", _drop_user_profile)
+
+
 def get_user_data(db: Session, user_id: int):
+    """user_to_dict() for the id, or None. Served from user_profiles; writers call mark_user_write()."""
     from backend.models import User  # ✅ Imported only here to avoid circular import
-    user = db.query(User).filter(User.id == user_id).first()
-    if user:
-        return {
-            "id": user.id,
-            "username": user.username or "",
-            "full_name": user.full_name or "",
-            "email": user.email or "",
-            "height": user.height or "N/A",
-            "weight": user.weight or "N/A",
-            "gender": user.gender or "N/A",
-            "dob": str(user.dob) if user.dob else "N/A",
-            "role": user.role or "user"
-        }
-    return None
+
+    def load():
+        user = db.query(User).filter(User.id == user_id).first()
+        return user_to_dict(user) if user else None
+
+    profile = user_profiles.get_or_load((db.get_bind(), user_id), load)
+    return dict(profile) if profile is not None else None
+
+def user_to_dict(user):
+    return {
+        "id": user.id,
+        "username": user.username or "",
+        "full_name": user.full_name or "",
+        "email": user.email or "",
+        "height": user.height or "N/A",
+        "weight": user.weight or "N/A",
+        "gender": user.gender or "N/A",
+        "dob": str(user.dob) if user.dob else "N/A",
+        "role": user.role or "user"
+    }
+
+def exercise_to_dict(exercise):
+    """Exercise row as returned by the API, with the JSON tags column decoded."""
+    return {
+        "id": exercise.id,
+        "name": exercise.name,
+        "description": exercise.description,
+        "toughness": exercise.toughness,
+        "media_url": exercise.media_url,
+        "tags": json.loads(exercise.tags) if exercise.tags else [],
+        "suggested_reps": exercise.suggested_reps
+    }
+
+# Single round-trip writes. Routes used to add/commit/refresh or load/modify/commit/refresh,
+# paying one or two extra SELECTs per write; these return what the response needs from the
+# INSERT or UPDATE itself on backends with RETURNING (PostgreSQL, SQLite >= 3.35, MariaDB
+# for inserts) and fall back to the fewest statements elsewhere (MySQL).
+
+def insert_returning(db: Session, model, values: dict, *columns):
+    """INSERT ... RETURNING columns as a Row; the caller commits.
+
+    Without insert RETURNING the row is added and flushed, and the flushed object,
+    detached so commit doesn't expire it, comes back in place of the Row.
+    """
+    if db.get_bind().dialect.insert_returning:
+        return db.execute(insert(model).values(**values).returning(*columns)).one()
+    obj = model(**values)
+    db.add(obj)
+    db.flush([obj])
+    db.expunge(obj)
+    return obj
+
+
+def update_returning(db: Session, model, pk, values: dict, *columns):
+    """UPDATE ... WHERE id = pk RETURNING columns as a Row, or None when no row matched. The caller commits."""
+    statement = (update(model).where(model.id == pk).values(**values)
+                 .execution_options(synchronize_session=False))
+    if db.get_bind().dialect.update_returning:
+        return db.execute(statement.returning(*columns)).first()
+    if db.execute(statement).rowcount == 0:
+        return None
+    return db.execute(select(*columns).where(model.id == pk)).first()
+
+
+_UPSERT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def insert_if_missing(db: Session, model, values: dict):
+    """INSERT that is a no-op when the primary key already exists; the caller commits.
+
+    For per-user counter rows created on first use: two first writers both insert and
+    neither gets an IntegrityError. Follow it with an atomic UPDATE or a locked read.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect in _UPSERT_INSERTS:
+        db.execute(_UPSERT_INSERTS[dialect](model).values(**values).on_conflict_do_nothing())
+    elif dialect in ("mysql", "mariadb"):
+        db.execute(insert(model).values(**values).prefix_with("IGNORE"))
+    else:
+        try:
+            with db.begin_nested():
+                db.execute(insert(model).values(**values))
+        except IntegrityError:
+            pass
+
 
 # ✅ Exercise fetch helpers
 def get_exercise_by_id(db: Session, exercise_id: int):
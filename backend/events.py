@@ -0,0 +1,160 @@
+# backend/events.py
+
+import asyncio
+import json
+import os
+import threading
+from collections import defaultdict
+from typing import Iterable, Optional
+
+# Messages buffered per subscriber; a slow client loses the oldest and is told to resync
+EVENTS_BUFFER_SIZE = int(os.getenv("EVENTS_BUFFER_SIZE", "64"))
+# Open streams per worker; beyond this /events answers 503
+EVENTS_MAX_SUBSCRIBERS = int(os.getenv("EVENTS_MAX_SUBSCRIBERS", "10000"))
+# Comment line sent on idle streams so proxies and phones keep the connection open
+EVENTS_HEARTBEAT_SECONDS = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+
+CATALOG_TOPIC = "catalog"
+
+
+def user_topic(user_id: int) -> str:
+    return f"user:{user_id}"
+
+
+def format_event(event: str, data: dict, event_id: Optional[int] = None) -> str:
+    """One text/event-stream message."""
+    lines = [] if event_id is None else [f"id: {event_id}"]
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, separators=(',', ':'), default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+RESYNC = format_event("resync", {"reason": "events were dropped; refetch /exercises/changes and saved exercises"})
+
+
+class SubscriberLimitReached(Exception):
+    pass
+
+
+class Subscription:
+    """A bounded buffer owned by one stream, read on the event loop that created it."""
+
+    def __init__(self, topics: Iterable[str], loop: asyncio.AbstractEventLoop, maxsize: int):
+        self.topics = frozenset(topics)
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+        self.lost = False
+        self.closed = False
+
+    def deliver(self, message: str):
+        """Runs on self.loop. Drops the oldest buffered message when full."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+            self.lost = True
+        self.queue.put_nowait(message)
+
+
+class Broadcaster:
+    """In-process pub/sub from request handlers (any thread) to SSE streams (event loop).
+
+    publish() makes one call_soon_threadsafe per event loop, not per subscriber, so
+    a catalog event fanned out to thousands of idle streams wakes the loop once.
+    """
+
+    def __init__(self, buffer_size: int = EVENTS_BUFFER_SIZE, max_subscribers: int = EVENTS_MAX_SUBSCRIBERS):
+        self.buffer_size = buffer_size
+        self.max_subscribers = max_subscribers
+        self._lock = threading.Lock()
+        self._topics = defaultdict(set)
+        self._count = 0
+        self.published = 0
+
+    def subscribe(self, topics: Iterable[str]) -> Subscription:
+        subscription = Subscription(topics, asyncio.get_running_loop(), self.buffer_size)
+        with self._lock:
+            if self._count >= self.max_subscribers:
+                raise SubscriberLimitReached()
+            for topic in subscription.topics:
+                self._topics[topic].add(subscription)
+            self._count += 1
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Releases the slot; safe to call more than once."""
+        with self._lock:
+            if subscription.closed:
+                return
+            subscription.closed = True
+            for topic in subscription.topics:
+                subscribers = self._topics.get(topic)
+                if subscribers is not None and subscription in subscribers:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._topics[topic]
+            self._count -= 1
+
+    def publish(self, topic: str, event: str, data: dict, event_id: Optional[int] = None) -> int:
+        """Queues the event for every subscriber of `topic`; returns how many there were."""
+        message = format_event(event, data, event_id)
+        with self._lock:
+            subscribers = list(self._topics.get(topic, ()))
+            self.published += 1
+        by_loop = defaultdict(list)
+        for subscription in subscribers:
+            by_loop[subscription.loop].append(subscription)
+        for loop, targets in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(_fan_out, targets, message)
+            except RuntimeError:
+                pass  # loop closed (worker shutting down); its streams are gone
+        return len(subscribers)
+
+    def subscriber_count(self) -> int:
+        return self._count
+
+    def dropped_count(self) -> int:
+        with self._lock:
+            subscriptions = {s for subscribers in self._topics.values() for s in subscribers}
+        return sum(s.dropped for s in subscriptions)
+
+
+def _fan_out(subscriptions, message: str):
+    for subscription in subscriptions:
+        subscription.deliver(message)
+
+
+broadcaster = Broadcaster()
+
+
+async def event_stream(subscription: Subscription, heartbeat: float = EVENTS_HEARTBEAT_SECONDS):
+    """text/event-stream body for a subscription the route has already reserved; releases it when closed."""
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                message = await asyncio.wait_for(subscription.queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if subscription.lost:
+                subscription.lost = False
+                yield RESYNC
+            yield message
+    finally:
+        broadcaster.unsubscribe(subscription)
+
+
+# --- Publishers, called by the write routes after they commit ------------------------
+
+def exercise_upserted(exercise: dict, version: int):
+    broadcaster.publish(CATALOG_TOPIC, "exercise_upserted", {"version": version, "exercise": exercise}, version)
+
+
+def exercise_deleted(exercise_id: int, version: int):
+    broadcaster.publish(CATALOG_TOPIC, "exercise_deleted", {"version": version, "exercise_id": exercise_id}, version)
+
+
+def saved_changed(user_id: int, exercise_id: int, saved: bool):
+    broadcaster.publish(user_topic(user_id), "saved_changed", {"exercise_id": exercise_id, "saved": saved})
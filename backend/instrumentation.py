@@ -0,0 +1,192 @@
+# backend/instrumentation.py
+
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Add X-DB-* headers to every response (and enable /debug/sql_stats)
+DEBUG_SQL = os.getenv("DEBUG_SQL", "0").lower() in ("1", "true", "yes")
+# The same statement shape this many times in one request is flagged as an N+1 candidate
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "5"))
+
+_WHITESPACE = re.compile(r"\s+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\(\s*(?:\?|%s|:\w+)(?:\s*,\s*(?:\?|%s|:\w+))*\s*\)")
+_POSTCOMPILE = re.compile(r"__\[POSTCOMPILE_\w+\]")
+
+
+def statement_shape(statement: str) -> str:
+    """Collapses literals and IN lists so repeated queries compare equal."""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _STRING_LITERAL.sub("?", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _POSTCOMPILE.sub("?", shape)
+    return _IN_LIST.sub("(?)", shape)
+
+
+class RequestQueryStats:
+    """SQL issued while serving one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.shapes = Counter()
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.total_time += elapsed
+        if elapsed >= self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+        self.shapes[statement_shape(statement)] += 1
+
+    def n_plus_one(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> list:
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+class RouteSQLStats:
+    """Per-route-template aggregates across requests."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def add(self, route: str, stats: RequestQueryStats):
+        suspects = stats.n_plus_one()
+        with self._lock:
+            agg = self._routes.setdefault(route, {
+                "requests": 0,
+                "queries": 0,
+                "db_time_ms": 0.0,
+                "max_queries": 0,
+                "slowest_ms": 0.0,
+                "slowest_statement": None,
+                "n_plus_one_requests": 0,
+                "n_plus_one_shapes": {},
+            })
+            agg["requests"] += 1
+            agg["queries"] += stats.count
+            agg["db_time_ms"] += stats.total_time * 1000
+            agg["max_queries"] = max(agg["max_queries"], stats.count)
+            if stats.slowest_time * 1000 > agg["slowest_ms"]:
+                agg["slowest_ms"] = stats.slowest_time * 1000
+                agg["slowest_statement"] = stats.slowest_statement
+            if suspects:
+                agg["n_plus_one_requests"] += 1
+                for shape, count in suspects:
+                    agg["n_plus_one_shapes"][shape] = max(agg["n_plus_one_shapes"].get(shape, 0), count)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            result = {}
+            for route, agg in self._routes.items():
+                result[route] = dict(
+                    agg,
+                    db_time_ms=round(agg["db_time_ms"], 3),
+                    slowest_ms=round(agg["slowest_ms"], 3),
+                    avg_queries=round(agg["queries"] / agg["requests"], 2),
+                    n_plus_one_shapes=dict(agg["n_plus_one_shapes"]),
+                )
+            return result
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+
+route_sql_stats = RouteSQLStats()
+
+# Stats for the request being served; copied into the threadpool with the rest of the context
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_sql_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is None:
+        return
+    starts = conn.info.get("query_start")
+    if starts:
+        stats.record(statement, time.perf_counter() - starts.pop())
+
+
+def track_queries() -> tuple:
+    """Starts collecting for the current context. Returns (stats, token for stop_tracking)."""
+    stats = RequestQueryStats()
+    return stats, _current_stats.set(stats)
+
+
+def stop_tracking(token):
+    _current_stats.reset(token)
+
+
+def _route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "<unmatched>"
+
+
+class SQLInstrumentationMiddleware:
+    """Records per-request query count, DB time and N+1 candidates, aggregated per route.
+
+    Plain ASGI, so long-lived streams pass through without an extra task. The report is
+    taken when the response headers go out: the handler has run by then, and queries
+    made while streaming a body are not counted.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = track_queries()
+
+        async def send_with_report(message: Message):
+            if message["type"] == "http.response.start":
+                self._report(scope, stats, MutableHeaders(scope=message))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_report)
+        finally:
+            stop_tracking(token)
+
+    @staticmethod
+    def _report(scope: Scope, stats: RequestQueryStats, headers: MutableHeaders):
+        route = f"{scope['method']} {_route_template(scope)}"
+        route_sql_stats.add(route, stats)
+        suspects = stats.n_plus_one()
+        if suspects:
+            # Debug level, so a hot route with an N+1 is sampled rather than logged on every request
+            logger.debug("N+1 query candidate", extra={"route": route, "shapes": dict(suspects)})
+
+        if DEBUG_SQL:
+            headers["X-DB-Query-Count"] = str(stats.count)
+            headers["X-DB-Time-Ms"] = f"{stats.total_time * 1000:.3f}"
+            headers["X-DB-Slowest-Ms"] = f"{stats.slowest_time * 1000:.3f}"
+            if suspects:
+                headers["X-DB-N-Plus-One"] = str(len(suspects))
@@ -0,0 +1,341 @@
+# backend/invalidation.py
+
+import glob
+import json
+import os
+import queue
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from collections import namedtuple
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import select
+
+from backend import metrics
+from backend.logger import get_logger
+
+logger = get_logger(__name__)
+
+# local: single worker, nothing crosses processes; db: poll a change-counter table;
+# unix: datagram fanout between workers on the same host
+INVALIDATION_TRANSPORT = os.getenv("INVALIDATION_TRANSPORT", "local")
+INVALIDATION_POLL_SECONDS = float(os.getenv("INVALIDATION_POLL_SECONDS", "0.5"))
+# Rows of the db transport older than this are pruned
+INVALIDATION_RETENTION_SECONDS = float(os.getenv("INVALIDATION_RETENTION_SECONDS", "300"))
+# How far back each db poll re-reads, to cover rows that commit after a later id was seen
+# (concurrent inserts, sequence caching) and wall-clock skew between hosts
+INVALIDATION_POLL_SLACK_SECONDS = float(os.getenv("INVALIDATION_POLL_SLACK_SECONDS", "5"))
+INVALIDATION_SOCKET_DIR = os.getenv(
+    "INVALIDATION_SOCKET_DIR", os.path.join(tempfile.gettempdir(), "flexfit-invalidation"))
+
+PROPAGATION_DELAY = metrics.registry.register(metrics.Histogram(
+    "flexfit_invalidation_propagation_seconds",
+    "Delay between a write on one worker and its invalidation arriving on another.", ("transport",),
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)))
+INVALIDATIONS = metrics.registry.register(metrics.Counter(
+    "flexfit_invalidations_total", "Invalidation keys dispatched to local caches.", ("source",)))
+
+# keys: tuple of "catalog", "exercise:<id>", "user:<id>"; sent_at: wall-clock seconds
+Invalidation = namedtuple("Invalidation", ["keys", "origin", "sent_at"])
+
+
+def encode(message: Invalidation) -> bytes:
+    return json.dumps({"keys": list(message.keys), "origin": message.origin, "sent_at": message.sent_at}).encode()
+
+
+def decode(data: bytes) -> Invalidation:
+    payload = json.loads(data)
+    return Invalidation(tuple(payload["keys"]), payload["origin"], payload["sent_at"])
+
+
+class LocalTransport:
+    """Single-process deployments: publish() already invalidated everything there is."""
+
+    name = "local"
+
+    def start(self, receive: Callable[[Invalidation], None]):
+        pass
+
+    def send(self, message: Invalidation):
+        pass
+
+    def stop(self):
+        pass
+
+
+class DatabaseTransport:
+    """Appends each invalidation to invalidation_events; every worker polls for recent rows.
+
+    Ids are not a safe high-water mark: with concurrent writers a lower id can commit
+    after a higher one was already read. So each poll re-reads every row sent within
+    slack_seconds of the previous poll (an index range scan on sent_at) and skips the
+    ids it has delivered. Works across hosts; delay is bounded by the poll interval.
+
+    send() only queues the message, so publishing never waits on the database (the
+    async routes publish from the event loop). A writer thread inserts queued rows in
+    batches and keeps retrying after a failure instead of dropping them.
+    """
+
+    name = "db"
+
+    def __init__(self, engine, poll_seconds: float = INVALIDATION_POLL_SECONDS,
+                 retention_seconds: float = INVALIDATION_RETENTION_SECONDS,
+                 slack_seconds: float = INVALIDATION_POLL_SLACK_SECONDS):
+        from backend.models import InvalidationEvent
+
+        self.engine = engine
+        self.table = InvalidationEvent.__table__
+        self.poll_seconds = poll_seconds
+        self.retention_seconds = retention_seconds
+        self.slack_seconds = slack_seconds
+        self._stopped = threading.Event()
+        self._thread = None
+        self._writer = None
+        self._outbox = queue.Queue()
+        self._pending = []  # taken from the outbox but not yet committed
+        self._flush_lock = threading.Lock()
+        self.last_poll = time.time()
+        self._delivered = {}  # id -> sent_at, for rows still inside the re-read window
+
+    def start(self, receive):
+        # Rows already in the window predate this worker's caches; mark them delivered
+        self.last_poll = time.time()
+        c = self.table.c
+        with self.engine.connect() as conn:
+            rows = conn.execute(select(c.id, c.sent_at).where(c.sent_at > self.last_poll - self.slack_seconds)).all()
+        self._delivered = {row.id: row.sent_at for row in rows}
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, args=(receive,), name="invalidation-poller", daemon=True)
+        self._thread.start()
+        self._writer = threading.Thread(target=self._write, name="invalidation-writer", daemon=True)
+        self._writer.start()
+
+    def send(self, message: Invalidation):
+        self._outbox.put(message)
+
+    def flush(self) -> int:
+        """Inserts every queued message in one transaction; returns how many. On failure they stay queued."""
+        with self._flush_lock:
+            while True:
+                try:
+                    self._pending.append(self._outbox.get_nowait())
+                except queue.Empty:
+                    break
+            if not self._pending:
+                return 0
+            # A message held back by failed writes is re-stamped, or it would land
+            # behind the other workers' poll window and never be read
+            written_at = time.time()
+            with self.engine.begin() as conn:
+                conn.execute(self.table.insert(), [
+                    {"invalidated_keys": ",".join(message.keys), "origin": message.origin,
+                     "sent_at": max(message.sent_at, written_at - self.slack_seconds / 2)}
+                    for message in self._pending])
+            written, self._pending = len(self._pending), []
+            return written
+
+    def poll(self, receive):
+        """Delivers rows not delivered before; returns how many there were."""
+        c = self.table.c
+        started = time.time()
+        since = self.last_poll - self.slack_seconds
+        with self.engine.connect() as conn:
+            rows = conn.execute(
+                select(c.id, c.invalidated_keys, c.origin, c.sent_at).where(c.sent_at > since).order_by(c.id)).all()
+        self.last_poll = started
+        self._delivered = {id_: sent_at for id_, sent_at in self._delivered.items() if sent_at > since}
+        delivered = 0
+        for row in rows:
+            if row.id in self._delivered:
+                continue
+            self._delivered[row.id] = row.sent_at
+            delivered += 1
+            receive(Invalidation(tuple(row.invalidated_keys.split(",")), row.origin, row.sent_at))
+        return delivered
+
+    def prune(self):
+        with self.engine.begin() as conn:
+            conn.execute(self.table.delete().where(self.table.c.sent_at < time.time() - self.retention_seconds))
+
+    def _run(self, receive):
+        last_prune = time.monotonic()
+        while not self._stopped.wait(self.poll_seconds):
+            try:
+                self.poll(receive)
+                if time.monotonic() - last_prune > self.retention_seconds:
+                    self.prune()
+                    last_prune = time.monotonic()
+            except Exception:
+                logger.exception("Invalidation poll failed")
+
+    def _write(self):
+        while not self._stopped.is_set():
+            try:
+                message = self._outbox.get(timeout=self.poll_seconds)
+            except queue.Empty:
+                if not self._pending:
+                    continue
+            else:
+                with self._flush_lock:
+                    self._pending.append(message)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Invalidation write failed; retrying", extra={"queued": len(self._pending)})
+                self._stopped.wait(self.poll_seconds)
+
+    def stop(self):
+        self._stopped.set()
+        for thread in (self._thread, self._writer):
+            if thread is not None:
+                thread.join(timeout=self.poll_seconds * 2)
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Invalidation write failed at shutdown", extra={"queued": len(self._pending)})
+
+
+class UnixSocketTransport:
+    """Each worker binds a datagram socket in a shared directory and sends to all the others.
+
+    No broker and no polling, so delay is a syscall; limited to workers on one host.
+    Sockets left behind by dead workers are removed the first time a send is refused.
+    """
+
+    name = "unix"
+
+    def __init__(self, directory: str = INVALIDATION_SOCKET_DIR):
+        self.directory = directory
+        self.path = None
+        self._receiver = None
+        self._sender = None
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def start(self, receive):
+        self._stopped.clear()
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = os.path.join(self.directory, f"{os.getpid()}-{uuid.uuid4().hex[:8]}.sock")
+        self._receiver = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._receiver.bind(self.path)
+        self._receiver.settimeout(1.0)  # so the receiver thread notices stop()
+        self._sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sender.setblocking(False)
+        self._thread = threading.Thread(target=self._run, args=(receive,), name="invalidation-receiver", daemon=True)
+        self._thread.start()
+
+    def peers(self) -> list:
+        return [path for path in glob.glob(os.path.join(self.directory, "*.sock")) if path != self.path]
+
+    def send(self, message: Invalidation):
+        data = encode(message)
+        for peer in self.peers():
+            try:
+                self._sender.sendto(data, peer)
+            except (ConnectionRefusedError, FileNotFoundError):
+                try:
+                    os.unlink(peer)
+                except FileNotFoundError:
+                    pass
+            except BlockingIOError:
+                logger.warning("Invalidation dropped; peer socket buffer full", extra={"peer": peer})
+
+    def _run(self, receive):
+        while not self._stopped.is_set():
+            try:
+                data = self._receiver.recv(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            try:
+                receive(decode(data))
+            except Exception:
+                logger.exception("Bad invalidation datagram")
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        for sock in (self._receiver, self._sender):
+            if sock is not None:
+                sock.close()
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+
+class InvalidationBus:
+    """Fans cache invalidations out to this worker's subscribers and, via the transport, to the others.
+
+    Caches subscribe to a key prefix ("user:", "exercise:", "catalog") and drop the
+    matching entries when called. Callbacks run on the publishing request's thread for
+    local writes and on the transport's thread for remote ones, so they must be thread-safe.
+    """
+
+    def __init__(self, transport=None):
+        self.origin = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.transport = transport or LocalTransport()
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, prefix: str, callback: Callable[[str], None], remote_only: bool = False):
+        """remote_only: for state the writing worker already updated itself (e.g. leaderboards)."""
+        with self._lock:
+            self._subscribers.append((prefix, callback, remote_only))
+
+    def publish(self, *keys: str):
+        """Call after the write commits, so no worker can re-read the old row into its cache."""
+        self._dispatch(keys, "local")
+        try:
+            self.transport.send(Invalidation(keys, self.origin, time.time()))
+        except Exception:
+            # Local caches are already clean; other workers catch up when their entries expire
+            logger.exception("Invalidation send failed", extra={"keys": list(keys)})
+
+    def receive(self, message: Invalidation):
+        if message.origin == self.origin:
+            return
+        PROPAGATION_DELAY.observe(max(0.0, time.time() - message.sent_at), transport=self.transport.name)
+        self._dispatch(message.keys, "remote")
+
+    def _dispatch(self, keys: Iterable[str], source: str):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for key in keys:
+            INVALIDATIONS.inc(source=source)
+            for prefix, callback, remote_only in subscribers:
+                if key.startswith(prefix) and not (remote_only and source == "local"):
+                    try:
+                        callback(key)
+                    except Exception:
+                        logger.exception("Invalidation callback failed", extra={"key": key})
+
+    def start(self, transport=None):
+        if transport is not None:
+            self.transport.stop()
+            self.transport = transport
+        self.transport.start(self.receive)
+        logger.info("Invalidation bus started", extra={"transport": self.transport.name})
+
+    def stop(self):
+        self.transport.stop()
+
+
+def transport_from_env(engine, name: Optional[str] = None):
+    name = name or INVALIDATION_TRANSPORT
+    if name == "db":
+        return DatabaseTransport(engine)
+    if name == "unix":
+        return UnixSocketTransport()
+    if name != "local":
+        logger.warning("Unknown INVALIDATION_TRANSPORT; using local", extra={"transport": name})
+    return LocalTransport()
+
+
+bus = InvalidationBus()
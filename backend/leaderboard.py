@@ -0,0 +1,160 @@
+# backend/leaderboard.py
+
+import threading
+from bisect import bisect_left, insort
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from backend.logger import get_logger
+from backend.models import UserStreak, WorkoutLog
+
+logger = get_logger(__name__)
+
+METRICS = ("workouts", "streak")
+PERIODS = ("weekly", "all_time")
+
+
+def week_start(today: Optional[date] = None) -> date:
+    """Monday of the current (UTC) week."""
+    today = today or datetime.utcnow().date()
+    return today - timedelta(days=today.weekday())
+
+
+class Leaderboard:
+    """Scores kept in a sorted array of (-score, user_id) plus a user -> score map.
+
+    rank() and top() are a bisect and a slice; updates are a bisect plus one
+    list shift, which stays well under a millisecond for the user counts we have.
+    """
+
+    def __init__(self):
+        self._entries: List[Tuple[int, int]] = []
+        self._scores: Dict[int, int] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def load(self, scores: Dict[int, int]):
+        """Replaces the whole board, e.g. when rebuilding from the database."""
+        entries = sorted((-score, user_id) for user_id, score in scores.items() if score)
+        with self._lock:
+            self._entries = entries
+            self._scores = {user_id: -neg for neg, user_id in entries}
+
+    def clear(self):
+        self.load({})
+
+    def set_score(self, user_id: int, score: int):
+        with self._lock:
+            old = self._scores.get(user_id)
+            if old == score:
+                return
+            if old is not None:
+                del self._entries[bisect_left(self._entries, (-old, user_id))]
+                del self._scores[user_id]
+            if score > 0:
+                insort(self._entries, (-score, user_id))
+                self._scores[user_id] = score
+
+    def increment(self, user_id: int, amount: int = 1):
+        with self._lock:
+            self.set_score(user_id, self._scores.get(user_id, 0) + amount)
+
+    def score(self, user_id: int) -> int:
+        return self._scores.get(user_id, 0)
+
+    def rank(self, user_id: int) -> Optional[int]:
+        """1-based competition rank (ties share a rank), or None if the user has no score."""
+        score = self._scores.get(user_id)
+        if score is None:
+            return None
+        return bisect_left(self._entries, (-score,)) + 1
+
+    def top(self, n: int = 10) -> List[dict]:
+        with self._lock:
+            head = self._entries[:n]
+        results = []
+        for position, (neg_score, user_id) in enumerate(head):
+            if results and results[-1]["score"] == -neg_score:
+                rank = results[-1]["rank"]
+            else:
+                rank = position + 1
+            results.append({"rank": rank, "user_id": user_id, "score": -neg_score})
+        return results
+
+
+class LeaderboardSet:
+    """The four materialized boards: workouts and streak, each weekly and all-time.
+
+    Weekly boards start empty each Monday (UTC). The weekly streak board ranks
+    the streak length users reached while active this week; the all-time one
+    ranks longest streaks.
+    """
+
+    def __init__(self):
+        self.boards = {(metric, period): Leaderboard() for metric in METRICS for period in PERIODS}
+        self.week = week_start()
+
+    def _roll_week(self):
+        current = week_start()
+        if current != self.week:
+            self.week = current
+            self.boards[("workouts", "weekly")].clear()
+            self.boards[("streak", "weekly")].clear()
+
+    def board(self, metric: str, period: str) -> Leaderboard:
+        self._roll_week()
+        return self.boards[(metric, period)]
+
+    def record_workout(self, user_id: int):
+        self._roll_week()
+        self.boards[("workouts", "all_time")].increment(user_id)
+        self.boards[("workouts", "weekly")].increment(user_id)
+
+    def record_streak(self, streak: UserStreak):
+        self._roll_week()
+        self.boards[("streak", "all_time")].set_score(streak.user_id, streak.longest_streak or 0)
+        if streak.last_activity_date and streak.last_activity_date >= self.week:
+            self.boards[("streak", "weekly")].set_score(streak.user_id, streak.current_streak or 0)
+
+    def rebuild(self, db: Session):
+        """Reloads every board from the database with one aggregate query each."""
+        self.week = week_start()
+        since = datetime.combine(self.week, datetime.min.time())
+
+        all_time = db.query(WorkoutLog.user_id, func.count(WorkoutLog.id)).group_by(WorkoutLog.user_id)
+        weekly = all_time.filter(WorkoutLog.completed_at >= since)
+        self.boards[("workouts", "all_time")].load(dict(all_time.all()))
+        self.boards[("workouts", "weekly")].load(dict(weekly.all()))
+
+        longest = db.query(UserStreak.user_id, UserStreak.longest_streak)
+        current = db.query(UserStreak.user_id, UserStreak.current_streak).filter(
+            UserStreak.last_activity_date >= self.week
+        )
+        self.boards[("streak", "all_time")].load(dict(longest.all()))
+        self.boards[("streak", "weekly")].load(dict(current.all()))
+        logger.info("Leaderboards rebuilt", extra={"week": self.week.isoformat()})
+
+    def refresh_user(self, db: Session, user_id: int):
+        """Re-reads one user's scores; applies writes another worker made (see backend/main.py)."""
+        self._roll_week()
+        since = datetime.combine(self.week, datetime.min.time())
+        count = db.query(func.count(WorkoutLog.id)).filter(WorkoutLog.user_id == user_id)
+        self.boards[("workouts", "all_time")].set_score(user_id, count.scalar() or 0)
+        self.boards[("workouts", "weekly")].set_score(
+            user_id, count.filter(WorkoutLog.completed_at >= since).scalar() or 0)
+        streak = db.query(UserStreak).filter(UserStreak.user_id == user_id).first()
+        self.boards[("streak", "all_time")].set_score(user_id, (streak.longest_streak or 0) if streak else 0)
+        weekly_streak = 0
+        if streak and streak.last_activity_date and streak.last_activity_date >= self.week:
+            weekly_streak = streak.current_streak or 0
+        self.boards[("streak", "weekly")].set_score(user_id, weekly_streak)
+
+
+# Process-wide boards, rebuilt from the DB on startup and refreshed per user on other workers' writes
+# (see backend/main.py)
+leaderboards = LeaderboardSet()
@@ -0,0 +1,143 @@
+# backend/logger.py
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+# Level for every "backend.*" logger
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# Fraction of DEBUG records kept per call site (1 = all, 0 = none); INFO and above are never sampled
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0.01"))
+# Records waiting for the writer thread; beyond this they are dropped rather than block a request
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# Attributes every LogRecord has; anything else came from `extra=` and goes into the JSON
+_RESERVED = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, any `extra=` fields and exc."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps 1 in every round(1 / rate) DEBUG records from each call site.
+
+    Counting per call site means a chatty debug line cannot crowd out a rare one.
+    The counters are not locked; under contention a few extra records may get through.
+    """
+
+    def __init__(self, rate: float = LOG_DEBUG_SAMPLE_RATE):
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self._seen = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        if not self.every:
+            return False
+        site = (record.pathname, record.lineno)
+        seen = self._seen.get(site, 0)
+        self._seen[site] = seen + 1
+        if seen % self.every:
+            return False
+        if self.every > 1:
+            record.sample_rate = 1 / self.every
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Hands records to the writer thread without formatting or blocking the caller.
+
+    Only the message is interpolated here (so arguments are read on the caller's
+    thread); JSON encoding, tracebacks and the stdout write happen on the listener.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_lock = threading.Lock()
+_listener: Optional[QueueListener] = None
+_handler: Optional[NonBlockingQueueHandler] = None
+
+
+def setup_logging(stream=None) -> NonBlockingQueueHandler:
+    """Routes the "backend" logger tree through the queue to a JSON stream handler. Idempotent."""
+    global _listener, _handler
+    with _lock:
+        if _handler is not None:
+            return _handler
+
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(JsonFormatter())
+
+        log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        handler = NonBlockingQueueHandler(log_queue)
+        handler.addFilter(SamplingFilter())
+
+        root = logging.getLogger("backend")
+        root.setLevel(LOG_LEVEL)
+        root.addHandler(handler)
+        root.propagate = False
+
+        _listener = QueueListener(log_queue, output)
+        _listener.start()
+        _handler = handler
+        atexit.register(stop_logging)
+        return handler
+
+
+def stop_logging():
+    """Flushes queued records and stops the writer thread."""
+    global _listener, _handler
+    with _lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        logging.getLogger("backend").removeHandler(_handler)
+        _listener = None
+        _handler = None
+
+
+def dropped_records() -> int:
+    return _handler.dropped if _handler is not None else 0
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger for a backend module, e.g. get_logger(__name__)."""
+    setup_logging()
+    return logging.getLogger(name)
@@ -1,28 +1,46 @@
 import os
-import traceback
 from typing import Optional, List
 
-from fastapi import FastAPI, Depends, HTTPException, Query, File, UploadFile, Body
+from fastapi import FastAPI, Depends, HTTPException, Query, File, UploadFile, Body, Request, Response
+from fastapi.responses import ORJSONResponse
 import cloudinary
 import cloudinary.uploader
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from backend.database import SessionLocal, engine, get_user_data, ExerciseCreate, get_exercise_by_id
+from backend.database import SessionLocal, engine, read_engine, get_user_data, ExerciseCreate, get_exercise_by_id, \
+    pool_stats, get_read_db, mark_user_write, mark_catalog_write, exercise_to_dict, ensure_columns, \
+    ensure_indexes, ensure_catalog_state, user_profiles, insert_returning, update_returning
 from backend.models import Base, Exercise, User, SavedExercise, ProgressLog
 from backend.routes import exercises
 from backend.schemas import UserCreate, LoginRequest, ExerciseRequest, ExerciseUpdate, ExerciseResponse
-from werkzeug.security import generate_password_hash, check_password_hash
-import jwt
 import json
 from datetime import datetime, timedelta
 from fastapi.security import OAuth2PasswordBearer
 from backend.routes.auth import router as auth_router  # Import the auth router
+from backend.security import create_access_token, verify_access_token, hash_password, verify_password
+from backend.routes import achievements, catalog, coach, events as event_routes, leaderboards as leaderboard_routes, \
+    streaks, workouts
+from backend.catalog import catalog_cache, exercise_detail_body, exercise_details, insert_exercise, search_exercises, \
+    update_exercise
+from backend.leaderboard import leaderboards
+from backend.streaks import record_activity
+from backend.achievements import on_progress_logged, on_saved_toggled
+from backend.async_database import ASYNC_DB_ENABLED, dispose_async_db
+from backend.instrumentation import DEBUG_SQL, SQLInstrumentationMiddleware, route_sql_stats
+from backend import events, metrics, serializers
+from backend.compression import CompressionMiddleware, compressed_bodies
+from backend.invalidation import bus, transport_from_env
+from backend.logger import dropped_records, get_logger
+
+logger = get_logger(__name__)
 
 # FastAPI app initialization
 app = FastAPI(
     title="Your API",
     description="API for managing exercises",
     version="1.0.0",
+    # orjson for every dict/model a route returns; the hot routes below skip the encoder entirely
+    default_response_class=ORJSONResponse,
     openapi_tags=[
         {
             "name": "Exercise",
@@ -31,6 +49,36 @@ app = FastAPI(
     ]
 )
 
+# Per-request SQL counts/timings, aggregated per route (headers only with DEBUG_SQL=1)
+app.add_middleware(SQLInstrumentationMiddleware)
+# gzip/brotli for JSON and MessagePack bodies above COMPRESSION_MIN_BYTES
+app.add_middleware(CompressionMiddleware)
+# Latency histograms and in-flight gauge for /metrics; added last so it wraps everything
+app.add_middleware(metrics.MetricsMiddleware)
+
+metrics.register_pool("primary", lambda: pool_stats(engine))
+metrics.register_cache("compressed_bodies", compressed_bodies.stats)
+metrics.register_cache("catalog", catalog_cache.stats)
+metrics.register_cache("exercise_detail", exercise_details.stats)
+metrics.register_cache("user_profile", user_profiles.stats)
+if read_engine is not engine:
+    metrics.register_pool("replica", lambda: pool_stats(read_engine))
+app.add_event_handler("startup", metrics.start_flusher)
+app.add_event_handler("shutdown", metrics.write_snapshot)
+# Cross-worker cache invalidation; INVALIDATION_TRANSPORT picks local, db or unix
+app.add_event_handler("startup", lambda: bus.start(transport_from_env(engine)))
+app.add_event_handler("shutdown", bus.stop)
+app.add_api_route("/metrics", metrics.metrics_endpoint, methods=["GET"], include_in_schema=False)
+metrics.registry.register(metrics.Gauge(
+    "flexfit_log_records_dropped", "Log records dropped because the log queue was full.",
+    function=lambda: [({}, dropped_records())]))
+metrics.registry.register(metrics.Gauge(
+    "flexfit_event_subscribers", "Open /events streams in this worker.",
+    function=lambda: [({}, events.broadcaster.subscriber_count())]))
+metrics.registry.register(metrics.Gauge(
+    "flexfit_events_dropped", "Events dropped from full subscriber buffers (open streams only).",
+    function=lambda: [({}, events.broadcaster.dropped_count())]))
+
 cloudinary.config(
     cloud_name = os.getenv("CLOUDINARY_CLOUD_NAME"),
     api_key = os.getenv("CLOUDINARY_API_KEY"),
@@ -38,39 +86,54 @@ cloudinary.config(
 )
 
 
-# Secret key for encoding and decoding JWT tokens
-SECRET_KEY = "your_secret_key"  # Change this to a secure random key
-ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30  # Set token expiration time
-
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 
-# Function to create a JWT token
-def create_access_token(data: dict, expires_delta: timedelta = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)):
-    to_encode = data.copy()
-    expire = datetime.utcnow() + expires_delta
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
-
-
-# Function to verify the token
-def verify_access_token(token: str):
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
-    except jwt.PyJWTError:
-        raise HTTPException(status_code=403, detail="Invalid token or expired")
-
+# With ASYNC_DB on, the async hot routes are registered first and shadow the sync handlers below
+if ASYNC_DB_ENABLED:
+    from backend.routes import async_api
+    app.include_router(async_api.router)
+    app.add_event_handler("shutdown", dispose_async_db)
 
 # Include routes for authentication
 
 app.include_router(auth_router, prefix="/auth")
 app.include_router(exercises.router, prefix="/api", tags=["Workouts"])
+app.include_router(streaks.router)
+app.include_router(workouts.router)
+app.include_router(achievements.router)
+app.include_router(leaderboard_routes.router)
+app.include_router(coach.router)
+app.include_router(catalog.router)
+app.include_router(event_routes.router)
 
 
 Base.metadata.create_all(bind=engine)  # Creates tables if they don't exist
+ensure_columns(engine)  # ...plus columns and indexes added to the models since the tables were created
+ensure_indexes(engine)
+ensure_catalog_state(engine)  # ...and the catalog version row every catalog write updates
+
+
+@app.on_event("startup")
+def load_leaderboards():
+    """Rankings live in memory; rebuild them from the logs once per process."""
+    db = SessionLocal()
+    try:
+        leaderboards.rebuild(db)
+    finally:
+        db.close()
+
+
+def refresh_leaderboard_user(key: str):
+    """Another worker logged a workout or streak for this user; re-read their scores so rankings agree."""
+    db = SessionLocal()
+    try:
+        leaderboards.refresh_user(db, int(key.split(":", 1)[1]))
+    finally:
+        db.close()
+
+
+bus.subscribe("user:", refresh_leaderboard_user, remote_only=True)
 
 
 # Dependency to get the database session
@@ -83,24 +146,23 @@ def get_db():
 
 @app.post("/add_exercise/")
 def add_exercise(exercise: ExerciseRequest, db: Session = Depends(get_db)):
-    print("🔥 ADD_EXERCISE route loaded")
-    print("📦 Exercise payload:", exercise)
+    logger.debug("add_exercise payload: %s", exercise)
 
     default_image_url = "https://res.cloudinary.com/dudftatqj/image/upload/v1741316241/logo_iehkuj.png"
     media_url = exercise.media_url or default_image_url
 
-    new_exercise = Exercise(
-        name=exercise.name,
-        description=exercise.description,
-        toughness=exercise.toughness,
-        media_url=media_url,
-        tags=json.dumps(exercise.tags),
-        suggested_reps=exercise.suggested_reps
-    )
-
-    db.add(new_exercise)
+    new_exercise = insert_exercise(db, {
+        "name": exercise.name,
+        "description": exercise.description,
+        "toughness": exercise.toughness,
+        "media_url": media_url,
+        "tags": json.dumps(exercise.tags),
+        "suggested_reps": exercise.suggested_reps
+    })
     db.commit()
-    db.refresh(new_exercise)
+    mark_catalog_write(new_exercise.id)
+    events.exercise_upserted(exercise_to_dict(new_exercise), new_exercise.version)
+    logger.info("Exercise added", extra={"exercise_id": new_exercise.id})
 
     return {"message": "Exercise added successfully", "exercise_id": new_exercise.id}
 
@@ -112,7 +174,7 @@ def login(request: LoginRequest, db: Session = Depends(get_db)):
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    if not check_password_hash(user.password_hash, request.password):
+    if not verify_password(user.password_hash, request.password):
         raise HTTPException(status_code=400, detail="Invalid credentials")
 
     # Create JWT token for the authenticated user
@@ -120,15 +182,15 @@ def login(request: LoginRequest, db: Session = Depends(get_db)):
 
     user_data = get_user_data(db, user.id)
 
-    return {"access_token": access_token,
-            "token_type": "bearer",
-            "user": user_data}
+    return serializers.json_response(serializers.login_response, {"access_token": access_token,
+                                                                  "token_type": "bearer",
+                                                                  "user": user_data})
 
 @app.post("/signup/")
 def signup(user_info: UserCreate, db: Session = Depends(get_db)):
     """Handles user registration and adds a new user to the database."""
     try:
-        print(f"📌 Received Sign-Up Data: {user_info}")  # Debugging
+        logger.debug("Sign-up request for %s", user_info.email)
 
         # Check if the email is already registered
         existing_user = db.query(User).filter(User.email == user_info.email).first()
@@ -136,34 +198,32 @@ def signup(user_info: UserCreate, db: Session = Depends(get_db)):
             raise HTTPException(status_code=400, detail="Email already registered")
 
         # Hash the password
-        hashed_password = generate_password_hash(user_info.password, method='pbkdf2:sha256')
+        hashed_password = hash_password(user_info.password)
 
         # ✅ Convert dob from string to date (Already handled in Pydantic model)
         parsed_dob = user_info.dob
 
 
         # ✅ Create new user
-        new_user = User(
-            username=user_info.username,
-            full_name=user_info.full_name,
-            email=user_info.email,
-            password_hash=hashed_password,
-            dob=parsed_dob,
-            gender=user_info.gender,
-            height=user_info.height,
-            weight=user_info.weight,
-            role=user_info.role
-        )
-
-        db.add(new_user)
+        new_user = insert_returning(db, User, {
+            "username": user_info.username,
+            "full_name": user_info.full_name,
+            "email": user_info.email,
+            "password_hash": hashed_password,
+            "dob": parsed_dob,
+            "gender": user_info.gender,
+            "height": user_info.height,
+            "weight": user_info.weight,
+            "role": user_info.role
+        }, User.id)
         db.commit()
-        db.refresh(new_user)
+        mark_user_write(new_user.id)  # clears a cached "unknown id" for the new user
 
-        print(f"✅ Successfully Created User: {new_user.email}")
+        logger.info("User created", extra={"user_id": new_user.id})
         return {"message": "User created successfully", "user_id": new_user.id}
 
     except Exception as e:
-        print(f"🚨 ERROR: {e}")
+        logger.exception("Sign-up failed")
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/toggle_saved/{user_id}/{exercise_id}")
@@ -172,19 +232,25 @@ def toggle_saved_exercise(user_id: int, exercise_id: int, db: Session = Depends(
 
     if existing:
         db.delete(existing)
+        on_saved_toggled(db, user_id, saved=False)
         db.commit()
+        mark_user_write(user_id)
+        events.saved_changed(user_id, exercise_id, saved=False)
         return {"status": "removed"}
     else:
         new_entry = SavedExercise(user_id=user_id, exercise_id=exercise_id)
         db.add(new_entry)
+        on_saved_toggled(db, user_id, saved=True)
         db.commit()
+        mark_user_write(user_id)
+        events.saved_changed(user_id, exercise_id, saved=True)
         return {"status": "saved"}
 
 
 @app.get("/saved_exercises/{user_id}")
-def get_saved_exercises(user_id: int, db: Session = Depends(get_db)):
+def get_saved_exercises(user_id: int, request: Request, db: Session = Depends(get_read_db)):
     saved = db.query(SavedExercise.exercise_id).filter_by(user_id=user_id).all()
-    return [item.exercise_id for item in saved]
+    return serializers.negotiated_response(request, serializers.id_list, [item.exercise_id for item in saved])
 
 
 # Protected route that requires JWT token
@@ -205,6 +271,20 @@ def get_user_info(user_id: int, db: Session = Depends(get_db)):
     return {"error": "User not found"}
 
 
+@app.get("/debug/db_pool")
+def get_pool_stats():
+    """Connection pool occupancy and checkout-wait timings for this worker."""
+    return pool_stats(engine)
+
+
+@app.get("/debug/sql_stats")
+def get_sql_stats():
+    """Per-route query counts, DB time and N+1 candidates collected by the SQL middleware."""
+    if not DEBUG_SQL:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return route_sql_stats.snapshot()
+
+
 @app.post("/logout/")
 def logout():
     """Invalidate the token on the client side."""
@@ -214,125 +294,91 @@ def logout():
 # Route to get exercises (example)
 @app.get("/exercises/")
 def get_exercises(
+        request: Request,
         search_query: str = Query(None),
-        db: Session = Depends(get_db)
+        db: Session = Depends(get_read_db)
 ):
-    """Fetches all exercises and converts JSON tags back to Python lists."""
-    exercises = db.query(Exercise).all()
-    exercises_query = db.query(Exercise)
-
-    if search_query:  # ✅ Apply search filter ONLY if search_query exists
-        search_query = f"%{search_query.lower()}%"  # ✅ SQL wildcard search
-        exercises_query = exercises_query.filter(Exercise.name.ilike(search_query))
-
-    exercises = exercises_query.all()
-
-    # Convert JSON string back to list
-    exercises_list = []
-    for ex in exercises:
-        exercises_list.append({
-            "id": ex.id,
-            "name": ex.name,
-            "description": ex.description,
-            "toughness": ex.toughness,
-            "media_url": ex.media_url,
-            "tags": json.loads(ex.tags) if ex.tags else [],  # ✅ Convert back to list
-            "suggested_reps": ex.suggested_reps
-        })
-
-    return exercises_list if exercises_list else {"error": "No exercises found"}
+    """Fetches all exercises and converts JSON tags back to Python lists.
+
+    The unfiltered list comes from catalog_cache; concurrent misses share one query.
+    """
+    exercises_list = search_exercises(db, search_query)
+
+    if not exercises_list:
+        return serializers.negotiated_response(request, serializers.error, {"error": "No exercises found"})
+    return serializers.negotiated_response(request, serializers.exercise_list, exercises_list)
 
 @app.get("/exercise/{exercise_id}")
-def get_exercise(exercise_id: int, db: Session = Depends(get_db)):
+def get_exercise(exercise_id: int, db: Session = Depends(get_read_db)):
+    """Served from the exercise_details LRU; edits and deletes invalidate it through the bus."""
     try:
-        exercise = get_exercise_by_id(db, exercise_id)
-        if not exercise:
+        body = exercise_detail_body(db, exercise_id)
+        if body is None:
             raise HTTPException(status_code=404, detail="Exercise not found")
-
-
-        try:
-            tags_list = json.loads(exercise.tags) if exercise.tags else []
-        except json.decoder.JSONDecodeError:
-            tags_list = []
-
-        return {
-            "name": exercise.name,
-            "image_url": exercise.media_url,
-            "description": exercise.description,
-            "tags": tags_list,
-            "suggested_reps": exercise.suggested_reps,
-            "toughness": exercise.toughness
-        }
+        return Response(body, media_type="application/json")
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"❌ Internal Server Error: {e}")
-        print(traceback.format_exc())  # ✅ This will show the full error in logs
+        logger.exception("Failed to load exercise", extra={"exercise_id": exercise_id})
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 from backend.schemas import ExerciseUpdate, ExerciseResponse  # ✅ Import schema
 
 @app.put("/edit_exercise/{exercise_id}", response_model=ExerciseResponse)
 def edit_exercise(exercise_id: int, workout_data: ExerciseUpdate, db: Session = Depends(get_db)):
-    workout = db.query(Exercise).filter(Exercise.id == exercise_id).first()
-    if not workout:
-        raise HTTPException(status_code=404, detail="Workout not found")
-
     updates = workout_data.dict(exclude_unset=True)
 
     if "tags" in updates and isinstance(updates["tags"], list):
         updates["tags"] = json.dumps(updates["tags"])
 
-    for attr, value in updates.items():
-        setattr(workout, attr, value)
+    workout = update_exercise(db, exercise_id, updates)
+    if workout is None:
+        raise HTTPException(status_code=404, detail="Workout not found")
 
     db.commit()
-    db.refresh(workout)
+    mark_catalog_write(exercise_id)
 
-    return ExerciseResponse(
-        id=workout.id,
-        name=workout.name,
-        description=workout.description,
-        toughness=workout.toughness,
-        tags=json.loads(workout.tags) if workout.tags else [],
-        media_url=workout.media_url,
-        suggested_reps=workout.suggested_reps
-    )
+    exercise = exercise_to_dict(workout)
+    events.exercise_upserted(exercise, workout.version)
+    return ExerciseResponse(**exercise)
 
 
 
 @app.put("/user/{user_id}/update")
 def update_user_info(user_id: int, data: dict, db: Session = Depends(get_db)):
-    user = db.query(User).filter_by(id=user_id).first()
+    updates = {field: data[field] for field in ("height", "weight") if field in data}
+    if updates:
+        user = update_returning(db, User, user_id, updates, User.id)
+    else:
+        user = db.query(User.id).filter_by(id=user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    if "height" in data:
-        user.height = data["height"]
-    if "weight" in data:
-        user.weight = data["weight"]
-
     db.commit()
-    db.refresh(user)
+    mark_user_write(user_id)
     return {"message": "User info updated successfully"}
 
 @app.post("/progress/{user_id}")
 def log_progress(user_id: int, height: float = None, weight: float = None, db: Session = Depends(get_db)):
-    entry = ProgressLog(user_id=user_id, height=height, weight=weight)
-    db.add(entry)
+    insert_returning(db, ProgressLog, {"user_id": user_id, "height": height, "weight": weight}, ProgressLog.id)
+    streak = record_activity(db, user_id)
+    on_progress_logged(db, user_id)
     db.commit()
-    db.refresh(entry)
+    leaderboards.record_streak(streak)  # only once the row is committed
+    mark_user_write(user_id)
     return {"message": "Progress logged successfully"}
 
 @app.get("/progress/{user_id}")
-def get_progress(user_id: int, db: Session = Depends(get_db)):
+def get_progress(user_id: int, request: Request, db: Session = Depends(get_read_db)):
     logs = db.query(ProgressLog).filter(ProgressLog.user_id == user_id).order_by(ProgressLog.date).all()
-    return [
+    return serializers.negotiated_response(request, serializers.progress_list, [
         {
             "date": log.date,
             "height": log.height,
             "weight": log.weight
         }
         for log in logs
-    ]
+    ])
 
 @app.post("/upload_workout_image/")
 async def upload_workout_image(file: UploadFile = File(...)):
@@ -341,5 +387,5 @@ async def upload_workout_image(file: UploadFile = File(...)):
         result = cloudinary.uploader.upload(contents, folder="workouts/")
         return {"url": result["secure_url"]}
     except Exception as e:
-        print(f"❌ Upload Failed: {e}")
+        logger.exception("Upload failed")
         raise HTTPException(status_code=500, detail="Failed to upload image")
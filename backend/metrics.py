@@ -0,0 +1,405 @@
+# backend/metrics.py
+
+import glob
+import json
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi.responses import PlainTextResponse
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Shared directory for multi-worker aggregation. Each worker writes its snapshot there
+# and /metrics merges them, so any worker can answer the scrape.
+METRICS_MULTIPROC_DIR = os.getenv("METRICS_MULTIPROC_DIR")
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+# Snapshots older than this are from workers that have exited
+METRICS_STALE_SECONDS = float(os.getenv("METRICS_STALE_SECONDS", "300"))
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Shards:
+    """One dict per thread, so the hot path updates its own shard without a lock.
+
+    Readers sum a copy of every shard; a shard outlives its thread so counts are never lost.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()
+
+    def mine(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def all(self) -> list:
+        with self._lock:
+            return [dict(shard) for shard in self._shards]
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._shards = _Shards()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Dict[tuple, object]:
+        merged = {}
+        for shard in self._shards.all():
+            for key, value in shard.items():
+                merged[key] = merged.get(key, 0) + value
+        return merged
+
+
+class Counter(_Metric):
+    """inc() counter, or a callback counter reading a monotonic total kept elsewhere."""
+    kind = "counter"
+
+    def __init__(self, name, help_text, labelnames=(), function: Optional[Callable[[], dict]] = None):
+        super().__init__(name, help_text, labelnames)
+        self.function = function
+
+    def inc(self, amount: float = 1, **labels):
+        shard = self._shards.mine()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0) + amount
+
+    def samples(self):
+        if self.function is None:
+            return super().samples()
+        return {self._key(labels): value for labels, value in self.function()}
+
+
+class Gauge(_Metric):
+    """inc()/dec() gauge, or a callback gauge sampled at collection time."""
+    kind = "gauge"
+
+    def __init__(self, name, help_text, labelnames=(), function: Optional[Callable[[], dict]] = None):
+        super().__init__(name, help_text, labelnames)
+        self.function = function
+
+    def inc(self, amount: float = 1, **labels):
+        shard = self._shards.mine()
+        key = self._key(labels)
+        shard[key] = shard.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def samples(self):
+        if self.function is None:
+            return super().samples()
+        return {self._key(labels): value for labels, value in self.function()}
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        shard = self._shards.mine()
+        key = self._key(labels)
+        # Per-bucket (non-cumulative) counts followed by sum and count
+        state = shard.get(key)
+        if state is None:
+            state = shard[key] = [0] * (len(self.buckets) + 2)
+        state[bisect_left(self.buckets, value)] += 1
+        state[-2] += value
+        state[-1] += 1
+
+    def samples(self):
+        merged = {}
+        for shard in self._shards.all():
+            for key, state in shard.items():
+                total = merged.setdefault(key, [0] * (len(self.buckets) + 2))
+                for i, value in enumerate(list(state)):
+                    total[i] += value
+        return merged
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            self._metrics[metric.name] = metric
+        return metric
+
+    def snapshot(self) -> dict:
+        """JSON-safe view of this process's metrics, used for rendering and for multi-worker files."""
+        result = {}
+        for metric in list(self._metrics.values()):
+            entry = {"type": metric.kind, "help": metric.help, "labelnames": list(metric.labelnames),
+                     "samples": [[list(key), value] for key, value in metric.samples().items()]}
+            if isinstance(metric, Histogram):
+                entry["buckets"] = [b if b != math.inf else "+Inf" for b in metric.buckets]
+            result[metric.name] = entry
+        return result
+
+
+registry = Registry()
+
+
+def merge_snapshots(snapshots: list) -> dict:
+    """Sums counters, gauges and histogram buckets across worker snapshots."""
+    merged = {}
+    for snapshot in snapshots:
+        for name, entry in snapshot.items():
+            target = merged.setdefault(name, dict(entry, samples={}))
+            for key, value in entry["samples"]:
+                key = tuple(key)
+                if isinstance(value, list):
+                    current = target["samples"].get(key) or [0] * len(value)
+                    target["samples"][key] = [a + b for a, b in zip(current, value)]
+                else:
+                    target["samples"][key] = target["samples"].get(key, 0) + value
+    return merged
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(merged: dict) -> str:
+    """Prometheus text exposition format (0.0.4)."""
+    lines = []
+    for name in sorted(merged):
+        entry = merged[name]
+        lines.append(f"# HELP {name} {entry['help']}")
+        lines.append(f"# TYPE {name} {entry['type']}")
+        labelnames = entry["labelnames"]
+        for key, value in sorted(entry["samples"].items()):
+            if entry["type"] == "histogram":
+                cumulative = 0
+                for bound, count in zip(entry["buckets"], value[:-2]):
+                    cumulative += count
+                    le = "+Inf" if bound == "+Inf" else _number(float(bound))
+                    bucket_labels = _labels(labelnames, key, 'le="%s"' % le)
+                    lines.append(f"{name}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{name}_sum{_labels(labelnames, key)} {_number(value[-2])}")
+                lines.append(f"{name}_count{_labels(labelnames, key)} {value[-1]}")
+            else:
+                lines.append(f"{name}{_labels(labelnames, key)} {_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+# --- Multi-worker files -------------------------------------------------------------
+
+def _snapshot_path(pid: int) -> str:
+    return os.path.join(METRICS_MULTIPROC_DIR, f"metrics_{pid}.json")
+
+
+def write_snapshot():
+    """Atomically publishes this worker's snapshot to METRICS_MULTIPROC_DIR."""
+    if not METRICS_MULTIPROC_DIR:
+        return
+    os.makedirs(METRICS_MULTIPROC_DIR, exist_ok=True)
+    path = _snapshot_path(os.getpid())
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(registry.snapshot(), f)
+    os.replace(tmp, path)
+
+
+def collect_all() -> dict:
+    """This worker's live metrics merged with the latest snapshot of every other worker."""
+    snapshots = [registry.snapshot()]
+    if METRICS_MULTIPROC_DIR:
+        mine = _snapshot_path(os.getpid())
+        now = time.time()
+        for path in glob.glob(os.path.join(METRICS_MULTIPROC_DIR, "metrics_*.json")):
+            if path == mine or now - os.path.getmtime(path) > METRICS_STALE_SECONDS:
+                continue
+            try:
+                with open(path) as f:
+                    snapshots.append(json.load(f))
+            except (OSError, ValueError):
+                continue  # being replaced or from a crashed worker
+    return _add_hit_ratios(merge_snapshots(snapshots))
+
+
+def start_flusher():
+    """Background thread that republishes this worker's snapshot every METRICS_FLUSH_SECONDS."""
+    if not METRICS_MULTIPROC_DIR:
+        return None
+
+    def loop():
+        while True:
+            write_snapshot()
+            time.sleep(METRICS_FLUSH_SECONDS)
+
+    thread = threading.Thread(target=loop, name="metrics-flusher", daemon=True)
+    thread.start()
+    return thread
+
+
+# --- Application metrics ------------------------------------------------------------
+
+REQUEST_LATENCY = registry.register(Histogram(
+    "flexfit_http_request_duration_seconds", "Request latency by route template.", ("method", "route")))
+REQUESTS_TOTAL = registry.register(Counter(
+    "flexfit_http_requests_total", "Requests served by route template and status.", ("method", "route", "status")))
+IN_FLIGHT = registry.register(Gauge(
+    "flexfit_http_requests_in_flight", "Requests currently being served."))
+HASHING_IN_FLIGHT = registry.register(Gauge(
+    "flexfit_password_hashing_in_flight", "Password hash/verify operations currently running."))
+
+# name -> zero-argument callable returning {"hits": int, "misses": int}
+_cache_sources: Dict[str, Callable[[], dict]] = {}
+
+
+def register_cache(name: str, stats: Callable[[], dict]):
+    """Exposes a cache's hit/miss counters (and hit ratio) on /metrics."""
+    _cache_sources[name] = stats
+
+
+def _cache_samples(field: str):
+    def sample():
+        for name, stats in list(_cache_sources.items()):
+            yield {"cache": name}, stats().get(field, 0)
+    return sample
+
+
+
+
+def _add_hit_ratios(merged: dict) -> dict:
+    """Ratios don't sum across workers, so derive them after merging hits and misses."""
+    hits = merged.get("flexfit_cache_hits_total", {}).get("samples", {})
+    misses = merged.get("flexfit_cache_misses_total", {}).get("samples", {})
+    samples = {}
+    for key in set(hits) | set(misses):
+        lookups = hits.get(key, 0) + misses.get(key, 0)
+        samples[key] = hits.get(key, 0) / lookups if lookups else 0.0
+    if samples:
+        merged["flexfit_cache_hit_ratio"] = {"type": "gauge", "help": "Cache hit ratio.",
+                                             "labelnames": ["cache"], "samples": samples}
+    return merged
+
+
+# engine name ("primary", "replica") -> zero-argument callable returning pool_stats()
+_pool_sources: Dict[str, Callable[[], dict]] = {}
+
+_POOL_FIELDS = {
+    "size": ("flexfit_db_pool_size", Gauge),
+    "checked_out": ("flexfit_db_pool_checked_out", Gauge),
+    "overflow": ("flexfit_db_pool_overflow", Gauge),
+    "checkouts": ("flexfit_db_pool_checkouts_total", Counter),
+    "timeouts": ("flexfit_db_pool_timeouts_total", Counter),
+    "total_wait_ms": ("flexfit_db_pool_checkout_wait_ms_total", Counter),
+}
+
+
+def _pool_samples(field: str):
+    def sample():
+        for engine_name, stats in list(_pool_sources.items()):
+            value = stats().get(field)
+            if value is not None:
+                yield {"engine": engine_name}, value
+    return sample
+
+
+def register_pool(engine_name: str, stats: Callable[[], dict]):
+    """Exposes connection pool utilization from backend.database.pool_stats(), labelled engine=<name>."""
+    _pool_sources[engine_name] = stats
+
+
+def register_collectors(target: Registry):
+    """Cache and pool series, read from the register_cache()/register_pool() sources at scrape time."""
+    target.register(Counter("flexfit_cache_hits_total", "Cache hits.", ("cache",), function=_cache_samples("hits")))
+    target.register(Counter("flexfit_cache_misses_total", "Cache misses.", ("cache",),
+                            function=_cache_samples("misses")))
+    for field, (metric_name, kind) in _POOL_FIELDS.items():
+        target.register(kind(metric_name, f"Connection pool {field.replace('_', ' ')}.", ("engine",),
+                             function=_pool_samples(field)))
+
+
+register_collectors(registry)
+
+
+def _route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "<unmatched>"
+
+
+class MetricsMiddleware:
+    """Latency histogram, request counter and in-flight gauge for every HTTP request.
+
+    Plain ASGI rather than @app.middleware("http"), so a long-lived response costs no
+    extra task per connection. Latency runs to the last body chunk; an event stream is
+    recorded when its headers go out, since the rest of its life is connection time.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        IN_FLIGHT.inc()
+        start = time.perf_counter()
+        status = 500
+        recorded = False
+
+        def record():
+            nonlocal recorded
+            if recorded:
+                return
+            recorded = True
+            elapsed = time.perf_counter() - start
+            IN_FLIGHT.dec()
+            route = _route_template(scope)
+            REQUEST_LATENCY.observe(elapsed, method=scope["method"], route=route)
+            REQUESTS_TOTAL.inc(method=scope["method"], route=route, status=status)
+
+        async def send_with_metrics(message: Message):
+            nonlocal status
+            await send(message)
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if Headers(raw=message["headers"]).get("content-type", "").startswith("text/event-stream"):
+                    record()
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            record()
+
+
+def metrics_endpoint():
+    return PlainTextResponse(render(collect_all()), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, Integer, String, Enum, ForeignKey, Float, Date, DateTime
+from sqlalchemy import Column, Integer, String, Enum, ForeignKey, Float, Date, DateTime, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 
 from backend.database import Base  # Import Base from database.py
@@ -34,10 +34,43 @@ class Exercise(Base):
     media_url = Column(String)
     tags = Column(String)  # JSON tags (e.g., "with equipment, outdoor")
     suggested_reps = Column(Integer)
+    # Catalog version of the last write to this row (see backend/catalog.py); 0 = before versioning
+    version = Column(Integer, nullable=False, default=0, server_default="0", index=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class CatalogState(Base):
+    __tablename__ = "catalog_state"
+
+    # Single row holding the catalog version; bumped in the same transaction as each exercise write
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+class ExerciseTombstone(Base):
+    __tablename__ = "exercise_tombstones"
+
+    # Deleted exercises, so delta-sync clients can drop their local copies
+    exercise_id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, index=True)
+    deleted_at = Column(DateTime, default=datetime.utcnow)
+
+
+class InvalidationEvent(Base):
+    __tablename__ = "invalidation_events"
+
+    # Append-only log for the "db" invalidation transport; workers re-read a trailing
+    # sent_at window (indexed) and skip the ids they have already delivered
+    id = Column(Integer, primary_key=True)
+    invalidated_keys = Column(String(1024), nullable=False)  # comma-separated
+    origin = Column(String(128), nullable=False)
+    sent_at = Column(Float, nullable=False, index=True)
 
 
 class ProgressLog(Base):
     __tablename__ = "progress_logs"
+    # Per-user history in date order (get_progress, coach dashboard, streak backfill)
+    __table_args__ = (Index("ix_progress_logs_user_date", "user_id", "date"),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
@@ -50,7 +83,51 @@ class ProgressLog(Base):
 
 class SavedExercise(Base):
     __tablename__ = "saved_exercises"
+    # Serves get_saved_exercises (user_id prefix, covering) and the toggle_saved lookup
+    __table_args__ = (Index("ix_saved_exercises_user_exercise", "user_id", "exercise_id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     exercise_id = Column(Integer, ForeignKey("exercises.id"), nullable=False)
+
+
+class WorkoutLog(Base):
+    __tablename__ = "workout_logs"
+    # Serves both the per-user history and the time-windowed summary aggregate
+    __table_args__ = (Index("ix_workout_logs_user_completed", "user_id", "completed_at"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    exercise_id = Column(Integer, ForeignKey("exercises.id", ondelete="CASCADE"), nullable=False)
+    completed_at = Column(DateTime, default=datetime.utcnow)
+
+
+class UserStreak(Base):
+    __tablename__ = "user_streaks"
+
+    # One row per user, updated in place as activity arrives (see backend/streaks.py)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    current_streak = Column(Integer, nullable=False, default=0)
+    longest_streak = Column(Integer, nullable=False, default=0)
+    last_activity_date = Column(Date, nullable=True)
+
+
+class UserCounters(Base):
+    __tablename__ = "user_counters"
+
+    # Running totals the achievement rules are evaluated against (see backend/achievements.py)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    workouts_completed = Column(Integer, nullable=False, default=0)
+    progress_logged = Column(Integer, nullable=False, default=0)
+    saved_count = Column(Integer, nullable=False, default=0)
+    categories_tried = Column(String, nullable=False, default="[]")  # JSON list of tags
+
+
+class UserAchievement(Base):
+    __tablename__ = "user_achievements"
+    __table_args__ = (UniqueConstraint("user_id", "badge", name="uq_user_achievement"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    badge = Column(String(64), nullable=False)
+    awarded_at = Column(DateTime, default=datetime.utcnow)
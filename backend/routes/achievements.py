@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from backend.achievements import get_achievements
+from backend.database import get_db
+
+router = APIRouter(tags=["Achievements"])
+
+
+@router.get("/achievements/{user_id}")
+def read_achievements(user_id: int, db: Session = Depends(get_db)):
+    """Badges are awarded as events arrive, so this is a single lookup on user_achievements.user_id."""
+    return {"user_id": user_id, "achievements": get_achievements(db, user_id)}
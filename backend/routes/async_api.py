@@ -0,0 +1,98 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.achievements import on_progress_logged
+from backend import serializers
+from backend.async_database import get_async_db
+from backend.catalog import all_exercises_async, exercise_detail_body_async
+from backend.database import exercise_to_dict, mark_user_write, user_to_dict
+from backend.leaderboard import leaderboards
+from backend.models import Exercise, ProgressLog, SavedExercise, User
+from backend.schemas import LoginRequest
+from backend.security import create_access_token, verify_password
+from backend.streaks import record_activity
+
+# Async versions of the hot routes in backend/main.py. They are only mounted when
+# ASYNC_DB is enabled, ahead of the sync handlers, and return the same payloads.
+router = APIRouter(tags=["Async"])
+
+
+@router.post("/login/")
+async def login(request: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    user = (await db.execute(select(User).where(User.email == request.email))).scalars().first()
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    # Password hashing is deliberately slow; keep it off the event loop
+    if not await run_in_threadpool(verify_password, user.password_hash, request.password):
+        raise HTTPException(status_code=400, detail="Invalid credentials")
+
+    access_token = create_access_token(data={"sub": user.email})
+
+    return serializers.json_response(serializers.login_response, {"access_token": access_token,
+                                                                  "token_type": "bearer",
+                                                                  "user": user_to_dict(user)})
+
+
+@router.get("/exercises/")
+async def get_exercises(request: Request, search_query: str = Query(None),
+                        db: AsyncSession = Depends(get_async_db)):
+    if search_query:
+        query = select(Exercise).where(Exercise.name.ilike(f"%{search_query.lower()}%"))
+        exercises_list = [exercise_to_dict(ex) for ex in (await db.execute(query)).scalars()]
+    else:
+        exercises_list = await all_exercises_async(db)
+    if not exercises_list:
+        return serializers.negotiated_response(request, serializers.error, {"error": "No exercises found"})
+    return serializers.negotiated_response(request, serializers.exercise_list, exercises_list)
+
+
+@router.get("/exercise/{exercise_id}")
+async def get_exercise(exercise_id: int, db: AsyncSession = Depends(get_async_db)):
+    body = await exercise_detail_body_async(db, exercise_id)
+    if body is None:
+        raise HTTPException(status_code=404, detail="Exercise not found")
+    return Response(body, media_type="application/json")
+
+
+@router.get("/saved_exercises/{user_id}")
+async def get_saved_exercises(user_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    saved = await db.execute(select(SavedExercise.exercise_id).where(SavedExercise.user_id == user_id))
+    return serializers.negotiated_response(request, serializers.id_list, list(saved.scalars()))
+
+
+def _log_progress(db, user_id: int, height, weight):
+    """Runs inside AsyncSession.run_sync so the streak/achievement hooks work unchanged."""
+    db.add(ProgressLog(user_id=user_id, height=height, weight=weight))
+    streak = record_activity(db, user_id)
+    on_progress_logged(db, user_id)
+    return streak
+
+
+@router.post("/progress/{user_id}")
+async def log_progress(user_id: int, height: float = None, weight: float = None,
+                       db: AsyncSession = Depends(get_async_db)):
+    streak = await db.run_sync(_log_progress, user_id, height, weight)
+    await db.commit()
+    leaderboards.record_streak(streak)  # only once the row is committed
+    mark_user_write(user_id)
+    return {"message": "Progress logged successfully"}
+
+
+@router.get("/progress/{user_id}")
+async def get_progress(user_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    logs = await db.execute(
+        select(ProgressLog.date, ProgressLog.height, ProgressLog.weight)
+        .where(ProgressLog.user_id == user_id)
+        .order_by(ProgressLog.date)
+    )
+    return serializers.negotiated_response(request, serializers.progress_list, [
+        {
+            "date": log.date,
+            "height": log.height,
+            "weight": log.weight
+        }
+        for log in logs
+    ])
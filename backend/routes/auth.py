@@ -3,7 +3,7 @@ from sqlalchemy.orm import Session
 from backend.database import get_db  # Importing the get_db function
 from backend.schemas import LoginRequest  # Assuming you have this schema defined
 from backend.models import User
-from werkzeug.security import check_password_hash
+from backend.security import verify_password
 
 router = APIRouter()
 
@@ -18,7 +18,7 @@ def login(request: LoginRequest, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="User not found")
 
     # Check if the password matches the stored hashed password
-    if not check_password_hash(user.password_hash, request.password):
+    if not verify_password(user.password_hash, request.password):
         raise HTTPException(status_code=400, detail="Invalid credentials")
 
     # If successful, return a message and user id
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.orm import Session
+
+from backend import serializers
+from backend.catalog import changes_since, facet_counts
+from backend.database import get_read_db
+
+router = APIRouter(tags=["Exercise"])
+
+
+@router.get("/exercises/changes")
+def get_catalog_changes(request: Request, since: int = Query(0, ge=0, description="Catalog version the client holds"),
+                        db: Session = Depends(get_read_db)):
+    """Exercises added, edited or deleted after `since`, plus the version to send next time."""
+    return serializers.negotiated_response(request, serializers.catalog_changes, changes_since(db, since))
+
+
+@router.get("/exercises/facets")
+def get_facet_counts(request: Request, db: Session = Depends(get_read_db)):
+    """Exercise counts per toughness and per tag, from the shared catalog cache."""
+    return serializers.negotiated_response(request, serializers.facet_counts, facet_counts(db))
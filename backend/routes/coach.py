@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Depends
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+
+from backend.database import get_db
+from backend.models import ProgressLog
+from backend.schemas import CoachProgressRequest
+
+router = APIRouter(prefix="/coach", tags=["Coach"])
+
+
+def progress_overview_query(user_ids, since: datetime, points: int):
+    """One statement for any number of users.
+
+    Window functions number each user's entries in both directions, so the
+    outer filter keeps the earliest row (delta baseline), the latest row and
+    every step-th row in between, with step = ceil(entries / (points - 1)),
+    so each user contributes at most `points` rows.
+    """
+    by_user = ProgressLog.user_id
+    ranked = (
+        select(
+            ProgressLog.user_id,
+            ProgressLog.date,
+            ProgressLog.height,
+            ProgressLog.weight,
+            func.row_number().over(partition_by=by_user, order_by=(ProgressLog.date, ProgressLog.id)).label("rn_asc"),
+            func.row_number().over(partition_by=by_user, order_by=(ProgressLog.date.desc(), ProgressLog.id.desc())).label("rn_desc"),
+            func.count().over(partition_by=by_user).label("entries"),
+        )
+        .where(ProgressLog.user_id.in_(user_ids), ProgressLog.date >= since)
+        .subquery()
+    )
+    step = (ranked.c.entries + (points - 2)) // (points - 1)
+    return (
+        select(ranked)
+        .where(or_(ranked.c.rn_desc == 1, (ranked.c.rn_asc - 1) % step == 0))
+        .order_by(ranked.c.user_id, ranked.c.rn_asc)
+    )
+
+
+def latest_progress_query(user_ids):
+    """Each user's most recent row, however old (for users with nothing inside the window)."""
+    ranked = (
+        select(
+            ProgressLog.user_id,
+            ProgressLog.date,
+            ProgressLog.height,
+            ProgressLog.weight,
+            func.row_number().over(partition_by=ProgressLog.user_id,
+                                   order_by=(ProgressLog.date.desc(), ProgressLog.id.desc())).label("rn_desc"),
+        )
+        .where(ProgressLog.user_id.in_(user_ids))
+        .subquery()
+    )
+    return select(ranked).where(ranked.c.rn_desc == 1)
+
+
+def _delta(latest, first):
+    if latest is None or first is None:
+        return None
+    return round(latest - first, 2)
+
+
+@router.post("/progress")
+def get_progress_overview(request: CoachProgressRequest, db: Session = Depends(get_db)):
+    """Latest values, in-window deltas and a downsampled series for many users at once.
+
+    The response is columnar: the summary arrays are aligned with `user_ids`,
+    and `series` is a flat table keyed by its own `user_id` column. `latest_*` are
+    the user's most recent entry even when it falls before the window.
+    """
+    user_ids = sorted(set(request.user_ids))
+    since = datetime.utcnow() - timedelta(days=request.window_days)
+    rows = db.execute(progress_overview_query(user_ids, since, request.points)).all()
+
+    series = {"user_id": [], "date": [], "height": [], "weight": []}
+    first, latest, entries = {}, {}, {}
+    for row in rows:
+        series["user_id"].append(row.user_id)
+        series["date"].append(row.date)
+        series["height"].append(row.height)
+        series["weight"].append(row.weight)
+        if row.rn_asc == 1:
+            first[row.user_id] = row
+        if row.rn_desc == 1:
+            latest[row.user_id] = row
+        entries[row.user_id] = row.entries
+
+    # A user with rows in the window already has their latest row; look up the others
+    quiet = [user_id for user_id in user_ids if user_id not in latest]
+    if quiet:
+        latest.update((row.user_id, row) for row in db.execute(latest_progress_query(quiet)))
+
+    summary = {
+        "user_ids": user_ids,
+        "entries": [],
+        "latest_date": [],
+        "latest_height": [],
+        "latest_weight": [],
+        "height_delta": [],
+        "weight_delta": [],
+    }
+    for user_id in user_ids:
+        last, start = latest.get(user_id), first.get(user_id)
+        summary["entries"].append(entries.get(user_id, 0))
+        summary["latest_date"].append(last.date if last else None)
+        summary["latest_height"].append(last.height if last else None)
+        summary["latest_weight"].append(last.weight if last else None)
+        summary["height_delta"].append(_delta(last.height, start.height) if start else None)
+        summary["weight_delta"].append(_delta(last.weight, start.weight) if start else None)
+
+    return {"window_days": request.window_days, **summary, "series": series}
@@ -0,0 +1,39 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from backend.events import CATALOG_TOPIC, SubscriberLimitReached, Subscription, broadcaster, event_stream, user_topic
+
+router = APIRouter(tags=["Events"])
+
+
+class EventStreamResponse(StreamingResponse):
+    """Releases the subscription even if the client is gone before the body is first iterated,
+    when the generator's own finally never runs."""
+
+    def __init__(self, subscription: Subscription, **kwargs):
+        super().__init__(event_stream(subscription), media_type="text/event-stream", **kwargs)
+        self.subscription = subscription
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            broadcaster.unsubscribe(self.subscription)
+
+
+@router.get("/events")
+async def stream_events(user_id: Optional[int] = Query(None, description="Also stream this user's saved-exercise changes")):
+    """Server-sent events: exercise_upserted / exercise_deleted for everyone, saved_changed per user.
+
+    Catalog events carry the catalog version as their id. After a reconnect, or on a
+    `resync` event, clients catch up with /exercises/changes?since=<last id>.
+    """
+    topics = [CATALOG_TOPIC] if user_id is None else [CATALOG_TOPIC, user_topic(user_id)]
+    # Reserve the slot before any status is sent, so a full worker can still answer 503
+    try:
+        subscription = broadcaster.subscribe(topics)
+    except SubscriberLimitReached:
+        raise HTTPException(status_code=503, detail="Too many event streams", headers={"Retry-After": "30"})
+    return EventStreamResponse(subscription, headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
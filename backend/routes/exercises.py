@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from backend.database import get_db
+from backend import events
+from backend.catalog import record_delete
+from backend.database import get_db, mark_catalog_write
 from backend.models import Exercise
 
 router = APIRouter(
@@ -16,6 +18,9 @@ def delete_exercise(exercise_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Exercise not found")
 
     db.delete(exercise)
+    version = record_delete(db, exercise_id)
     db.commit()
+    mark_catalog_write(exercise_id)
+    events.exercise_deleted(exercise_id, version)
 
     return {"message": "Exercise deleted successfully"}
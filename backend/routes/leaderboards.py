@@ -0,0 +1,31 @@
+from fastapi import APIRouter, HTTPException, Query
+
+from backend.leaderboard import METRICS, PERIODS, leaderboards
+
+router = APIRouter(prefix="/leaderboard", tags=["Leaderboards"])
+
+
+def _board(metric: str, period: str):
+    if metric not in METRICS or period not in PERIODS:
+        raise HTTPException(status_code=404, detail="Unknown leaderboard")
+    return leaderboards.board(metric, period)
+
+
+# Served from the in-memory rankings only; no database session needed
+@router.get("/{metric}")
+def get_leaderboard(metric: str, period: str = Query("all_time"), limit: int = Query(10, ge=1, le=100)):
+    board = _board(metric, period)
+    return {"metric": metric, "period": period, "total": len(board), "entries": board.top(limit)}
+
+
+@router.get("/{metric}/rank/{user_id}")
+def get_user_rank(metric: str, user_id: int, period: str = Query("all_time")):
+    board = _board(metric, period)
+    return {
+        "metric": metric,
+        "period": period,
+        "user_id": user_id,
+        "rank": board.rank(user_id),
+        "score": board.score(user_id),
+        "total": len(board)
+    }
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from backend.database import get_db, mark_user_write
+from backend.leaderboard import leaderboards
+from backend.streaks import get_streak, record_activity
+
+router = APIRouter(tags=["Streaks"])
+
+
+@router.get("/streak/{user_id}")
+def read_streak(user_id: int, db: Session = Depends(get_db)):
+    return get_streak(db, user_id)
+
+
+@router.post("/streak/{user_id}")
+def touch_streak(user_id: int, db: Session = Depends(get_db)):
+    """Counts today as active. Idempotent within a day, so the client may call it after any log."""
+    streak = record_activity(db, user_id)
+    db.commit()
+    leaderboards.record_streak(streak)  # only once the row is committed
+    mark_user_write(user_id)
+    return get_streak(db, user_id)
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from backend.achievements import on_workout_logged
+from backend.database import get_db, mark_user_write
+from backend.invalidation import bus
+from backend.leaderboard import leaderboards
+from backend.models import Exercise, WorkoutLog
+from backend.singleflight import SingleFlight
+from backend.streaks import record_activity
+
+router = APIRouter(tags=["Workouts"])
+
+# Identical summary requests in flight at once (dashboard refresh storms) share one aggregate query
+summary_flight = SingleFlight("workout_summary")
+bus.subscribe("user:", lambda key: summary_flight.forget())
+
+
+@router.post("/log_workout/{user_id}/{exercise_id}")
+def log_workout(user_id: int, exercise_id: int, db: Session = Depends(get_db)):
+    exercise = db.get(Exercise, exercise_id)
+    if not exercise:
+        raise HTTPException(status_code=404, detail="Exercise not found")
+
+    entry = WorkoutLog(user_id=user_id, exercise_id=exercise_id)
+    db.add(entry)
+    streak = record_activity(db, user_id)
+    new_badges = on_workout_logged(db, user_id, exercise)
+    db.commit()
+    leaderboards.record_streak(streak)  # only once the rows are committed
+    leaderboards.record_workout(user_id)
+    mark_user_write(user_id)
+    return {"message": "Workout logged successfully", "log_id": entry.id, "new_achievements": new_badges}
+
+
+@router.get("/workout_logs/{user_id}")
+def get_workout_logs(user_id: int, db: Session = Depends(get_db)):
+    logs = (
+        db.query(WorkoutLog)
+        .filter(WorkoutLog.user_id == user_id)
+        .order_by(WorkoutLog.completed_at)
+        .all()
+    )
+    return [
+        {
+            "exercise_id": log.exercise_id,
+            "completed_at": log.completed_at
+        }
+        for log in logs
+    ]
+
+
+@router.get("/workout_logs/{user_id}/summary")
+def get_workout_summary(
+        user_id: int,
+        days: Optional[int] = Query(None, ge=1, description="Only count workouts from the last N days"),
+        limit: Optional[int] = Query(None, ge=1, description="Return only the N most completed exercises"),
+        db: Session = Depends(get_db)
+):
+    """Completion counts per exercise, aggregated and joined to exercise names in the database."""
+    return summary_flight.do((db.get_bind(), user_id, days, limit), lambda: _workout_summary(db, user_id, days, limit))
+
+
+def _workout_summary(db: Session, user_id: int, days: Optional[int], limit: Optional[int]) -> list:
+    times_completed = func.count(WorkoutLog.id).label("times_completed")
+    query = (
+        db.query(
+            WorkoutLog.exercise_id,
+            Exercise.name,
+            times_completed,
+            func.max(WorkoutLog.completed_at).label("last_completed")
+        )
+        .join(Exercise, Exercise.id == WorkoutLog.exercise_id)
+        .filter(WorkoutLog.user_id == user_id)
+    )
+    if days:
+        query = query.filter(WorkoutLog.completed_at >= datetime.utcnow() - timedelta(days=days))
+
+    query = query.group_by(WorkoutLog.exercise_id, Exercise.name).order_by(times_completed.desc(), Exercise.name)
+    if limit:
+        query = query.limit(limit)
+
+    return [
+        {
+            "exercise_id": row.exercise_id,
+            "name": row.name,
+            "times_completed": row.times_completed,
+            "last_completed": row.last_completed
+        }
+        for row in query.all()
+    ]
@@ -71,3 +71,9 @@ class Config:
 class LoginRequest(BaseModel):
     email: str
     password: str
+
+
+class CoachProgressRequest(BaseModel):
+    user_ids: List[int] = Field(..., min_length=1, max_length=1000)
+    window_days: int = Field(30, ge=1, le=3650)
+    points: int = Field(20, ge=2, le=500)  # Max points per user in the downsampled series
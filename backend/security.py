@@ -0,0 +1,49 @@
+# backend/security.py
+
+from datetime import datetime, timedelta
+
+import jwt
+from fastapi import HTTPException
+from werkzeug.security import generate_password_hash, check_password_hash
+
+from backend.metrics import HASHING_IN_FLIGHT
+
+# Secret key for encoding and decoding JWT tokens
+SECRET_KEY = "your_secret_key"  # Change this to a secure random key
+ALGORITHM = "HS256"
+ACCESS_TOKEN_EXPIRE_MINUTES = 30  # Set token expiration time
+
+
+# Function to create a JWT token
+def create_access_token(data: dict, expires_delta: timedelta = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)):
+    to_encode = data.copy()
+    expire = datetime.utcnow() + expires_delta
+    to_encode.update({"exp": expire})
+    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return encoded_jwt
+
+
+# Function to verify the token
+def verify_access_token(token: str):
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        return payload
+    except jwt.PyJWTError:
+        raise HTTPException(status_code=403, detail="Invalid token or expired")
+
+
+# Password hashing is the most CPU-heavy step of signup/login; the gauge shows how many are running
+def hash_password(password: str) -> str:
+    HASHING_IN_FLIGHT.inc()
+    try:
+        return generate_password_hash(password, method='pbkdf2:sha256')
+    finally:
+        HASHING_IN_FLIGHT.dec()
+
+
+def verify_password(password_hash: str, password: str) -> bool:
+    HASHING_IN_FLIGHT.inc()
+    try:
+        return check_password_hash(password_hash, password)
+    finally:
+        HASHING_IN_FLIGHT.dec()
@@ -0,0 +1,113 @@
+# backend/serializers.py
+
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from typing_extensions import TypedDict
+
+try:
+    import msgpack
+except ImportError:  # optional: without it every client gets JSON
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Response shapes of the hot routes. Each TypeAdapter builds its pydantic-core serializer
+# once at import, so a response is one dump_json() call straight to bytes instead of
+# jsonable_encoder walking every row followed by json.dumps.
+
+
+class ExerciseOut(TypedDict):
+    """database.exercise_to_dict()"""
+    id: int
+    name: str
+    description: Optional[str]
+    toughness: Optional[str]
+    media_url: Optional[str]
+    tags: List[str]
+    suggested_reps: Optional[int]
+
+
+class ExerciseDetailOut(TypedDict):
+    """GET /exercise/{exercise_id}"""
+    name: str
+    image_url: Optional[str]
+    description: Optional[str]
+    tags: List[str]
+    suggested_reps: Optional[int]
+    toughness: Optional[str]
+
+
+class UserOut(TypedDict):
+    """database.user_to_dict(); missing profile fields are "N/A"."""
+    id: int
+    username: str
+    full_name: str
+    email: str
+    height: Union[int, float, str]
+    weight: Union[int, float, str]
+    gender: str
+    dob: str
+    role: str
+
+
+class LoginOut(TypedDict):
+    access_token: str
+    token_type: str
+    user: Optional[UserOut]
+
+
+class ProgressOut(TypedDict):
+    date: Optional[datetime]
+    height: Optional[float]
+    weight: Optional[float]
+
+
+class CatalogChangesOut(TypedDict):
+    """GET /exercises/changes"""
+    version: int
+    full: bool
+    upserts: List[ExerciseOut]
+    deleted: List[int]
+
+
+class FacetCountsOut(TypedDict):
+    """GET /exercises/facets"""
+    toughness: Dict[str, int]
+    tags: Dict[str, int]
+
+
+exercise_list = TypeAdapter(List[ExerciseOut])
+exercise_detail = TypeAdapter(ExerciseDetailOut)
+login_response = TypeAdapter(LoginOut)
+progress_list = TypeAdapter(List[ProgressOut])
+id_list = TypeAdapter(List[int])
+catalog_changes = TypeAdapter(CatalogChangesOut)
+facet_counts = TypeAdapter(FacetCountsOut)
+error = TypeAdapter(dict)
+
+
+def json_response(adapter: TypeAdapter, content, status_code: int = 200) -> Response:
+    """Serializes with a precompiled adapter; FastAPI passes a returned Response through untouched."""
+    return Response(adapter.dump_json(content), status_code=status_code, media_type="application/json")
+
+
+def wants_msgpack(request: Request) -> bool:
+    return msgpack is not None and MSGPACK_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def negotiated_response(request: Request, adapter: TypeAdapter, content, status_code: int = 200) -> Response:
+    """MessagePack for clients sending `Accept: application/msgpack`, JSON otherwise.
+
+    The adapter's "json" mode yields the same values the JSON body has (datetimes as
+    ISO strings), so clients decode either format into identical structures.
+    """
+    if wants_msgpack(request):
+        body = msgpack.packb(adapter.dump_python(content, mode="json"))
+        media_type = MSGPACK_MEDIA_TYPE
+    else:
+        body = adapter.dump_json(content)
+        media_type = "application/json"
+    return Response(body, status_code=status_code, media_type=media_type, headers={"Vary": "Accept"})
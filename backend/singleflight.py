@@ -0,0 +1,163 @@
+# backend/singleflight.py
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from backend import metrics
+from backend.cache import LRUCache
+
+_MISSING = object()
+
+FLIGHTS = metrics.registry.register(metrics.Counter(
+    "flexfit_singleflight_calls_total",
+    "Loads by coalescing group; outcome=coalesced means the caller waited on another caller's load.",
+    ("group", "outcome")))
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Runs one load per key at a time; concurrent callers with the same key share its result.
+
+    do() is for threadpool routes, do_async() for the async ones; each keeps its own
+    in-flight table. Errors are shared too, so a failing query fails every waiter once
+    instead of being retried by each of them.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._tasks = {}
+
+    def do(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            FLIGHTS.inc(group=self.name, outcome="coalesced")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        FLIGHTS.inc(group=self.name, outcome="executed")
+        try:
+            call.result = load()
+            return call.result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+    async def do_async(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._tasks.get(key)
+        if task is not None:
+            FLIGHTS.inc(group=self.name, outcome="coalesced")
+            # shield: one waiter disconnecting must not cancel the load for the rest
+            return await asyncio.shield(task)
+
+        FLIGHTS.inc(group=self.name, outcome="executed")
+        task = self._tasks[key] = asyncio.ensure_future(load())
+
+        def _done(finished):
+            if self._tasks.get(key) is finished:
+                del self._tasks[key]
+            if not finished.cancelled():
+                finished.exception()  # retrieved, so a failure nobody awaited isn't logged as lost
+
+        task.add_done_callback(_done)
+        return await asyncio.shield(task)
+
+    def forget(self, key: Optional[Hashable] = None):
+        """Callers arriving after this start a new load instead of joining one that began before a write."""
+        with self._lock:
+            if key is None:
+                self._calls.clear()
+                self._tasks.clear()
+            else:
+                self._calls.pop(key, None)
+                self._tasks.pop(key, None)
+
+
+class CoalescingCache:
+    """LRUCache whose misses are loaded once, however many requests miss together.
+
+    invalidate() bumps a generation counter, so a load that was already running when
+    the data changed still answers its waiters but is not stored. A load returning None
+    (an unknown id) is cached too, for negative_ttl when that is set.
+    """
+
+    def __init__(self, name: str, maxsize: int = 128, ttl: Optional[float] = None,
+                 negative_ttl: Optional[float] = None):
+        self.cache = LRUCache(maxsize=maxsize, ttl=ttl)
+        self.negative_ttl = negative_ttl
+        self.flight = SingleFlight(name)
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key: Hashable, load: Callable[[], Any]) -> Any:
+        value = self.cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        def fill():
+            generation = self._generation
+            value = load()
+            self._store(generation, key, value)
+            return value
+
+        return self.flight.do(key, fill)
+
+    async def get_or_load_async(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        value = self.cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        async def fill():
+            generation = self._generation
+            value = await load()
+            self._store(generation, key, value)
+            return value
+
+        return await self.flight.do_async(key, fill)
+
+    def _store(self, generation: int, key: Hashable, value: Any):
+        # Under the lock invalidate() holds while it bumps the generation and drops entries,
+        # so an invalidation lands either before the check (skip) or after the set (evicted)
+        with self._lock:
+            if generation == self._generation:
+                self.cache.set(key, value, ttl=self.negative_ttl if value is None else None)
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self.cache.clear()
+            else:
+                self.cache.pop(key)
+        self.flight.forget(key)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]):
+        """For keys that embed an engine or other scope the invalidation doesn't know about."""
+        with self._lock:
+            self._generation += 1
+            self.cache.pop_where(predicate)
+        self.flight.forget()
+
+    def stats(self) -> dict:
+        return self.cache.stats()
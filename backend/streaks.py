@@ -0,0 +1,147 @@
+# backend/streaks.py
+
+from datetime import date, datetime, timedelta
+from typing import Iterable, Optional
+
+from sqlalchemy import func, union
+from sqlalchemy.orm import Session
+
+from backend.database import SessionLocal, insert_if_missing
+from backend.models import ProgressLog, UserStreak, WorkoutLog
+
+
+def _as_date(value) -> date:
+    """Normalizes datetimes and SQLite's 'YYYY-MM-DD' strings to a date."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+
+
+def apply_activity(streak: UserStreak, day: date) -> UserStreak:
+    """Folds one day of activity into the counters in O(1).
+
+    Activity older than the last recorded day is ignored here; run
+    backfill_streaks() if history is ever inserted out of order.
+    """
+    last = streak.last_activity_date
+    if last is not None and day <= last:
+        return streak
+
+    if last is not None and day - last == timedelta(days=1):
+        streak.current_streak = (streak.current_streak or 0) + 1
+    else:
+        streak.current_streak = 1
+
+    streak.longest_streak = max(streak.longest_streak or 0, streak.current_streak)
+    streak.last_activity_date = day
+    return streak
+
+
+def record_activity(db: Session, user_id: int, when: Optional[datetime] = None) -> UserStreak:
+    """Updates a user's streak row for new activity. The caller commits.
+
+    The row is created with an insert-or-ignore and then read FOR UPDATE, so concurrent
+    requests for one user neither collide on the insert nor fold their day into a copy
+    another request is about to overwrite (SQLite already serializes writers).
+    """
+    day = _as_date(when or datetime.utcnow())
+    pending = [obj for obj in db.dirty if isinstance(obj, UserStreak) and obj.user_id == user_id]
+    if pending:
+        db.flush(pending)  # an earlier call in this session; the locked re-read below must see it
+    insert_if_missing(db, UserStreak, {"user_id": user_id, "current_streak": 0, "longest_streak": 0})
+    streak = db.get(UserStreak, user_id, populate_existing=True, with_for_update=True)
+    return apply_activity(streak, day)
+
+
+def active_streak(streak: Optional[UserStreak], today: Optional[date] = None) -> int:
+    """Current streak as seen today: it lapses once a full day is missed."""
+    if streak is None or streak.last_activity_date is None:
+        return 0
+    today = today or datetime.utcnow().date()
+    if today - streak.last_activity_date > timedelta(days=1):
+        return 0
+    return streak.current_streak or 0
+
+
+def get_streak(db: Session, user_id: int) -> dict:
+    streak = db.get(UserStreak, user_id)
+    return {
+        "user_id": user_id,
+        "streak": active_streak(streak),
+        "longest_streak": streak.longest_streak if streak else 0,
+        "last_activity_date": str(streak.last_activity_date) if streak and streak.last_activity_date else None,
+    }
+
+
+def compute_streak(days: Iterable[date]) -> tuple:
+    """Returns (current, longest, last_day) for ascending, de-duplicated days."""
+    current = longest = 0
+    last = None
+    for day in days:
+        if last is not None and day - last == timedelta(days=1):
+            current += 1
+        elif last is None or day != last:
+            current = 1
+        longest = max(longest, current)
+        last = day
+    return current, longest, last
+
+
+def backfill_streaks(db: Session, user_ids: Optional[Iterable[int]] = None) -> int:
+    """Recomputes streak rows from progress and workout history.
+
+    Activity days are streamed ordered by (user_id, day) so each user is
+    folded in a single pass without loading the whole log table.
+    Returns the number of users written.
+    """
+    progress_days = db.query(
+        ProgressLog.user_id.label("user_id"), func.date(ProgressLog.date).label("day")
+    )
+    workout_days = db.query(
+        WorkoutLog.user_id.label("user_id"), func.date(WorkoutLog.completed_at).label("day")
+    )
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        progress_days = progress_days.filter(ProgressLog.user_id.in_(user_ids))
+        workout_days = workout_days.filter(WorkoutLog.user_id.in_(user_ids))
+
+    activity = union(progress_days.statement, workout_days.statement).subquery()
+    rows = db.execute(
+        activity.select()
+        .where(activity.c.day.isnot(None))
+        .order_by(activity.c.user_id, activity.c.day)
+    )
+
+    # Fold each user's days as they stream past, then write once the cursor is drained
+    results = {}
+    current_user, days = None, []
+    for user_id, day in rows:
+        if user_id != current_user and current_user is not None:
+            results[current_user] = compute_streak(days)
+            days = []
+        current_user = user_id
+        days.append(_as_date(day))
+    if current_user is not None:
+        results[current_user] = compute_streak(days)
+
+    for user_id, (current, longest, last) in results.items():
+        db.merge(UserStreak(
+            user_id=user_id,
+            current_streak=current,
+            longest_streak=longest,
+            last_activity_date=last,
+        ))
+
+    db.commit()
+    return len(results)
+
+
+# ✅ Backfill job for existing users: python -m backend.streaks
+if __name__ == "__main__":
+    session = SessionLocal()
+    try:
+        print(f"✅ Backfilled streaks for {backfill_streaks(session)} users.")
+    finally:
+        session.close()
@@ -0,0 +1,83 @@
+"""Concurrent-write throughput: default engine vs the tuned profile from backend/database.py.
+
+Usage:
+    python -m benchmarks.bench_db_pool --threads 16 --writes 200
+    python -m benchmarks.bench_db_pool --url postgresql://user:pw@localhost/flexfit_bench
+
+With no --url each run gets a fresh SQLite file in a temp directory.
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from backend.database import build_engine, pool_stats
+
+SETUP = "CREATE TABLE IF NOT EXISTS bench_writes (id INTEGER PRIMARY KEY, worker INTEGER, payload VARCHAR(64))"
+
+
+def run(engine, threads: int, writes: int) -> dict:
+    with engine.begin() as conn:
+        conn.execute(text(SETUP))
+        conn.execute(text("DELETE FROM bench_writes"))
+
+    errors = []
+    barrier = threading.Barrier(threads)
+
+    def worker(worker_id):
+        barrier.wait()
+        for i in range(writes):
+            try:
+                with engine.begin() as conn:
+                    conn.execute(
+                        text("INSERT INTO bench_writes (worker, payload) VALUES (:w, :p)"),
+                        {"w": worker_id, "p": f"row-{worker_id}-{i}"},
+                    )
+                    conn.execute(text("SELECT COUNT(*) FROM bench_writes WHERE worker = :w"), {"w": worker_id})
+            except OperationalError as e:
+                errors.append(str(e.orig))
+
+    pool = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    committed = threads * writes - len(errors)
+    return {
+        "seconds": round(elapsed, 3),
+        "writes_per_sec": round(committed / elapsed, 1),
+        "failed_writes": len(errors),
+        "pool": pool_stats(engine),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Database URL (default: fresh SQLite files)")
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--writes", type=int, default=200, help="Transactions per thread")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        def url_for(name):
+            return args.url or f"sqlite:///{os.path.join(tmp, name)}.db"
+
+        default_engine = create_engine(url_for("default"))
+        tuned_engine = build_engine(url_for("tuned"))
+
+        for label, engine in (("default", default_engine), ("tuned", tuned_engine)):
+            result = run(engine, args.threads, args.writes)
+            print(f"{label:>8}: {result['writes_per_sec']:>9} writes/s  "
+                  f"failed={result['failed_writes']}  {result['seconds']}s  pool={result['pool']}")
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
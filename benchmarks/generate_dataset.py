@@ -0,0 +1,283 @@
+"""Synthetic FlexFit dataset at production-like volumes, built on the backend/models.py schema.
+
+Usage:
+    python -m benchmarks.generate_dataset --url sqlite:///bench.db --preset small
+    python -m benchmarks.generate_dataset --url postgresql://user:pw@localhost/flexfit_bench --preset production --reset
+
+Rows are generated in batches and written with executemany Core inserts (COPY on
+PostgreSQL). Secondary indexes are created after the load. The same --seed and
+--end-date always produce the same rows. Every user's password is BENCH_PASSWORD
+and their email is user_email(id).
+"""
+import argparse
+import csv
+import io
+import json
+import random
+import time
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+from typing import Iterator, Optional
+
+from sqlalchemy import create_engine, event, func, insert, select
+from sqlalchemy.engine import Connection, Engine
+
+from backend.models import Base, Exercise, ProgressLog, SavedExercise, User, WorkoutLog
+from backend.security import hash_password
+
+BENCH_PASSWORD = "bench-password"
+BATCH_SIZE = 10_000
+
+Sizes = namedtuple("Sizes", "users exercises progress_logs workout_logs saved")
+
+PRESETS = {
+    "tiny": Sizes(users=200, exercises=500, progress_logs=5_000, workout_logs=10_000, saved=2_000),
+    "small": Sizes(users=10_000, exercises=5_000, progress_logs=200_000, workout_logs=500_000, saved=50_000),
+    "medium": Sizes(users=100_000, exercises=20_000, progress_logs=2_000_000, workout_logs=5_000_000,
+                    saved=500_000),
+    "production": Sizes(users=1_000_000, exercises=100_000, progress_logs=25_000_000,
+                        workout_logs=25_000_000, saved=5_000_000),
+}
+
+# Tag -> relative frequency; the frontend's category screens filter on these
+TAG_WEIGHTS = {
+    "without equipment": 40,
+    "with equipment": 30,
+    "indoor": 25,
+    "outdoor": 15,
+    "wellness": 10,
+    "strength": 20,
+    "cardio": 18,
+    "mobility": 8,
+}
+TOUGHNESS_WEIGHTS = {"Easy": 45, "Medium": 35, "Hard": 20}
+MOVEMENTS = ("Squat", "Lunge", "Push-up", "Plank", "Row", "Press", "Curl", "Deadlift", "Burpee", "Stretch",
+             "Bridge", "Crunch", "Jump", "Sprint", "Hold")
+VARIANTS = ("Split", "Sumo", "Incline", "Decline", "Single-leg", "Tempo", "Pulse", "Wide", "Narrow", "Isometric")
+DAYS_OF_HISTORY = 365
+
+
+def user_email(user_id: int) -> str:
+    return f"user{user_id}@flexfit.test"
+
+
+def _rng(seed: int, table: str) -> random.Random:
+    """One stream per table, so resizing one table does not change the rows of another."""
+    return random.Random(f"{seed}:{table}")
+
+
+def _active_user(rng: random.Random, users: int) -> int:
+    """Skewed pick: a small share of users produce most of the activity, as in production."""
+    return min(users, int(users * rng.random() ** 3) + 1)
+
+
+def _timestamp(rng: random.Random, end: datetime) -> datetime:
+    return end - timedelta(seconds=rng.randrange(DAYS_OF_HISTORY * 86400))
+
+
+def exercise_rows(sizes: Sizes, seed: int) -> Iterator[dict]:
+    rng = _rng(seed, "exercises")
+    tags, tag_weights = list(TAG_WEIGHTS), list(TAG_WEIGHTS.values())
+    levels, level_weights = list(TOUGHNESS_WEIGHTS), list(TOUGHNESS_WEIGHTS.values())
+    for i in range(1, sizes.exercises + 1):
+        chosen = sorted(set(rng.choices(tags, tag_weights, k=rng.randint(1, 3))))
+        yield {
+            "id": i,
+            "name": f"{rng.choice(VARIANTS)} {rng.choice(MOVEMENTS)} {i}",
+            "description": f"Synthetic exercise {i}",
+            "toughness": rng.choices(levels, level_weights)[0],
+            "media_url": None,
+            "tags": json.dumps(chosen),
+            "suggested_reps": rng.randint(5, 30),
+        }
+
+
+def user_rows(sizes: Sizes, seed: int) -> Iterator[dict]:
+    rng = _rng(seed, "users")
+    password_hash = hash_password(BENCH_PASSWORD)  # hashing is slow; every user shares one
+    for i in range(1, sizes.users + 1):
+        yield {
+            "id": i,
+            "username": f"user{i}",
+            "full_name": f"Synthetic User {i}",
+            "email": user_email(i),
+            "password_hash": password_hash,
+            "dob": (date(1960, 1, 1) + timedelta(days=rng.randrange(45 * 365))).isoformat(),
+            "weight": rng.randint(45, 120),
+            "height": rng.randint(150, 200),
+            "gender": rng.choice(("male", "female", "other")),
+            "role": "admin" if i == 1 else "user",
+        }
+
+
+def progress_rows(sizes: Sizes, seed: int, end: datetime) -> Iterator[dict]:
+    rng = _rng(seed, "progress_logs")
+    for i in range(1, sizes.progress_logs + 1):
+        yield {
+            "id": i,
+            "user_id": _active_user(rng, sizes.users),
+            "date": _timestamp(rng, end),
+            "height": round(rng.uniform(150, 200), 1),
+            "weight": round(rng.uniform(45, 120), 1),
+        }
+
+
+def workout_rows(sizes: Sizes, seed: int, end: datetime) -> Iterator[dict]:
+    rng = _rng(seed, "workout_logs")
+    for i in range(1, sizes.workout_logs + 1):
+        yield {
+            "id": i,
+            "user_id": _active_user(rng, sizes.users),
+            # Popular exercises get most completions too
+            "exercise_id": _active_user(rng, sizes.exercises),
+            "completed_at": _timestamp(rng, end),
+        }
+
+
+def saved_rows(sizes: Sizes, seed: int) -> Iterator[dict]:
+    """Distinct (user, exercise) pairs, as toggle_saved never stores duplicates."""
+    rng = _rng(seed, "saved_exercises")
+    remaining = sizes.saved
+    row_id = 0
+    while remaining > 0:
+        user_id = _active_user(rng, sizes.users)
+        count = min(remaining, rng.randint(1, 20), sizes.exercises)
+        for exercise_id in rng.sample(range(1, sizes.exercises + 1), count):
+            row_id += 1
+            yield {"id": row_id, "user_id": user_id, "exercise_id": exercise_id}
+        remaining -= count
+
+
+def _batches(rows: Iterator[dict], size: int) -> Iterator[list]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _copy(conn: Connection, table, batch: list):
+    """PostgreSQL COPY FROM STDIN (CSV) through psycopg 3 or psycopg2."""
+    columns = list(batch[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in batch:
+        writer.writerow(["" if row[c] is None else row[c] for c in columns])
+    sql = f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        if hasattr(cursor, "copy_expert"):  # psycopg2
+            buffer.seek(0)
+            cursor.copy_expert(sql, buffer)
+        else:  # psycopg 3
+            with cursor.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+    finally:
+        cursor.close()
+
+
+def load_table(engine: Engine, table, rows: Iterator[dict], batch_size: int = BATCH_SIZE) -> int:
+    use_copy = engine.dialect.name == "postgresql"
+    total = 0
+    with engine.begin() as conn:
+        for batch in _batches(rows, batch_size):
+            if use_copy:
+                _copy(conn, table, batch)
+            else:
+                conn.execute(insert(table), batch)
+            total += len(batch)
+    return total
+
+
+def _fix_sequences(engine: Engine, tables):
+    """Explicit ids leave PostgreSQL serial sequences behind; move them past the loaded rows."""
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as conn:
+        for table in tables:
+            conn.exec_driver_sql(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                f"COALESCE((SELECT MAX(id) FROM {table.name}), 0) + 1, false)"
+            )
+
+
+def generate(url: str, sizes: Sizes, seed: int = 42, end_date: Optional[date] = None,
+             reset: bool = False, verbose: bool = True) -> dict:
+    """Creates the schema (dropping it first with reset=True) and loads every table.
+
+    Returns {table name: rows inserted}. Refuses to load into a non-empty users table.
+    """
+    end = datetime.combine(end_date or date.today(), datetime.min.time()) + timedelta(days=1)
+    engine = create_engine(url)
+    if engine.dialect.name == "sqlite":
+        @event.listens_for(engine, "connect")
+        def _fast_load(dbapi_connection, connection_record):
+            # Throwaway benchmark data: skip the journal and fsyncs during the load
+            dbapi_connection.execute("PRAGMA journal_mode=OFF")
+            dbapi_connection.execute("PRAGMA synchronous=OFF")
+
+    if reset:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.connect() as conn:
+        if conn.execute(select(func.count()).select_from(User.__table__)).scalar():
+            raise SystemExit("Target database already has users; rerun with --reset to replace them")
+
+    plan = [
+        (Exercise.__table__, exercise_rows(sizes, seed)),
+        (User.__table__, user_rows(sizes, seed)),
+        (ProgressLog.__table__, progress_rows(sizes, seed, end)),
+        (WorkoutLog.__table__, workout_rows(sizes, seed, end)),
+        (SavedExercise.__table__, saved_rows(sizes, seed)),
+    ]
+
+    # Building secondary indexes once at the end is much cheaper than maintaining them per row
+    deferred = [index for table, _ in plan for index in table.indexes]
+    with engine.begin() as conn:
+        for index in deferred:
+            index.drop(conn, checkfirst=True)
+
+    counts = {}
+    for table, rows in plan:
+        start = time.perf_counter()
+        counts[table.name] = load_table(engine, table, rows)
+        if verbose:
+            elapsed = time.perf_counter() - start
+            print(f"{table.name:>16}: {counts[table.name]:>11,} rows in {elapsed:7.1f}s "
+                  f"({counts[table.name] / max(elapsed, 1e-9):,.0f} rows/s)")
+
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        for index in deferred:
+            index.create(conn, checkfirst=True)
+    _fix_sequences(engine, [table for table, _ in plan])
+    if verbose:
+        print(f"{'indexes':>16}: {len(deferred):>11} built in {time.perf_counter() - start:7.1f}s")
+
+    engine.dispose()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", required=True, help="Target database URL")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="small")
+    for field in Sizes._fields:
+        parser.add_argument(f"--{field.replace('_', '-')}", type=int, help=f"Override the preset's {field}")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--end-date", type=date.fromisoformat,
+                        help="Last day of generated activity, YYYY-MM-DD (default: today)")
+    parser.add_argument("--reset", action="store_true", help="Drop and recreate every table first")
+    args = parser.parse_args()
+
+    overrides = {f: getattr(args, f) for f in Sizes._fields if getattr(args, f) is not None}
+    sizes = PRESETS[args.preset]._replace(**overrides)
+    print(f"Generating {args.preset} dataset {dict(sizes._asdict())} with seed {args.seed}")
+    generate(args.url, sizes, args.seed, args.end_date, args.reset)
+
+
+if __name__ == "__main__":
+    main()
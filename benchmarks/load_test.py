@@ -0,0 +1,255 @@
+"""HTTP load test: generates a dataset, launches uvicorn on it and drives the hot endpoints.
+
+Usage:
+    python -m benchmarks.load_test --concurrency 32 --duration 30 --preset small
+    python -m benchmarks.load_test --out results/after.json --baseline results/before.json
+    python -m benchmarks.load_test --target http://localhost:8000   # already running server, no seeding
+
+Reports requests/s and p50/p95/p99 latency per endpoint. With --baseline the run is
+compared against an earlier --out file and the exit status is 1 if any endpoint
+regressed by more than --threshold.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import httpx
+
+from benchmarks.generate_dataset import BENCH_PASSWORD, PRESETS, generate, user_email
+
+# Relative weight of each scenario in the request mix
+DEFAULT_MIX = {"exercises": 30, "exercise": 30, "progress_get": 15, "progress_post": 5,
+               "toggle_saved": 10, "login": 10}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def launch_server(database_url: str, port: int, workers: int, extra_env: dict) -> subprocess.Popen:
+    env = dict(os.environ, DATABASE_URL=database_url, LOG_LEVEL="WARNING", **extra_env)
+    cmd = [sys.executable, "-m", "uvicorn", "backend.main:app", "--host", "127.0.0.1",
+           "--port", str(port), "--workers", str(workers), "--log-level", "warning", "--no-access-log"]
+    return subprocess.Popen(cmd, env=env)
+
+
+def wait_until_ready(base_url: str, server: subprocess.Popen, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with status {server.returncode}")
+        try:
+            if httpx.get(f"{base_url}/openapi.json", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become ready within {timeout}s")
+
+
+def _request(name: str, rng: random.Random, users: int, exercises: int):
+    """(method, path, kwargs) for one request of the given scenario."""
+    user_id = rng.randint(1, users)
+    exercise_id = rng.randint(1, exercises)
+    if name == "login":
+        return "POST", "/login/", {"json": {"email": user_email(user_id), "password": BENCH_PASSWORD}}
+    if name == "exercises":
+        return "GET", "/exercises/", {}
+    if name == "exercise":
+        return "GET", f"/exercise/{exercise_id}", {}
+    if name == "toggle_saved":
+        return "POST", f"/toggle_saved/{user_id}/{exercise_id}", {}
+    if name == "progress_post":
+        return "POST", f"/progress/{user_id}", {"params": {"height": 175, "weight": rng.uniform(60, 90)}}
+    if name == "progress_get":
+        return "GET", f"/progress/{user_id}", {}
+    raise ValueError(f"Unknown scenario '{name}'")
+
+
+async def drive(base_url: str, mix: dict, concurrency: int, duration: float, warmup: float,
+                users: int, exercises: int, seed: int) -> dict:
+    """Runs `concurrency` closed-loop clients; returns {scenario: [(latency_s, status), ...]}."""
+    names = list(mix)
+    weights = [mix[n] for n in names]
+    samples = {name: [] for name in names}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        start = time.perf_counter()
+        measure_from = start + warmup
+        stop_at = measure_from + duration
+
+        async def client_loop(n: int):
+            rng = random.Random(seed + n)
+            while True:
+                now = time.perf_counter()
+                if now >= stop_at:
+                    return
+                name = rng.choices(names, weights)[0]
+                method, path, kwargs = _request(name, rng, users, exercises)
+                try:
+                    status = (await client.request(method, path, **kwargs)).status_code
+                except httpx.HTTPError:
+                    status = 0
+                if now >= measure_from:
+                    samples[name].append((time.perf_counter() - now, status))
+
+        await asyncio.gather(*(client_loop(n) for n in range(concurrency)))
+    return samples
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(samples: list, duration: float) -> dict:
+    latencies = sorted(latency for latency, _ in samples)
+    errors = sum(1 for _, status in samples if status == 0 or status >= 500)
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "rps": round(len(samples) / duration, 2),
+        "mean_ms": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """Endpoints whose p95/p99 grew, or whose throughput fell, by more than `threshold`."""
+    regressions = []
+    for name, now in current["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(name)
+        if not before or not before["requests"]:
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            if before[metric] and now[metric] > before[metric] * (1 + threshold):
+                regressions.append(f"{name}: {metric} {before[metric]} -> {now[metric]}")
+        if now["rps"] < before["rps"] * (1 - threshold):
+            regressions.append(f"{name}: rps {before['rps']} -> {now['rps']}")
+    return regressions
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _parse_mix(value: str) -> dict:
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        _request(name.strip(), random.Random(), 1, 1)  # validates the name
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def print_report(result: dict):
+    print(f"{'endpoint':<14}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    rows = list(result["endpoints"].items()) + [("TOTAL", result["overall"])]
+    for name, row in rows:
+        print(f"{name:<14}{row['requests']:>10}{row['errors']:>8}{row['rps']:>10}"
+              f"{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Database to seed and serve (default: fresh SQLite file)")
+    parser.add_argument("--skip-generate", action="store_true",
+                        help="--database-url already holds a dataset generated with the same --preset")
+    parser.add_argument("--target", help="Base URL of an already running server; skips seeding and launch")
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent clients")
+    parser.add_argument("--duration", type=float, default=20, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=3, help="Seconds of load before measuring")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="tiny",
+                        help="Dataset size from benchmarks/generate_dataset.py")
+    parser.add_argument("--mix", type=_parse_mix, default=DEFAULT_MIX,
+                        help="Scenario weights, e.g. exercises=3,exercise=3,login=1")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--env", action="append", default=[], metavar="NAME=VALUE",
+                        help="Extra environment for the server, e.g. --env ASYNC_DB=1")
+    parser.add_argument("--out", help="Write the results as JSON to this file")
+    parser.add_argument("--baseline", help="Earlier --out file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed regression (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    sizes = PRESETS[args.preset]
+    server = None
+    with tempfile.TemporaryDirectory() as tmp:
+        try:
+            if args.target:
+                base_url = args.target.rstrip("/")
+            else:
+                database_url = args.database_url or f"sqlite:///{os.path.join(tmp, 'load_test.db')}"
+                if not args.skip_generate:
+                    print(f"Generating the {args.preset} dataset ...")
+                    generate(database_url, sizes, args.seed, verbose=False)
+                port = _free_port()
+                base_url = f"http://127.0.0.1:{port}"
+                extra_env = dict(item.split("=", 1) for item in args.env)
+                server = launch_server(database_url, port, args.workers, extra_env)
+                wait_until_ready(base_url, server)
+
+            print(f"Driving {base_url} with {args.concurrency} clients for {args.duration}s ...")
+            samples = asyncio.run(drive(base_url, args.mix, args.concurrency, args.duration, args.warmup,
+                                        sizes.users, sizes.exercises, args.seed))
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait(timeout=10)
+
+    result = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "target": args.target or (args.database_url or "sqlite (temp file)").split("@")[-1],
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "workers": args.workers,
+            "preset": args.preset,
+            "mix": args.mix,
+            "env": args.env,
+        },
+        "endpoints": {name: summarize(rows, args.duration) for name, rows in samples.items()},
+        "overall": summarize([row for rows in samples.values() for row in rows], args.duration),
+    }
+    print_report(result)
+
+    if args.out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"Saved results to {args.out}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(result, json.load(f), args.threshold)
+        if regressions:
+            print(f"Regressions beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+"""Microbenchmarks for the per-row serialization, token and password hashing paths.
+
+Usage:
+    python -m benchmarks.microbench                          # run and print
+    python -m benchmarks.microbench --save                   # also store as the baseline
+    python -m benchmarks.microbench --compare                # report against the stored baseline
+    python -m benchmarks.microbench -k exercise --compare benchmarks/baselines/before.json
+
+Each benchmark is calibrated to run for about --min-time seconds per round, over
+--rounds rounds. The median per-call time is what gets compared; a change beyond
+--threshold is reported as a regression or improvement, and --fail-on-regression
+turns regressions into exit status 1.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend import serializers
+from backend.database import Base, exercise_to_dict, get_user_data, user_profiles, user_to_dict
+from backend.models import Exercise, User
+from backend.schemas import ExerciseResponse
+from backend.security import create_access_token, hash_password, verify_access_token, verify_password
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "microbench.json")
+
+# name -> setup function returning (callable, rows handled per call)
+BENCHMARKS: Dict[str, Callable[[], tuple]] = {}
+
+
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+def _exercises(count: int) -> list:
+    tags = ["with equipment", "indoor", "strength"]
+    return [
+        Exercise(id=i, name=f"Exercise {i}", description="Synthetic exercise", toughness="Medium",
+                 media_url="https://example.com/image.png", tags=json.dumps(tags[: i % 3 + 1]), suggested_reps=12)
+        for i in range(1, count + 1)
+    ]
+
+
+def _progress_rows(count: int) -> list:
+    start = datetime(2025, 1, 1)
+    return [{"date": start + timedelta(days=i), "height": 175.0, "weight": 70.0 + i % 10} for i in range(count)]
+
+
+def _session_with_user():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine, autoflush=False)()
+    db.add(User(id=1, username="bench", full_name="Bench User", email="bench@flexfit.test",
+                password_hash="x", dob="1990-01-01", weight=70, height=175, gender="N/A", role="user"))
+    db.commit()
+    return db
+
+
+@benchmark("get_exercises_rows[1000]")
+def _get_exercises_rows():
+    rows = _exercises(1000)
+    return (lambda: [exercise_to_dict(ex) for ex in rows]), len(rows)
+
+
+@benchmark("exercise_tags_json_loads[1000]")
+def _tags_json_loads():
+    tags = [ex.tags for ex in _exercises(1000)]
+    return (lambda: [json.loads(t) if t else [] for t in tags]), len(tags)
+
+
+@benchmark("exercises_json_encoder[1000]")
+def _exercises_json_encoder():
+    """How /exercises/ was rendered before backend/serializers.py: jsonable_encoder + json.dumps."""
+    rows = [exercise_to_dict(ex) for ex in _exercises(1000)]
+    return (lambda: json.dumps(jsonable_encoder(rows), ensure_ascii=False, allow_nan=False,
+                               separators=(",", ":")).encode("utf-8")), len(rows)
+
+
+@benchmark("exercises_json_typeadapter[1000]")
+def _exercises_json_typeadapter():
+    rows = [exercise_to_dict(ex) for ex in _exercises(1000)]
+    return (lambda: serializers.exercise_list.dump_json(rows)), len(rows)
+
+
+@benchmark("progress_json_encoder[1000]")
+def _progress_json_encoder():
+    rows = _progress_rows(1000)
+    return (lambda: json.dumps(jsonable_encoder(rows), separators=(",", ":")).encode("utf-8")), len(rows)
+
+
+@benchmark("progress_json_typeadapter[1000]")
+def _progress_json_typeadapter():
+    rows = _progress_rows(1000)
+    return (lambda: serializers.progress_list.dump_json(rows)), len(rows)
+
+
+@benchmark("edit_exercise_response")
+def _edit_exercise_response():
+    exercise = _exercises(1)[0]
+    return (lambda: ExerciseResponse(**exercise_to_dict(exercise))), 1
+
+
+@benchmark("user_to_dict")
+def _user_to_dict():
+    user = User(id=1, username="bench", full_name="Bench User", email="bench@flexfit.test", dob="1990-01-01",
+                weight=70, height=175, gender="N/A", role="user")
+    return (lambda: user_to_dict(user)), 1
+
+
+@benchmark("get_user_data[sqlite]")
+def _get_user_data():
+    db = _session_with_user()
+    key = (db.get_bind(), 1)
+
+    def uncached():
+        # Drop the cached profile first so this keeps timing the query, as in the baseline
+        user_profiles.invalidate(key)
+        return get_user_data(db, 1)
+
+    return uncached, 1
+
+
+@benchmark("get_user_data[cached]")
+def _get_user_data_cached():
+    db = _session_with_user()
+    return (lambda: get_user_data(db, 1)), 1
+
+
+@benchmark("create_access_token")
+def _create_token():
+    return (lambda: create_access_token({"sub": "bench@flexfit.test"})), 1
+
+
+@benchmark("verify_access_token")
+def _verify_token():
+    token = create_access_token({"sub": "bench@flexfit.test"})
+    return (lambda: verify_access_token(token)), 1
+
+
+@benchmark("hash_password")
+def _hash_password():
+    return (lambda: hash_password("bench-password")), 1
+
+
+@benchmark("verify_password")
+def _verify_password():
+    hashed = hash_password("bench-password")
+    return (lambda: verify_password(hashed, "bench-password")), 1
+
+
+def measure(fn: Callable, min_time: float, rounds: int) -> dict:
+    """Per-call timings over `rounds` rounds, each looping fn enough times to last ~min_time."""
+    fn()  # warm up caches and lazy imports
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9)))
+
+    per_call = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        per_call.append((time.perf_counter() - start) / loops)
+    return {
+        "loops": loops,
+        "rounds": rounds,
+        "min_us": round(min(per_call) * 1e6, 3),
+        "median_us": round(statistics.median(per_call) * 1e6, 3),
+        "mean_us": round(statistics.fmean(per_call) * 1e6, 3),
+        "stdev_us": round(statistics.stdev(per_call) * 1e6, 3) if rounds > 1 else 0.0,
+        "ops_per_sec": round(1 / statistics.median(per_call), 1),
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """(name, before_us, after_us, change, verdict) for every benchmark present in both runs."""
+    rows = []
+    for name, now in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        change = now["median_us"] / before["median_us"] - 1 if before["median_us"] else 0.0
+        verdict = "regressed" if change > threshold else "improved" if change < -threshold else "same"
+        rows.append((name, before["median_us"], now["median_us"], change, verdict))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="keyword", help="Only run benchmarks whose name contains this")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Target seconds per round")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, help="Store results as a baseline file")
+    parser.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, help="Baseline file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change reported (0.10 = 10%%)")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    selected = {name: setup for name, setup in BENCHMARKS.items() if not args.keyword or args.keyword in name}
+    results = {}
+    print(f"{'benchmark':<32}{'median us':>12}{'min us':>12}{'stdev us':>12}{'ops/s':>14}")
+    for name, setup in selected.items():
+        fn, rows = setup()
+        result = measure(fn, args.min_time, args.rounds)
+        result["rows_per_call"] = rows
+        results[name] = result
+        print(f"{name:<32}{result['median_us']:>12}{result['min_us']:>12}{result['stdev_us']:>12}"
+              f"{result['ops_per_sec']:>14}")
+
+    run = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump(run, f, indent=2)
+        print(f"Saved baseline to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare(run, baseline, args.threshold)
+        print(f"\nAgainst {args.compare} ({baseline['meta']['timestamp']}):")
+        print(f"{'benchmark':<32}{'before us':>12}{'after us':>12}{'change':>10}  verdict")
+        for name, before, after, change, verdict in rows:
+            print(f"{name:<32}{before:>12}{after:>12}{change:>+10.1%}  {verdict}")
+        if args.fail_on_regression and any(row[-1] == "regressed" for row in rows):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""EXPLAIN every hot query the routes issue and fail when one scans a table it should search.
+
+Usage:
+    python -m benchmarks.query_plans                                   # fresh SQLite file, "small" dataset
+    python -m benchmarks.query_plans --url postgresql://user:pw@localhost/flexfit_bench --skip-generate
+    python -m benchmarks.query_plans --show-plans
+
+SQLite plans come from EXPLAIN QUERY PLAN; a "SCAN <table>" line is a full scan.
+PostgreSQL plans come from EXPLAIN (FORMAT JSON) with enable_seqscan off, so a
+"Seq Scan" that remains means no usable index exists, whatever the table size.
+Exit status is 1 when any query has a violation; the report names the index to add.
+"""
+import argparse
+import itertools
+import json
+import os
+import re
+import sys
+import tempfile
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.engine import Connection, Engine
+
+from backend.models import Exercise, ExerciseTombstone, ProgressLog, SavedExercise, User, UserAchievement, UserStreak, \
+    WorkoutLog
+from backend.routes.coach import progress_overview_query
+
+# `expect` maps each table that must be reached through an index to the columns that index needs
+HotQuery = namedtuple("HotQuery", "name route statement expect")
+
+Violation = namedtuple("Violation", "query table detail suggestion")
+
+_explain_ids = itertools.count()
+
+
+def hot_queries(user_id: int = 1, exercise_id: int = 1, email: str = "user1@flexfit.test") -> list:
+    since = datetime(2000, 1, 1)
+    times_completed = func.count(WorkoutLog.id).label("times_completed")
+    return [
+        HotQuery("user_by_email", "POST /login/, POST /signup/",
+                 select(User).where(User.email == email), {"users": ("email",)}),
+        HotQuery("user_by_id", "get_user_data",
+                 select(User).where(User.id == user_id), {"users": ("id",)}),
+        HotQuery("exercise_by_id", "GET /exercise/{exercise_id}",
+                 select(Exercise).where(Exercise.id == exercise_id), {"exercises": ("id",)}),
+        HotQuery("catalog_changes", "GET /exercises/changes?since=",
+                 select(Exercise).where(Exercise.version > 1), {"exercises": ("version",)}),
+        HotQuery("tombstones_since", "GET /exercises/changes?since=",
+                 select(ExerciseTombstone.exercise_id).where(ExerciseTombstone.version > 1),
+                 {"exercise_tombstones": ("version",)}),
+        HotQuery("saved_by_user", "GET /saved_exercises/{user_id}",
+                 select(SavedExercise.exercise_id).where(SavedExercise.user_id == user_id),
+                 {"saved_exercises": ("user_id", "exercise_id")}),
+        HotQuery("saved_toggle_lookup", "POST /toggle_saved/{user_id}/{exercise_id}",
+                 select(SavedExercise).where(SavedExercise.user_id == user_id,
+                                             SavedExercise.exercise_id == exercise_id),
+                 {"saved_exercises": ("user_id", "exercise_id")}),
+        HotQuery("progress_by_user", "GET /progress/{user_id}",
+                 select(ProgressLog).where(ProgressLog.user_id == user_id).order_by(ProgressLog.date),
+                 {"progress_logs": ("user_id", "date")}),
+        HotQuery("coach_progress_overview", "POST /coach/progress",
+                 progress_overview_query([user_id, user_id + 1], since, 10),
+                 {"progress_logs": ("user_id", "date")}),
+        HotQuery("workouts_by_user", "GET /workout_logs/{user_id}",
+                 select(WorkoutLog).where(WorkoutLog.user_id == user_id).order_by(WorkoutLog.completed_at),
+                 {"workout_logs": ("user_id", "completed_at")}),
+        HotQuery("workout_summary", "GET /workout_logs/{user_id}/summary",
+                 select(WorkoutLog.exercise_id, Exercise.name, times_completed)
+                 .join(Exercise, Exercise.id == WorkoutLog.exercise_id)
+                 .where(WorkoutLog.user_id == user_id,
+                        WorkoutLog.completed_at >= datetime.utcnow() - timedelta(days=30))
+                 .group_by(WorkoutLog.exercise_id, Exercise.name)
+                 .order_by(times_completed.desc(), Exercise.name),
+                 {"workout_logs": ("user_id", "completed_at"), "exercises": ("id",)}),
+        HotQuery("streak_by_user", "GET /streak/{user_id}",
+                 select(UserStreak).where(UserStreak.user_id == user_id), {"user_streaks": ("user_id",)}),
+        HotQuery("achievements_by_user", "GET /achievements/{user_id}",
+                 select(UserAchievement.badge).where(UserAchievement.user_id == user_id),
+                 {"user_achievements": ("user_id",)}),
+    ]
+
+
+def _compile(engine: Engine, statement):
+    compiled = statement.compile(dialect=engine.dialect, compile_kwargs={"render_postcompile": True})
+    if compiled.positional:
+        return str(compiled), tuple(compiled.params[name] for name in compiled.positiontup)
+    return str(compiled), compiled.params
+
+
+def _sqlite_plan(conn: Connection, sql: str, params) -> list:
+    # sqlite3 caches prepared statements by SQL text, and a cached EXPLAIN keeps reporting the
+    # plan from before an index was added or dropped, so make every EXPLAIN's text unique
+    sql = f"EXPLAIN QUERY PLAN {sql} /* {next(_explain_ids)} */"
+    return [row[-1] for row in conn.exec_driver_sql(sql, params)]
+
+
+def _sqlite_scans(plan: list) -> list:
+    """(table, plan line) for every full scan; SEARCH lines are index lookups."""
+    scans = []
+    for line in plan:
+        match = re.match(r"SCAN (?:TABLE )?(\w+)", line)
+        if match:
+            scans.append((match.group(1), line))
+    return scans
+
+
+def _postgres_plan(conn: Connection, sql: str, params) -> list:
+    conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    (plan,) = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}", params).one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan
+
+
+def _postgres_scans(plan: list) -> list:
+    scans = []
+
+    def walk(node):
+        if node.get("Node Type") == "Seq Scan":
+            scans.append((node["Relation Name"], f"Seq Scan on {node['Relation Name']}"))
+        for child in node.get("Plans", ()):
+            walk(child)
+
+    for entry in plan:
+        walk(entry["Plan"])
+    return scans
+
+
+def explain(engine: Engine, query: HotQuery) -> list:
+    """The plan for one hot query: SQLite detail lines or the PostgreSQL JSON plan."""
+    sql, params = _compile(engine, query.statement)
+    with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            return _sqlite_plan(conn, sql, params)
+        if engine.dialect.name == "postgresql":
+            return _postgres_plan(conn, sql, params)
+    raise ValueError(f"EXPLAIN checks support SQLite and PostgreSQL, not {engine.dialect.name}")
+
+
+def _suggestion(table: str, columns: tuple) -> str:
+    return f"CREATE INDEX ix_{table}_{'_'.join(columns)} ON {table} ({', '.join(columns)})"
+
+
+def check(engine: Engine, queries: list = None) -> tuple:
+    """Returns ({query name: plan}, [Violation, ...]) for every hot query."""
+    queries = queries if queries is not None else hot_queries()
+    find_scans = _sqlite_scans if engine.dialect.name == "sqlite" else _postgres_scans
+    plans, violations = {}, []
+    for query in queries:
+        plan = plans[query.name] = explain(engine, query)
+        for table, detail in find_scans(plan):
+            if table in query.expect:
+                violations.append(Violation(query, table, detail, _suggestion(table, query.expect[table])))
+    return plans, violations
+
+
+def report(violations: list) -> str:
+    if not violations:
+        return "All hot queries use an index."
+    lines = [f"{len(violations)} hot query plan(s) scan a table that should be searched:"]
+    for v in violations:
+        lines.append(f"  {v.query.name} ({v.query.route}): {v.detail}")
+        lines.append(f"    missing index? {v.suggestion}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Database to check (default: fresh SQLite file)")
+    parser.add_argument("--preset", default="small", help="Dataset generated before checking")
+    parser.add_argument("--skip-generate", action="store_true", help="--url already holds a dataset")
+    parser.add_argument("--show-plans", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url or f"sqlite:///{os.path.join(tmp, 'query_plans.db')}"
+        if not args.skip_generate:
+            from benchmarks.generate_dataset import PRESETS, generate
+            generate(url, PRESETS[args.preset], verbose=False)
+        engine = create_engine(url)
+        with engine.begin() as conn:
+            conn.exec_driver_sql("ANALYZE")  # plans should reflect the data, not empty statistics
+        plans, violations = check(engine)
+        engine.dispose()
+
+    if args.show_plans:
+        for name, plan in plans.items():
+            lines = plan if isinstance(plan[0], str) else json.dumps(plan, indent=2).splitlines()
+            print(f"{name}:")
+            for line in lines:
+                print(f"  {line}")
+    print(report(violations))
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""Write latency of the RETURNING write paths against the commit-and-refresh code they replaced.
+
+Usage:
+    python -m benchmarks.write_paths                          # SQLite file, 1 ms simulated round trip
+    python -m benchmarks.write_paths --writes 1000 --rtt-ms 0
+    python -m benchmarks.write_paths --url postgresql://user:pw@localhost/flexfit_bench --rtt-ms 0
+
+Every statement and every COMMIT is a round trip to the database. A local SQLite file
+makes those nearly free, so --rtt-ms sleeps that long per round trip to model a
+server across the network; against a real remote database pass --rtt-ms 0.
+
+"legacy" is the shape of each route before: add/commit/refresh, or load/modify/
+commit/refresh. "returning" calls the helpers the routes use now. Statements that
+both versions share (signup's duplicate-email check, the streak and achievement
+updates in log_progress) are left out, so the difference is the write itself.
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, event, select, update
+from sqlalchemy.orm import sessionmaker
+
+from backend.catalog import insert_exercise, update_exercise
+from backend.database import Base, exercise_to_dict, insert_returning, update_returning
+from backend.models import CatalogState, Exercise, ExerciseTombstone, ProgressLog, User
+
+
+def _exercise_values(i: int) -> dict:
+    return {"name": f"Bench exercise {i}-{time.monotonic_ns()}", "description": "Synthetic", "toughness": "Medium",
+            "media_url": "https://example.com/image.png", "tags": '["indoor"]', "suggested_reps": 12}
+
+
+def _user_values(i: int) -> dict:
+    return {"username": f"bench{i}-{time.monotonic_ns()}", "full_name": "Bench User",
+            "email": f"bench{i}-{time.monotonic_ns()}@flexfit.test", "password_hash": "x", "dob": "1990-01-01",
+            "gender": "N/A", "height": 175, "weight": 70, "role": "user"}
+
+
+def _legacy_bump_version(db) -> int:
+    db.execute(update(CatalogState).where(CatalogState.id == 1).values(version=CatalogState.version + 1))
+    return db.scalar(select(CatalogState.version).where(CatalogState.id == 1))
+
+
+# --- add_exercise ---------------------------------------------------------------------
+
+def legacy_add_exercise(db, i):
+    exercise = Exercise(**_exercise_values(i))
+    db.add(exercise)
+    exercise.version = _legacy_bump_version(db)
+    db.flush([exercise])
+    db.query(ExerciseTombstone).filter(ExerciseTombstone.exercise_id == exercise.id).delete()
+    db.commit()
+    db.refresh(exercise)
+    return exercise_to_dict(exercise)
+
+
+def returning_add_exercise(db, i):
+    row = insert_exercise(db, _exercise_values(i))
+    db.commit()
+    return exercise_to_dict(row)
+
+
+# --- edit_exercise --------------------------------------------------------------------
+
+def legacy_edit_exercise(db, i):
+    exercise = db.query(Exercise).filter(Exercise.id == 1).first()
+    exercise.suggested_reps = i % 20
+    exercise.version = _legacy_bump_version(db)
+    db.query(ExerciseTombstone).filter(ExerciseTombstone.exercise_id == exercise.id).delete()
+    db.commit()
+    db.refresh(exercise)
+    return exercise_to_dict(exercise)
+
+
+def returning_edit_exercise(db, i):
+    row = update_exercise(db, 1, {"suggested_reps": i % 20})
+    db.commit()
+    return exercise_to_dict(row)
+
+
+# --- signup ---------------------------------------------------------------------------
+
+def legacy_signup(db, i):
+    user = User(**_user_values(i))
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user.id
+
+
+def returning_signup(db, i):
+    row = insert_returning(db, User, _user_values(i), User.id)
+    db.commit()
+    return row.id
+
+
+# --- update_user_info -----------------------------------------------------------------
+
+def legacy_update_user_info(db, i):
+    user = db.query(User).filter_by(id=1).first()
+    user.weight = 60 + i % 30
+    db.commit()
+    db.refresh(user)
+
+
+def returning_update_user_info(db, i):
+    update_returning(db, User, 1, {"weight": 60 + i % 30}, User.id)
+    db.commit()
+
+
+# --- log_progress ---------------------------------------------------------------------
+
+def legacy_log_progress(db, i):
+    entry = ProgressLog(user_id=1, height=175.0, weight=70.0)
+    db.add(entry)
+    db.commit()
+    db.refresh(entry)
+
+
+def returning_log_progress(db, i):
+    insert_returning(db, ProgressLog, {"user_id": 1, "height": 175.0, "weight": 70.0}, ProgressLog.id)
+    db.commit()
+
+
+PATHS = {
+    "add_exercise": (legacy_add_exercise, returning_add_exercise),
+    "edit_exercise": (legacy_edit_exercise, returning_edit_exercise),
+    "signup": (legacy_signup, returning_signup),
+    "update_user_info": (legacy_update_user_info, returning_update_user_info),
+    "log_progress": (legacy_log_progress, returning_log_progress),
+}
+
+
+class RoundTrips:
+    """Counts statements and commits on an engine, sleeping rtt seconds for each."""
+
+    def __init__(self, engine, rtt: float):
+        self.rtt = rtt
+        self.count = 0
+        event.listen(engine, "before_cursor_execute", self._trip)
+        event.listen(engine, "commit", self._trip)
+
+    def _trip(self, *args, **kwargs):
+        self.count += 1
+        if self.rtt:
+            time.sleep(self.rtt)
+
+
+def seed(engine):
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    with Session() as db:
+        if db.get(User, 1) is None:
+            db.add(User(id=1, **_user_values(0)))
+        if db.get(Exercise, 1) is None:
+            db.add(Exercise(id=1, version=0, **_exercise_values(0)))
+        if db.get(CatalogState, 1) is None:
+            db.add(CatalogState(id=1, version=0))
+        db.commit()
+    return Session
+
+
+def run(Session, trips: RoundTrips, write, writes: int) -> dict:
+    latencies = []
+    start_count = trips.count
+    for i in range(writes):
+        with Session() as db:  # one session per write, as per request
+            started = time.perf_counter()
+            write(db, i)
+            latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return {
+        "round_trips": (trips.count - start_count) / writes,
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Database URL (default: a fresh SQLite file)")
+    parser.add_argument("--writes", type=int, default=200, help="Writes per path and mode")
+    parser.add_argument("--rtt-ms", type=float, default=1.0, help="Simulated latency per round trip")
+    parser.add_argument("-k", dest="keyword", help="Only run paths whose name contains this")
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'write_paths.db')}"
+    engine = create_engine(url)
+    Session = seed(engine)
+    trips = RoundTrips(engine, args.rtt_ms / 1000)
+    dialect = engine.dialect
+    print(f"{engine.url.render_as_string(hide_password=True)}: insert RETURNING {dialect.insert_returning}, "
+          f"update RETURNING {dialect.update_returning}, simulated rtt {args.rtt_ms} ms\n")
+
+    print(f"{'path':<20}{'mode':<12}{'trips/write':>12}{'p50 ms':>10}{'p95 ms':>10}{'p50 change':>12}")
+    for name, (legacy, returning) in PATHS.items():
+        if args.keyword and args.keyword not in name:
+            continue
+        before = run(Session, trips, legacy, args.writes)
+        after = run(Session, trips, returning, args.writes)
+        change = (after["p50_ms"] - before["p50_ms"]) / before["p50_ms"] if before["p50_ms"] else 0.0
+        for mode, result, note in (("legacy", before, ""), ("returning", after, f"{change:+.1%}")):
+            print(f"{name:<20}{mode:<12}{result['round_trips']:>12.1f}{result['p50_ms']:>10}"
+                  f"{result['p95_ms']:>10}{note:>12}")
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,52 @@
 import requests
 
+try:
+    import msgpack  # ✅ Optional: smaller payloads and faster parsing on phones
+except ImportError:
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+
 class ExerciseAPI:
     BASE_URL = "http://127.0.0.1:8000/exercises/"
+    API_URL = "http://127.0.0.1:8000"
 
     @classmethod
-    def fetch_exercises(cls):
+    def headers(cls):
+        """Ask for MessagePack when the decoder is installed; the server falls back to JSON otherwise."""
+        if msgpack is None:
+            return {}
+        return {"Accept": f"{MSGPACK_MEDIA_TYPE}, application/json;q=0.9"}
+
+    @staticmethod
+    def decode(response):
+        """Decodes a MessagePack or JSON body into the same Python structures."""
+        if msgpack is not None and response.headers.get("Content-Type", "").startswith(MSGPACK_MEDIA_TYPE):
+            return msgpack.unpackb(response.content)
+        return response.json()
+
+    @classmethod
+    def get(cls, url, default):
         try:
-            response = requests.get(cls.BASE_URL)
+            response = requests.get(url, headers=cls.headers())
             if response.status_code == 200:
-                return response.json()
+                return cls.decode(response)
             else:
                 print(f"❌ ERROR: {response.status_code}")
-                return []
+                return default
         except Exception as e:
             print(f"🚨 API Request Failed: {e}")
-            return []
+            return default
+
+    @classmethod
+    def fetch_exercises(cls):
+        return cls.get(cls.BASE_URL, [])
+
+    @classmethod
+    def fetch_saved_exercises(cls, user_id):
+        return cls.get(f"{cls.API_URL}/saved_exercises/{user_id}", [])
+
+    @classmethod
+    def fetch_progress(cls, user_id):
+        return cls.get(f"{cls.API_URL}/progress/{user_id}", [])
@@ -1,6 +1,5 @@
 import json
 import os
-from collections import Counter
 from datetime import datetime
 
 import requests
@@ -1176,28 +1175,19 @@ class ProgressScreen(Screen):
         user_id = app.user_info.get("id")
 
         try:
-            # Fetch workout logs
-            response = requests.get(f"http://127.0.0.1:8000/workout_logs/{user_id}")
+            # Fetch per-exercise completion counts, aggregated server-side
+            response = requests.get(f"http://127.0.0.1:8000/workout_logs/{user_id}/summary")
             if response.status_code != 200:
-                print(f"❌ Failed to fetch workout logs: {response.text}")
+                print(f"❌ Failed to fetch workout summary: {response.text}")
                 return
 
-            logs = response.json()
-            if not logs:
+            summary = response.json()
+            if not summary:
                 print("⚠️ No workout logs found.")
                 return
 
-            # Count each exercise_id
-            counter = Counter([entry["exercise_id"] for entry in logs])
-
-            # Map exercise_id to name
-            exercise_map = {
-                ex["id"]: ex["name"]
-                for ex in ExerciseAPI.fetch_exercises()
-            }
-
-            names = [exercise_map.get(ex_id, f"Exercise {ex_id}") for ex_id in counter.keys()]
-            counts = list(counter.values())
+            names = [row["name"] for row in summary]
+            counts = [row["times_completed"] for row in summary]
 
             # Create bar chart
             plt.figure(figsize=(12, 6))
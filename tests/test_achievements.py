@@ -0,0 +1,116 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.database import Base
+from backend.models import User, Exercise, WorkoutLog, UserCounters
+from backend.achievements import (CATEGORIES, on_workout_logged, on_progress_logged, on_saved_toggled,
+                                  get_achievements, backfill_achievements)
+from backend.streaks import record_activity
+
+TEST_DATABASE_URL = "sqlite:///:memory:"
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    session.add(User(id=1, username="achiever", email="achiever@example.com", password_hash="x"))
+    for i, tag in enumerate(CATEGORIES, start=1):
+        session.add(Exercise(id=i, name=f"Exercise {i}", description="Desc", toughness="Easy",
+                             tags=json.dumps([tag.title()]), suggested_reps=10))
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+#  UT-13-CB: Workout counter badges are awarded once, when the threshold is crossed
+def test_workout_badges_awarded_once(db_session):
+    """Test ID: UT-13-CB - '10 Workouts' is awarded on the tenth workout and never duplicated."""
+    exercise = db_session.get(Exercise, 1)
+    for i in range(12):
+        new_badges = on_workout_logged(db_session, 1, exercise)
+        if i == 9:
+            assert "10 Workouts" in new_badges
+    db_session.commit()
+
+    badges = get_achievements(db_session, 1)
+    assert badges.count("10 Workouts") == 1
+    assert "First Workout" in badges
+    assert "Tried Every Category" not in badges
+
+
+#  UT-14-CB: Trying each category awards the category badge
+def test_tried_every_category(db_session):
+    """Test ID: UT-14-CB - Logging one workout per category awards 'Tried Every Category'."""
+    for exercise_id in range(1, len(CATEGORIES) + 1):
+        on_workout_logged(db_session, 1, db_session.get(Exercise, exercise_id))
+    db_session.commit()
+
+    assert "Tried Every Category" in get_achievements(db_session, 1)
+
+
+#  UT-15-CB: Streak and saved rules react to their own events
+def test_streak_and_saved_rules(db_session):
+    """Test ID: UT-15-CB - Progress events award streak badges, saved events award 'Collector'."""
+    start = datetime(2025, 5, 1)
+    for day in range(7):
+        record_activity(db_session, 1, start + timedelta(days=day))
+        on_progress_logged(db_session, 1)
+    for _ in range(10):
+        on_saved_toggled(db_session, 1, saved=True)
+    db_session.commit()
+
+    badges = get_achievements(db_session, 1)
+    assert {"First Check-In", "7-Day Streak", "Collector"} <= set(badges)
+    assert "30-Day Streak" not in badges
+
+
+#  IT-10: Backfill seeds counters from history and awards matching badges
+def test_backfill_achievements(db_session):
+    """Test ID: IT-10 - Backfill counts existing workout logs and awards badges."""
+    for _ in range(10):
+        db_session.add(WorkoutLog(user_id=1, exercise_id=2))
+    db_session.commit()
+
+    assert backfill_achievements(db_session) == 1
+    assert db_session.get(UserCounters, 1).workouts_completed == 10
+    assert "10 Workouts" in get_achievements(db_session, 1)
+
+
+#  UT-15-AT: Counter updates from two sessions add up instead of overwriting each other
+def test_counters_from_two_sessions(tmp_path):
+    """Test ID: UT-15-AT - Sessions holding a stale counters row still add their increments, both first-use inserts succeed."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'counters.db'}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with Session() as setup:
+        setup.add(User(id=1, username="achiever", email="achiever@example.com", password_hash="x"))
+        setup.commit()
+
+    first, second = Session(), Session()
+    try:
+        on_progress_logged(first, 1)
+        first.commit()
+        on_progress_logged(second, 1)  # creates the row too, as far as this session knew
+        second.commit()
+        stale = first.get(UserCounters, 1)
+        assert (stale.progress_logged, stale.saved_count) == (2, 0)  # held in the identity map; stale after the next commit
+
+        on_saved_toggled(second, 1, saved=True)
+        second.commit()
+        on_progress_logged(first, 1)
+        on_saved_toggled(first, 1, saved=True)
+        first.commit()
+        counters = second.get(UserCounters, 1, populate_existing=True)
+        assert (counters.progress_logged, counters.saved_count) == (3, 2)
+    finally:
+        first.close()
+        second.close()
+        engine.dispose()
@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from backend import async_database
+from backend.async_database import build_async_engine
+from backend.catalog import all_exercises_async, catalog_cache, exercise_details
+from backend.database import Base
+from backend.leaderboard import leaderboards
+from backend.models import Exercise, SavedExercise, User
+from backend.routes import async_api
+from backend.security import hash_password
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """The ASYNC_DB=1 route set on aiosqlite, against a SQLite file seeded through the sync engine."""
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(bind=sync_engine)
+    with sessionmaker(bind=sync_engine)() as seed:
+        seed.add(User(id=1, username="async", full_name="Async User", email="async@example.com",
+                      password_hash=hash_password("secret"), height=180, weight=80, role="user"))
+        seed.add(Exercise(id=1, name="Plank", description="Core", toughness="Easy", tags='["indoor"]',
+                          suggested_reps=1))
+        seed.add(SavedExercise(user_id=1, exercise_id=1))
+        seed.commit()
+    sync_engine.dispose()
+
+    monkeypatch.setenv("ASYNC_DB", "1")
+    engine = build_async_engine(url)
+    monkeypatch.setattr(async_database, "async_engine", engine)
+    monkeypatch.setattr(async_database, "AsyncSessionLocal",
+                        async_sessionmaker(engine, expire_on_commit=False, autoflush=False))
+    catalog_cache.invalidate()
+    exercise_details.invalidate()
+
+    app = FastAPI()
+    app.include_router(async_api.router)
+    with TestClient(app) as test_client:
+        yield test_client
+    asyncio.run(engine.dispose())
+    for board in leaderboards.boards.values():
+        board.clear()
+
+
+#  IT-22-AS: The async hot routes answer like their sync counterparts
+def test_async_routes(client):
+    """Test ID: IT-22-AS - login, catalog, detail, saved and progress routes on aiosqlite."""
+    login = client.post("/login/", json={"email": "async@example.com", "password": "secret"})
+    assert login.status_code == 200
+    assert login.json()["user"]["username"] == "async"
+    assert client.post("/login/", json={"email": "async@example.com", "password": "wrong"}).status_code == 400
+    assert client.post("/login/", json={"email": "nobody@example.com", "password": "x"}).status_code == 404
+
+    assert [exercise["name"] for exercise in client.get("/exercises/").json()] == ["Plank"]
+    assert client.get("/exercises/", params={"search_query": "pla"}).json()[0]["id"] == 1
+    assert client.get("/exercises/", params={"search_query": "squat"}).json() == {"error": "No exercises found"}
+    assert client.get("/exercise/1").json()["name"] == "Plank"
+    assert client.get("/exercise/99").status_code == 404
+    assert client.get("/saved_exercises/1").json() == [1]
+
+    assert client.post("/progress/1", params={"height": 180, "weight": 79.5}).status_code == 200
+    progress = client.get("/progress/1").json()
+    assert [(entry["height"], entry["weight"]) for entry in progress] == [(180, 79.5)]
+    assert leaderboards.board("streak", "all_time").score(1) == 1
+
+
+#  IT-22-AC: A failed commit leaves the in-memory leaderboard untouched
+def test_async_progress_failed_commit(client, monkeypatch):
+    """Test ID: IT-22-AC - The streak board is only updated after the progress row commits."""
+    leaderboards.board("streak", "all_time").set_score(1, 0)
+
+    async def failing_commit(self):
+        raise RuntimeError("commit failed")
+
+    real_commit = AsyncSession.commit
+    monkeypatch.setattr(AsyncSession, "commit", failing_commit)
+    with pytest.raises(RuntimeError):
+        client.post("/progress/1", params={"height": 180, "weight": 79.0})
+    assert leaderboards.board("streak", "all_time").score(1) == 0
+
+    monkeypatch.setattr(AsyncSession, "commit", real_commit)
+    assert client.get("/progress/1").json() == []
+
+
+#  IT-22-LC: A coalesced load outlives the request that started it
+def test_leader_cancelled_during_shared_load(tmp_path):
+    """Test ID: IT-22-LC - The leader disconnects and its session closes; the waiting follower still gets the catalog."""
+    url = f"sqlite:///{tmp_path / 'leader.db'}"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(bind=sync_engine)
+    with sessionmaker(bind=sync_engine)() as seed:
+        seed.add(Exercise(id=1, name="Plank", description="Core", toughness="Easy", tags='["indoor"]',
+                          suggested_reps=1))
+        seed.commit()
+    sync_engine.dispose()
+    catalog_cache.invalidate()
+
+    async def scenario():
+        engine = build_async_engine(url)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        try:
+            leader_db, follower_db = sessions(), sessions()
+            leader = asyncio.ensure_future(all_exercises_async(leader_db))
+            await asyncio.sleep(0)  # the leader has started the shared load
+            follower = asyncio.ensure_future(all_exercises_async(follower_db))
+            await asyncio.sleep(0)
+            leader.cancel()
+            await leader_db.close()  # what get_async_db() does when the client goes away
+            assert [exercise["name"] for exercise in await asyncio.wait_for(follower, 5)] == ["Plank"]
+            assert leader.cancelled()
+            await follower_db.close()
+        finally:
+            await engine.dispose()
+            catalog_cache.invalidate()
+
+    asyncio.run(scenario())
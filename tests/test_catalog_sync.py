@@ -0,0 +1,115 @@
+import json
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.catalog import (bump_version, changes_since, exercise_detail_body, exercise_details, insert_exercise,
+                             record_delete, update_exercise)
+from backend.database import Base, ensure_catalog_state, exercise_to_dict, mark_catalog_write
+from backend.models import CatalogState, Exercise
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    ensure_catalog_state(engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    yield session
+    session.close()
+
+
+def _add(db, name):
+    row = insert_exercise(db, {"name": name, "description": "d", "toughness": "Easy", "tags": "[]",
+                               "suggested_reps": 10})
+    db.commit()
+    return row
+
+
+#  IT-17-CS: A warm client receives only the edits and deletions after its version
+def test_delta_sync_returns_upserts_and_tombstones(db):
+    """Test ID: IT-17-CS - changes_since returns changed rows and deleted ids, full catalog for since=0."""
+    squat = _add(db, "Squat")
+    plank = _add(db, "Plank")
+    synced = changes_since(db, 0)
+    assert synced["full"] and synced["version"] == 2
+    assert {row["name"] for row in synced["upserts"]} == {"Squat", "Plank"}
+
+    update_exercise(db, squat.id, {"suggested_reps": 15})
+    db.delete(db.get(Exercise, plank.id))
+    record_delete(db, plank.id)
+    db.commit()
+    plank_id = plank.id
+
+    delta = changes_since(db, synced["version"])
+    assert not delta["full"] and delta["version"] == 4
+    assert [row["name"] for row in delta["upserts"]] == ["Squat"]
+    assert delta["deleted"] == [plank_id]
+    assert changes_since(db, delta["version"])["upserts"] == []
+
+    # SQLite reuses the deleted id; the new row replaces the tombstone
+    lunge = _add(db, "Lunge")
+    assert lunge.id == plank_id
+    after = changes_since(db, delta["version"])
+    assert [row["name"] for row in after["upserts"]] == ["Lunge"] and after["deleted"] == []
+
+
+#  IT-19-ED: Exercise detail is served from cache until the bus invalidates that exercise
+def test_exercise_detail_cache_invalidation(db):
+    """Test ID: IT-19-ED - Repeat reads hit the LRU; mark_catalog_write(id) drops the entry and the 404 marker."""
+    squat = _add(db, "Squat")
+    hits = exercise_details.cache.hits
+
+    body = exercise_detail_body(db, squat.id)
+    assert json.loads(body)["name"] == "Squat"
+    assert exercise_detail_body(db, squat.id) is body
+    assert exercise_details.cache.hits == hits + 1
+    assert exercise_detail_body(db, 999) is None
+
+    db.get(Exercise, squat.id).name = "Back squat"  # a write that bypasses the routes
+    db.commit()
+    assert json.loads(exercise_detail_body(db, squat.id))["name"] == "Squat"  # stale until invalidated
+    mark_catalog_write(squat.id)
+    assert json.loads(exercise_detail_body(db, squat.id))["name"] == "Back squat"
+
+    db.add(Exercise(id=999, name="Lunge", tags="[]"))
+    db.commit()
+    mark_catalog_write(999)
+    assert json.loads(exercise_detail_body(db, 999))["name"] == "Lunge"
+
+
+#  IT-20-RW: Exercise writes return the row from the statement, with or without RETURNING support
+@pytest.mark.parametrize("returning", [True, False])
+def test_single_round_trip_writes(db, returning):
+    """Test ID: IT-20-RW - insert_exercise/update_exercise give the written row; the fallback matches."""
+    dialect = db.get_bind().dialect
+    dialect.insert_returning = dialect.update_returning = returning
+
+    row = insert_exercise(db, {"name": "Row", "description": "d", "toughness": "Easy", "tags": '["core"]',
+                               "suggested_reps": 8})
+    db.commit()
+    assert row.id and row.version == 1
+    assert exercise_to_dict(row)["tags"] == ["core"]
+
+    updated = update_exercise(db, row.id, {"suggested_reps": 12})
+    db.commit()
+    assert (updated.suggested_reps, updated.version, updated.name) == (12, 2, "Row")
+    assert update_exercise(db, 999, {"suggested_reps": 1}) is None
+    assert db.get(Exercise, row.id).suggested_reps == 12
+
+
+#  IT-20-CV: The catalog version row exists before the first write, seeded or not
+def test_catalog_state_seeded_and_fallback(db):
+    """Test ID: IT-20-CV - ensure_catalog_state() is idempotent; bump_version() recreates a missing row."""
+    ensure_catalog_state(db.get_bind())
+    assert db.get(CatalogState, 1).version == 0
+    assert bump_version(db) == 1
+    db.commit()
+
+    db.query(CatalogState).delete()
+    db.commit()
+    assert bump_version(db) == 1
+    assert bump_version(db) == 2
+    db.commit()
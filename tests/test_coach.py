@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.database import Base
+from backend.models import ProgressLog, User
+from backend.routes.coach import get_progress_overview
+from backend.schemas import CoachProgressRequest
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    for user_id in (1, 2, 3):
+        session.add(User(id=user_id, username=f"client{user_id}", email=f"client{user_id}@example.com"))
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _log(session, user_id, days_ago, weight, height=180.0):
+    session.add(ProgressLog(user_id=user_id, date=datetime.utcnow() - timedelta(days=days_ago),
+                            height=height, weight=weight))
+
+
+#  UT-30-CO: The series keeps the first, the latest and every step-th entry, at most `points` per user
+def test_downsampled_series_and_delta(db_session):
+    """Test ID: UT-30-CO - 10 in-window entries with points=4 (step 4) keep rows 1, 5, 9 and 10; delta is latest minus first."""
+    _log(db_session, 1, 60, 95.0)  # outside the 30-day window: not in the series or the delta
+    for i in range(10):
+        _log(db_session, 1, 20 - i, 90.0 - i * 0.5, height=180.0 + i * 0.1)
+    db_session.commit()
+
+    overview = get_progress_overview(CoachProgressRequest(user_ids=[1], window_days=30, points=4), db_session)
+    assert overview["entries"] == [10]
+    assert overview["series"]["weight"] == [90.0, 88.0, 86.0, 85.5]
+    assert overview["series"]["user_id"] == [1, 1, 1, 1]
+    assert overview["latest_weight"] == [85.5]
+    assert overview["weight_delta"] == [-4.5]
+    assert overview["height_delta"] == [0.9]
+
+    overview = get_progress_overview(CoachProgressRequest(user_ids=[1], window_days=30, points=20), db_session)
+    assert len(overview["series"]["weight"]) == 10
+
+
+#  UT-30-CQ: Clients without recent or any entries are still reported, with their real latest values
+def test_quiet_and_empty_users(db_session):
+    """Test ID: UT-30-CQ - An old-only client gets their latest values but no delta; a client with no rows gets nulls."""
+    _log(db_session, 2, 90, 70.0)
+    _log(db_session, 2, 45, 68.0, height=181.0)
+    _log(db_session, 1, 1, 80.0)
+    db_session.commit()
+
+    overview = get_progress_overview(CoachProgressRequest(user_ids=[3, 2, 1, 2], window_days=30), db_session)
+    assert overview["user_ids"] == [1, 2, 3]
+    assert overview["entries"] == [1, 0, 0]
+    assert overview["latest_weight"] == [80.0, 68.0, None]
+    assert overview["latest_height"] == [180.0, 181.0, None]
+    assert overview["latest_date"][1] is not None and overview["latest_date"][2] is None
+    assert overview["weight_delta"] == [0.0, None, None]
+    assert overview["series"]["user_id"] == [1]
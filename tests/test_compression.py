@@ -0,0 +1,59 @@
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from backend.compression import CompressionMiddleware, compressed_bodies
+
+CATALOG = [{"id": i, "name": f"Exercise {i}", "tags": ["indoor", "strength"]} for i in range(200)]
+
+
+def _client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/exercises/")
+    def catalog():
+        return CATALOG
+
+    @app.get("/progress/{user_id}")
+    def progress(user_id: int):
+        return [{"weight": 70}]
+
+    @app.get("/session")
+    def session(response: Response):
+        response.set_cookie("session", "abc")
+        response.set_cookie("theme", "dark")
+        return CATALOG
+
+    return TestClient(app)
+
+
+#  UT-24-CP: Large JSON is gzipped once and served from the compressed-body cache after that
+def test_gzip_with_cached_catalog():
+    """Test ID: UT-24-CP - Catalog compressed above the threshold, cached by digest; small bodies untouched."""
+    client = _client()
+    compressed_bodies.clear()
+    hits = compressed_bodies.hits
+
+    first = client.get("/exercises/", headers={"Accept-Encoding": "gzip"})
+    second = client.get("/exercises/", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in first.headers["vary"]
+    assert first.json() == CATALOG == second.json()
+    assert int(first.headers["content-length"]) < len(first.content)  # httpx hands back the decoded body
+    assert compressed_bodies.hits == hits + 1
+
+    small = client.get("/progress/1", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+    plain = client.get("/exercises/", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+
+
+#  UT-24-CH: Repeated headers survive compression
+def test_compression_keeps_repeated_headers():
+    """Test ID: UT-24-CH - Both Set-Cookie headers reach the client on compressed and uncompressed responses."""
+    client = _client()
+    for encoding in ("gzip", "identity"):
+        response = client.get("/session", headers={"Accept-Encoding": encoding})
+        assert response.headers.get_list("set-cookie") == ["session=abc; Path=/; SameSite=lax",
+                                                           "theme=dark; Path=/; SameSite=lax"]
+        assert response.json() == CATALOG
@@ -0,0 +1,87 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.database import Base, TimedQueuePool, build_engine, engine_profile
+from backend.models import Exercise, SavedExercise, User
+
+
+#  UT-29-EP: Each database URL maps to its backend's profile
+@pytest.mark.parametrize("url, profile", [
+    ("sqlite:///./flexfit.db", "sqlite_file"),
+    ("sqlite://", "sqlite_memory"),
+    ("sqlite:///:memory:", "sqlite_memory"),
+    ("sqlite:///file:shared?mode=memory&cache=shared&uri=true", "sqlite_memory"),
+    ("postgresql://user:pw@db/flexfit", "postgres"),
+    ("postgresql+psycopg2://user:pw@db/flexfit", "postgres"),
+    ("mysql+pymysql://user:pw@db/flexfit", "mysql"),
+])
+def test_engine_profile_selection(url, profile):
+    """Test ID: UT-29-EP - engine_profile() picks the profile from the URL's backend."""
+    assert engine_profile(url) == profile
+
+
+def test_engine_profile_unknown_backend():
+    """Test ID: UT-29-EP - A backend without a profile is a configuration error, not a silent default."""
+    with pytest.raises(ValueError):
+        engine_profile("oracle://user:pw@db/flexfit")
+
+
+#  UT-29-PR: SQLite file engines get the tuned pragmas and pool; env and keyword overrides apply in order
+def test_build_engine_sqlite_file(tmp_path, monkeypatch):
+    """Test ID: UT-29-PR - WAL/NORMAL/busy_timeout on every connection, foreign_keys left at SQLite's default."""
+    monkeypatch.setenv("DB_POOL_SIZE", "3")
+    engine = build_engine(f"sqlite:///{tmp_path / 'profile.db'}")
+    try:
+        assert isinstance(engine.pool, TimedQueuePool)
+        assert engine.pool.size() == 3
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+            assert conn.execute(text("PRAGMA temp_store")).scalar() == 2  # MEMORY
+            assert conn.execute(text("PRAGMA foreign_keys")).scalar() == 0
+    finally:
+        engine.dispose()
+
+    engine = build_engine(f"sqlite:///{tmp_path / 'override.db'}", pool_size=7, pragmas={"busy_timeout": 100})
+    try:
+        assert engine.pool.size() == 7
+        with engine.connect() as conn:
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 100
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() != "wal"
+    finally:
+        engine.dispose()
+
+
+def test_build_engine_memory_and_forced_profile(monkeypatch):
+    """Test ID: UT-29-PR - In-memory URLs share one connection; DB_PROFILE overrides the URL."""
+    engine = build_engine("sqlite://")
+    assert isinstance(engine.pool, StaticPool)
+    engine.dispose()
+
+    monkeypatch.setenv("DB_PROFILE", "sqlite_memory")
+    engine = build_engine("sqlite:///ignored-for-profile.db")
+    assert isinstance(engine.pool, StaticPool)
+    engine.dispose()
+
+
+#  IT-21-EP: The tuned SQLite file engine keeps the app's delete behaviour
+def test_delete_saved_exercise_on_file_engine(tmp_path):
+    """Test ID: IT-21-EP - Deleting an exercise a user has saved succeeds on the sqlite_file profile."""
+    engine = build_engine(f"sqlite:///{tmp_path / 'delete.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autoflush=False, bind=engine)()
+    try:
+        session.add(User(id=1, username="saver", email="saver@example.com", password_hash="x"))
+        session.add(Exercise(id=1, name="Dips", description="Arms", toughness="Medium", suggested_reps=10))
+        session.add(SavedExercise(user_id=1, exercise_id=1))
+        session.commit()
+
+        session.delete(session.get(Exercise, 1))
+        session.commit()
+        assert session.get(Exercise, 1) is None
+    finally:
+        session.close()
+        engine.dispose()
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import ClientDisconnect
+
+from backend import events
+from backend.events import Broadcaster, CATALOG_TOPIC, user_topic
+from backend.routes.events import stream_events
+
+
+#  UT-25-EV: Events published from a worker thread reach matching subscribers; full buffers drop the oldest
+def test_broadcast_from_thread_with_bounded_buffers():
+    """Test ID: UT-25-EV - Topic filtering, cross-thread delivery, drop-oldest with a resync marker."""
+    async def scenario():
+        broadcaster = Broadcaster(buffer_size=2)
+        everyone = broadcaster.subscribe([CATALOG_TOPIC])
+        alice = broadcaster.subscribe([CATALOG_TOPIC, user_topic(1)])
+
+        def publish():
+            for version in (1, 2, 3):
+                broadcaster.publish(CATALOG_TOPIC, "exercise_upserted", {"version": version}, version)
+            broadcaster.publish(user_topic(1), "saved_changed", {"exercise_id": 7, "saved": True})
+
+        thread = threading.Thread(target=publish)
+        thread.start()
+        thread.join()
+        await asyncio.sleep(0)
+
+        catalog_only = [everyone.queue.get_nowait() for _ in range(everyone.queue.qsize())]
+        assert [m.split("\n")[0] for m in catalog_only] == ["id: 2", "id: 3"]
+        assert everyone.dropped == 1 and everyone.lost
+
+        with_user = [alice.queue.get_nowait() for _ in range(alice.queue.qsize())]
+        assert with_user[-1].startswith("event: saved_changed")
+        assert broadcaster.subscriber_count() == 2
+        broadcaster.unsubscribe(everyone)
+        broadcaster.unsubscribe(alice)
+        assert broadcaster.subscriber_count() == 0
+        assert broadcaster.publish(CATALOG_TOPIC, "exercise_deleted", {"version": 4}) == 0
+
+    asyncio.run(scenario())
+
+
+#  UT-25-ES: The SSE body announces lost events before the next message and unsubscribes on close
+def test_event_stream_resync_and_cleanup():
+    """Test ID: UT-25-ES - A subscriber that overflowed gets `event: resync`; closing the stream unsubscribes."""
+    async def scenario():
+        stream = events.event_stream(events.broadcaster.subscribe([CATALOG_TOPIC]), heartbeat=0.01)
+        assert await stream.__anext__() == "retry: 5000\n\n"
+        assert await stream.__anext__() == ": keep-alive\n\n"
+        assert events.broadcaster.subscriber_count() == 1
+
+        for version in range(events.broadcaster.buffer_size + 1):
+            events.exercise_deleted(version, version)
+        await asyncio.sleep(0)
+        assert (await stream.__anext__()).startswith("event: resync")
+        assert (await stream.__anext__()).startswith("id: 1\nevent: exercise_deleted")
+
+        await stream.aclose()
+        assert events.broadcaster.subscriber_count() == 0
+
+    asyncio.run(scenario())
+
+
+#  UT-25-ER: The route reserves the slot up front: 503 when full, released even if the body never starts
+def test_stream_route_reserves_and_releases():
+    """Test ID: UT-25-ER - A full broadcaster answers 503; a client gone before the first chunk frees its slot."""
+    async def scenario():
+        response = await stream_events(user_id=3)
+        assert events.broadcaster.subscriber_count() == 1
+
+        limit, events.broadcaster.max_subscribers = events.broadcaster.max_subscribers, 1
+        try:
+            with pytest.raises(HTTPException) as full:
+                await stream_events(user_id=None)
+            assert full.value.status_code == 503
+        finally:
+            events.broadcaster.max_subscribers = limit
+
+        async def receive():
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            raise OSError("client went away")
+
+        with pytest.raises(ClientDisconnect):
+            await response({"type": "http", "asgi": {"spec_version": "2.4"}}, receive, send)
+        assert events.broadcaster.subscriber_count() == 0
+
+    asyncio.run(scenario())
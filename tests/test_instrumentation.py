@@ -0,0 +1,35 @@
+from sqlalchemy import create_engine, text
+
+from backend.instrumentation import statement_shape, track_queries, stop_tracking
+
+
+#  UT-18-OB: Statements that differ only in literals share a shape
+def test_statement_shape_collapses_literals():
+    """Test ID: UT-18-OB - Literals and IN lists are normalized out of statement shapes."""
+    assert statement_shape("SELECT * FROM users WHERE id = 5") == statement_shape("SELECT *  FROM users\nWHERE id = 12")
+    assert statement_shape("SELECT 1 FROM t WHERE name = 'a''b'") == "SELECT ? FROM t WHERE name = ?"
+    assert statement_shape("SELECT x FROM t WHERE id IN (?, ?, ?)") == "SELECT x FROM t WHERE id IN (?)"
+
+
+#  IT-14: Repeated per-row queries in one request are flagged as N+1 candidates
+def test_track_queries_flags_n_plus_one():
+    """Test ID: IT-14 - Query count, DB time and N+1 shapes are recorded for the tracked context."""
+    engine = create_engine("sqlite:///:memory:")
+    stats, token = track_queries()
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            for user_id in range(6):
+                conn.execute(text("SELECT :id AS user_id"), {"id": user_id})
+    finally:
+        stop_tracking(token)
+
+    assert stats.count == 7
+    assert stats.total_time > 0
+    suspects = stats.n_plus_one(threshold=5)
+    assert len(suspects) == 1 and suspects[0][1] == 6
+
+    # Nothing is recorded once tracking has stopped
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 2"))
+    assert stats.count == 7
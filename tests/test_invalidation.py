@@ -0,0 +1,126 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+from backend.database import Base
+from backend.invalidation import DatabaseTransport, InvalidationBus, UnixSocketTransport, PROPAGATION_DELAY
+from backend.models import InvalidationEvent  # noqa: F401  (registers the table)
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def _recorder(bus, prefix):
+    received, arrived = [], threading.Event()
+
+    def callback(key):
+        received.append(key)
+        arrived.set()
+
+    bus.subscribe(prefix, callback)
+    return received, arrived
+
+
+#  UT-26-IB: A publish invalidates local subscribers by prefix and reaches another worker over Unix sockets
+def test_unix_socket_fanout(tmp_path):
+    """Test ID: UT-26-IB - Prefix matching, cross-bus delivery, no echo to the sender, delay recorded."""
+    worker_a = InvalidationBus(UnixSocketTransport(str(tmp_path)))
+    worker_b = InvalidationBus(UnixSocketTransport(str(tmp_path)))
+    local, _ = _recorder(worker_a, "exercise:")
+    remote, arrived = _recorder(worker_b, "exercise:")
+    users, _ = _recorder(worker_b, "user:")
+    worker_a.start()
+    worker_b.start()
+    try:
+        delays = sum(state[-1] for state in PROPAGATION_DELAY.samples().values())
+        worker_a.publish("catalog", "exercise:7")
+        assert arrived.wait(2)
+        assert local == ["exercise:7"]
+        assert remote == ["exercise:7"]
+        assert users == []
+        assert sum(state[-1] for state in PROPAGATION_DELAY.samples().values()) == delays + 1
+    finally:
+        worker_a.stop()
+        worker_b.stop()
+    assert list(tmp_path.glob("*.sock")) == []
+
+
+#  IT-18-IB: The change-counter table carries invalidations between workers sharing a database
+def test_database_transport(engine):
+    """Test ID: IT-18-IB - Rows written by one bus are polled and dispatched by another, once."""
+    transport_a, transport_b = DatabaseTransport(engine), DatabaseTransport(engine)
+    worker_a, worker_b = InvalidationBus(transport_a), InvalidationBus(transport_b)
+    remote, _ = _recorder(worker_b, "user:")
+    own, _ = _recorder(worker_a, "user:")
+
+    worker_a.publish("user:3")
+    worker_b.publish("user:4")
+    assert transport_a.flush() == 1 and transport_b.flush() == 1
+    assert transport_b.poll(worker_b.receive) == 2
+    assert remote == ["user:4", "user:3"]
+    assert transport_b.poll(worker_b.receive) == 0
+    assert transport_a.poll(worker_a.receive) == 2
+    assert own == ["user:3", "user:4"]
+
+
+#  IT-18-IO: A row whose id commits after a higher id was polled is still delivered
+def test_database_transport_out_of_order_commit(engine):
+    """Test ID: IT-18-IO - Late-committing lower ids inside the slack window arrive once; old rows are not replayed."""
+    transport = DatabaseTransport(engine, slack_seconds=5)
+    worker = InvalidationBus(transport)
+    received, _ = _recorder(worker, "exercise:")
+    with engine.begin() as conn:
+        conn.execute(InvalidationEvent.__table__.insert().values(
+            id=1, invalidated_keys="exercise:1", origin="old", sent_at=time.time() - 60))
+    transport.start(worker.receive)
+    transport.stop()
+
+    def insert(id_, key):
+        with engine.begin() as conn:
+            conn.execute(InvalidationEvent.__table__.insert().values(
+                id=id_, invalidated_keys=key, origin="other", sent_at=time.time()))
+
+    insert(10, "exercise:10")
+    assert transport.poll(worker.receive) == 1
+    insert(5, "exercise:5")  # took its id before 10 but committed after the poll
+    assert transport.poll(worker.receive) == 1
+    assert transport.poll(worker.receive) == 0
+    assert received == ["exercise:10", "exercise:5"]
+
+
+#  IT-18-WQ: Publishing on the db transport only queues; failed writes stay queued and are retried
+def test_database_transport_write_queue(engine, monkeypatch):
+    """Test ID: IT-18-WQ - publish() never touches the database; a failed flush keeps its rows for the next one."""
+    transport = DatabaseTransport(engine, poll_seconds=0.05)
+    worker = InvalidationBus(transport)
+    reader = DatabaseTransport(engine)
+    received = []
+
+    def unavailable():
+        raise RuntimeError("database unavailable")
+
+    monkeypatch.setattr(engine, "begin", unavailable)
+    worker.publish("user:8")
+    assert reader.poll(received.append) == 0
+    with pytest.raises(RuntimeError):
+        transport.flush()
+    monkeypatch.undo()
+
+    transport.start(worker.receive)
+    try:
+        deadline = time.time() + 2
+        while not received and time.time() < deadline:
+            reader.poll(received.append)
+            time.sleep(0.02)
+    finally:
+        transport.stop()
+    assert [message.keys for message in received] == [("user:8",)]
+    assert transport.flush() == 0
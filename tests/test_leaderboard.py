@@ -0,0 +1,100 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.database import Base
+from backend.leaderboard import Leaderboard, LeaderboardSet, week_start
+from backend.models import User, Exercise, WorkoutLog, UserStreak
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    for user_id in (1, 2, 3):
+        session.add(User(id=user_id, username=f"user{user_id}", email=f"user{user_id}@example.com"))
+    session.add(Exercise(id=1, name="Squats", description="Legs", toughness="Easy", suggested_reps=15))
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+#  UT-16-CB: Ranks follow score updates and ties share a rank
+def test_leaderboard_rank_and_top():
+    """Test ID: UT-16-CB - Incremental updates keep ranks and top-N ordered."""
+    board = Leaderboard()
+    board.increment(1, 5)
+    board.increment(2, 3)
+    board.increment(3, 3)
+    board.increment(2, 4)
+
+    assert board.rank(2) == 1
+    assert board.rank(1) == 2
+    assert board.rank(4) is None
+    assert [entry["user_id"] for entry in board.top(2)] == [2, 1]
+
+    board.set_score(1, 7)
+    assert board.rank(1) == 1 and board.rank(2) == 1
+    assert board.top(3)[2] == {"rank": 3, "user_id": 3, "score": 3}
+
+
+#  UT-17-OB: Lookups stay sub-millisecond on a large board
+def test_leaderboard_lookup_speed():
+    """Test ID: UT-17-OB - rank() and top() on 100k users average well under 1 ms."""
+    board = Leaderboard()
+    board.load({user_id: user_id % 997 for user_id in range(1, 100_001)})
+
+    start = time.perf_counter()
+    for user_id in range(1, 1001):
+        board.rank(user_id)
+        board.top(10)
+    per_call = (time.perf_counter() - start) / 2000
+    assert per_call < 0.001
+
+
+#  IT-11: Rebuild from the database matches the logged history
+def test_rebuild_from_db(db_session):
+    """Test ID: IT-11 - Weekly and all-time boards are rebuilt from logs and streak rows."""
+    this_week = datetime.combine(week_start(), datetime.min.time()) + timedelta(hours=1)
+    last_month = this_week - timedelta(days=30)
+    for user_id, when in [(1, last_month), (1, last_month), (1, this_week), (2, this_week), (2, this_week)]:
+        db_session.add(WorkoutLog(user_id=user_id, exercise_id=1, completed_at=when))
+    db_session.add(UserStreak(user_id=3, current_streak=2, longest_streak=9, last_activity_date=week_start()))
+    db_session.commit()
+
+    boards = LeaderboardSet()
+    boards.rebuild(db_session)
+
+    assert boards.board("workouts", "all_time").rank(1) == 1
+    assert boards.board("workouts", "weekly").rank(2) == 1
+    assert boards.board("streak", "all_time").score(3) == 9
+    assert boards.board("streak", "weekly").score(3) == 2
+
+
+#  IT-11-RU: Another worker's write reaches this worker's boards through the invalidation bus
+def test_remote_write_refreshes_user(db_session):
+    """Test ID: IT-11-RU - refresh_user() re-reads one user's scores; remote_only callbacks skip local publishes."""
+    from backend.invalidation import Invalidation, InvalidationBus
+
+    boards = LeaderboardSet()
+    boards.rebuild(db_session)
+    bus = InvalidationBus()
+    bus.subscribe("user:", lambda key: boards.refresh_user(db_session, int(key.split(":")[1])), remote_only=True)
+
+    db_session.add(WorkoutLog(user_id=2, exercise_id=1, completed_at=datetime.utcnow()))
+    db_session.add(UserStreak(user_id=2, current_streak=3, longest_streak=4, last_activity_date=week_start()))
+    db_session.commit()
+    bus.publish("user:2")  # this worker's own write: its routes already updated the boards
+    assert boards.board("workouts", "all_time").score(2) == 0
+
+    bus.receive(Invalidation(("user:2",), "another-worker", time.time()))
+    assert boards.board("workouts", "all_time").score(2) == 1
+    assert boards.board("workouts", "weekly").rank(2) == 1
+    assert boards.board("streak", "all_time").score(2) == 4
+    assert boards.board("streak", "weekly").score(2) == 3
@@ -0,0 +1,40 @@
+import json
+import logging
+import queue
+
+from backend.logger import JsonFormatter, NonBlockingQueueHandler, SamplingFilter
+
+
+def _record(level=logging.INFO, msg="hello %s", args=("world",), lineno=10, **extra):
+    record = logging.LogRecord("backend.test", level, "/app/backend/test.py", lineno, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+#  UT-21-OB: Records render as one JSON object with their extra fields
+def test_json_formatter_includes_extra_fields():
+    """Test ID: UT-21-OB - JSON output carries level, logger, message and `extra=` fields."""
+    entry = json.loads(JsonFormatter().format(_record(user_id=7)))
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "backend.test"
+    assert entry["msg"] == "hello world"
+    assert entry["user_id"] == 7
+    assert "ts" in entry
+
+
+#  UT-22-OB: DEBUG records are sampled per call site; a full queue drops instead of blocking
+def test_debug_sampling_and_non_blocking_queue():
+    """Test ID: UT-22-OB - 1 in 10 DEBUG records per call site pass; INFO always passes; overflow is counted."""
+    sampler = SamplingFilter(rate=0.1)
+    kept = sum(sampler.filter(_record(logging.DEBUG)) for _ in range(100))
+    other_site = sampler.filter(_record(logging.DEBUG, lineno=20))
+    assert kept == 10
+    assert other_site
+    assert all(sampler.filter(_record(logging.WARNING)) for _ in range(5))
+
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=2))
+    for _ in range(5):
+        handler.handle(_record())
+    assert handler.queue.qsize() == 2
+    assert handler.dropped == 3
+    assert handler.queue.get_nowait().getMessage() == "hello world"
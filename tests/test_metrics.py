@@ -0,0 +1,107 @@
+import threading
+
+from backend.metrics import Counter, Histogram, Registry, merge_snapshots, render
+
+
+#  UT-19-OB: Per-thread counter shards add up, and worker snapshots merge
+def test_counter_shards_and_worker_merge():
+    """Test ID: UT-19-OB - Counts from many threads and two workers are summed in the exposition."""
+    registry = Registry()
+    requests = registry.register(Counter("test_requests_total", "Requests.", ("route",)))
+
+    def work():
+        for _ in range(1000):
+            requests.inc(route="/exercises/")
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    snapshot = registry.snapshot()
+    text = render(merge_snapshots([snapshot, snapshot]))
+    assert 'test_requests_total{route="/exercises/"} 16000' in text
+
+
+#  UT-20-OB: Histogram buckets render cumulatively in Prometheus format
+def test_histogram_exposition():
+    """Test ID: UT-20-OB - Histogram renders cumulative buckets, _sum and _count."""
+    registry = Registry()
+    latency = registry.register(Histogram("test_latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0)))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        latency.observe(value, route="/login/")
+
+    text = render(merge_snapshots([registry.snapshot()]))
+    assert "# TYPE test_latency_seconds histogram" in text
+    assert 'test_latency_seconds_bucket{route="/login/",le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{route="/login/",le="1.0"} 3' in text
+    assert 'test_latency_seconds_bucket{route="/login/",le="+Inf"} 4' in text
+    assert 'test_latency_seconds_count{route="/login/"} 4' in text
+
+
+#  UT-19-PL: Every registered pool shows up under its own engine label; cache totals are counters
+def test_pools_and_caches_share_labelled_series(monkeypatch):
+    """Test ID: UT-19-PL - register_pool("replica") adds series next to "primary" instead of replacing them."""
+    from backend import metrics
+
+    monkeypatch.setattr(metrics, "_pool_sources", {})
+    monkeypatch.setattr(metrics, "_cache_sources", {})
+    registry = Registry()
+    metrics.register_collectors(registry)
+    metrics.register_pool("test_primary", lambda: {"size": 5, "checked_out": 1, "checkouts": 10})
+    metrics.register_pool("test_replica", lambda: {"size": 3, "checked_out": 0, "checkouts": 4})
+    metrics.register_cache("test_cache", lambda: {"hits": 3, "misses": 1})
+
+    text = render(metrics._add_hit_ratios(merge_snapshots([registry.snapshot()])))
+    assert 'flexfit_db_pool_size{engine="test_primary"} 5' in text
+    assert 'flexfit_db_pool_size{engine="test_replica"} 3' in text
+    assert 'flexfit_db_pool_checkouts_total{engine="test_replica"} 4' in text
+    assert "# TYPE flexfit_cache_hits_total counter" in text
+    assert 'flexfit_cache_hit_ratio{cache="test_cache"} 0.75' in text
+
+
+#  UT-20-ES: Event streams pass through the middleware stack unbuffered and are timed to their headers
+def test_event_stream_through_middleware():
+    """Test ID: UT-20-ES - An SSE response is recorded once its headers are sent; JSON is still timed and compressed."""
+    from fastapi import FastAPI
+    from fastapi.responses import StreamingResponse
+    from fastapi.testclient import TestClient
+
+    from backend import metrics
+    from backend.compression import CompressionMiddleware
+    from backend.instrumentation import SQLInstrumentationMiddleware
+
+    def recorded(route):
+        state = metrics.REQUEST_LATENCY.samples().get(("GET", route))
+        return state[-1] if state else 0
+
+    app = FastAPI()
+    app.add_middleware(SQLInstrumentationMiddleware)
+    app.add_middleware(CompressionMiddleware)
+    app.add_middleware(metrics.MetricsMiddleware)
+    seen_while_streaming = []
+
+    @app.get("/test-stream")
+    async def stream():
+        async def events():
+            yield "retry: 5000\n\n"
+            seen_while_streaming.append(recorded("/test-stream"))
+            yield "data: done\n\n"
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/test-json")
+    def catalog():
+        return [{"id": i, "name": f"Exercise {i}"} for i in range(200)]
+
+    before = recorded("/test-stream")
+    with TestClient(app) as client:
+        response = client.get("/test-stream", headers={"Accept-Encoding": "gzip"})
+        assert response.text == "retry: 5000\n\ndata: done\n\n"
+        assert "content-encoding" not in response.headers
+        assert seen_while_streaming == [before + 1]
+        assert recorded("/test-stream") == before + 1
+
+        json_before = recorded("/test-json")
+        assert client.get("/test-json", headers={"Accept-Encoding": "gzip"}).headers["content-encoding"] == "gzip"
+        assert recorded("/test-json") == json_before + 1
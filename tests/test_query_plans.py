@@ -0,0 +1,40 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from benchmarks.generate_dataset import PRESETS, generate
+from benchmarks.query_plans import check, report
+
+
+@pytest.fixture(scope="module")
+def seeded_engine(tmp_path_factory):
+    """The "tiny" synthetic dataset in a SQLite file, with planner statistics."""
+    url = f"sqlite:///{tmp_path_factory.mktemp('plans') / 'plans.db'}"
+    generate(url, PRESETS["tiny"], verbose=False)
+    engine = create_engine(url)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+    yield engine
+    engine.dispose()
+
+
+#  IT-15-QP: Every hot route query is served by an index
+def test_hot_queries_use_indexes(seeded_engine):
+    """Test ID: IT-15-QP - EXPLAIN QUERY PLAN shows no full scan of an indexed table."""
+    plans, violations = check(seeded_engine)
+    assert violations == [], report(violations)
+    assert any("ix_saved_exercises_user_exercise" in line for line in plans["saved_by_user"])
+
+
+#  IT-16-QP: A missing index is reported with the index to add
+def test_missing_index_is_flagged(seeded_engine):
+    """Test ID: IT-16-QP - Without the saved_exercises index the lookup scans and is flagged."""
+    with seeded_engine.begin() as conn:
+        conn.execute(text("DROP INDEX ix_saved_exercises_user_exercise"))
+    try:
+        _, violations = check(seeded_engine)
+        flagged = {v.query.name for v in violations}
+        assert flagged == {"saved_by_user", "saved_toggle_lookup"}
+        assert "ON saved_exercises (user_id, exercise_id)" in report(violations)
+    finally:
+        with seeded_engine.begin() as conn:
+            conn.execute(text("CREATE INDEX ix_saved_exercises_user_exercise ON saved_exercises (user_id, exercise_id)"))
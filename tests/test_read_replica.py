@@ -0,0 +1,64 @@
+import pytest
+from sqlalchemy import create_engine
+
+from backend.database import Base, RoutingSession, WriteTracker
+from backend.models import Exercise
+
+
+@pytest.fixture
+def engines(tmp_path):
+    """Two SQLite files standing in for the primary and the read replica."""
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for target in (primary, replica):
+        Base.metadata.create_all(bind=target)
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+def _names(session):
+    return sorted(name for (name,) in session.query(Exercise.name))
+
+
+#  IT-12: Reads go to the replica, writes go to the primary
+def test_routing_session_splits_reads_and_writes(engines):
+    """Test ID: IT-12 - A routing session reads from the replica and flushes to the primary."""
+    primary, replica = engines
+    with RoutingSession(primary=primary, replica=replica) as seed:
+        seed.info["primary"] = True
+        seed.add(Exercise(id=1, name="Lunges", description="Legs", toughness="Easy", suggested_reps=12))
+        seed.commit()
+
+    session = RoutingSession(primary=primary, replica=replica)
+    assert _names(session) == []  # replica has not caught up
+
+    session.add(Exercise(id=2, name="Burpees", description="Full body", toughness="Hard", suggested_reps=10))
+    session.commit()
+    session.close()
+
+    with RoutingSession(primary=primary, replica=primary) as check:
+        assert _names(check) == ["Burpees", "Lunges"]
+
+
+#  IT-13: A recent writer is pinned to the primary for the read-your-writes window
+def test_read_your_writes_pinning(engines):
+    """Test ID: IT-13 - Pinned sessions see the primary; the pin expires after the window."""
+    primary, replica = engines
+    with RoutingSession(primary=primary, replica=replica) as writer:
+        writer.add(Exercise(id=3, name="Plank", description="Core", toughness="Medium", suggested_reps=60))
+        writer.commit()
+
+    tracker = WriteTracker(window=60)
+    tracker.mark("user:7")
+    assert tracker.is_pinned("user:7")
+    assert not tracker.is_pinned("user:8")
+
+    pinned = RoutingSession(primary=primary, replica=replica)
+    pinned.info["primary"] = tracker.is_pinned("user:7")
+    assert _names(pinned) == ["Plank"]
+    pinned.close()
+
+    expired = WriteTracker(window=0)
+    expired.mark("user:7")
+    assert not expired.is_pinned("user:7")
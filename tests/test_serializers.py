@@ -0,0 +1,30 @@
+from datetime import datetime
+
+import msgpack
+from starlette.requests import Request
+
+from backend import serializers
+
+
+def _request(accept: str) -> Request:
+    return Request({"type": "http", "method": "GET", "path": "/progress/1",
+                    "headers": [(b"accept", accept.encode())]})
+
+
+#  UT-23-SR: Accept: application/msgpack gets MessagePack with the same content as JSON
+def test_msgpack_negotiation_matches_json():
+    """Test ID: UT-23-SR - MessagePack and JSON bodies decode to identical progress rows."""
+    rows = [{"date": datetime(2025, 3, 1, 8, 30), "height": 175.0, "weight": 70.5},
+            {"date": None, "height": None, "weight": 71.0}]
+
+    as_json = serializers.negotiated_response(_request("application/json"), serializers.progress_list, rows)
+    as_msgpack = serializers.negotiated_response(_request("application/msgpack, application/json;q=0.9"),
+                                                 serializers.progress_list, rows)
+
+    assert as_json.media_type == "application/json"
+    assert as_msgpack.media_type == "application/msgpack"
+    assert as_msgpack.headers["vary"] == "Accept"
+    decoded = msgpack.unpackb(as_msgpack.body)
+    assert decoded == [{"date": "2025-03-01T08:30:00", "height": 175.0, "weight": 70.5},
+                       {"date": None, "height": None, "weight": 71.0}]
+    assert serializers.progress_list.validate_json(as_json.body)[0]["date"] == rows[0]["date"]
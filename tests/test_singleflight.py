@@ -0,0 +1,81 @@
+import asyncio
+import threading
+import time
+
+from backend.singleflight import CoalescingCache, SingleFlight
+
+
+#  UT-27-SF: Concurrent identical misses run the load once and all get its result
+def test_concurrent_misses_share_one_load():
+    """Test ID: UT-27-SF - 20 threads missing the same key cause one load; the result is cached after."""
+    cache = CoalescingCache("test_catalog", maxsize=4)
+    loads = []
+    release = threading.Event()
+
+    def load():
+        loads.append(1)
+        release.wait(2)
+        return ["squat", "lunge"]
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("all", load))) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(loads) == 1
+    assert results == [["squat", "lunge"]] * 20
+    assert cache.get_or_load("all", load) == ["squat", "lunge"]
+    assert len(loads) == 1
+
+
+#  UT-27-SG: A write during a load keeps the stale result out of the cache; errors reach every waiter
+def test_invalidation_during_load_and_shared_errors():
+    """Test ID: UT-27-SG - invalidate() mid-load skips the store; a failing load raises for leader and waiters."""
+    cache = CoalescingCache("test_facets")
+
+    def stale_load():
+        cache.invalidate()
+        return {"tags": {"outdoor": 1}}
+
+    assert cache.get_or_load("facets", stale_load) == {"tags": {"outdoor": 1}}
+    assert cache.get_or_load("facets", lambda: {"tags": {}}) == {"tags": {}}
+
+    flight = SingleFlight("test_summary")
+
+    async def scenario():
+        calls = []
+
+        async def failing():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            raise RuntimeError("db down")
+
+        results = await asyncio.gather(*(flight.do_async(7, failing) for _ in range(5)), return_exceptions=True)
+        assert len(calls) == 1
+        assert all(isinstance(result, RuntimeError) for result in results)
+
+    asyncio.run(scenario())
+
+
+#  UT-27-SL: An invalidation racing the store never leaves the stale value behind
+def test_invalidation_between_check_and_store():
+    """Test ID: UT-27-SL - invalidate() arriving while _store() runs is applied after the value is set."""
+    cache = CoalescingCache("test_race")
+    real_set = cache.cache.set
+
+    def racing_set(key, value, ttl=None):
+        invalidator = threading.Thread(target=cache.invalidate)
+        invalidator.start()
+        invalidator.join(0.1)  # blocked behind _store's lock, so it can only run after the set
+        real_set(key, value, ttl=ttl)
+        cache.cache.set = real_set
+        racing_set.thread = invalidator
+
+    cache.cache.set = racing_set
+    assert cache.get_or_load("all", lambda: ["stale"]) == ["stale"]
+    racing_set.thread.join()
+    assert cache.get_or_load("all", lambda: ["fresh"]) == ["fresh"]
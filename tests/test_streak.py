@@ -0,0 +1,112 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.database import Base
+from backend.models import User, Exercise, ProgressLog, WorkoutLog, UserStreak
+from backend.streaks import record_activity, backfill_streaks, active_streak, get_streak
+
+# Each test gets its own in-memory SQLite database
+TEST_DATABASE_URL = "sqlite:///:memory:"
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    session.add(User(id=1, username="streaker", email="streak@example.com", password_hash="x"))
+    session.add(Exercise(id=1, name="Push-ups", description="Bodyweight", toughness="Easy", suggested_reps=20))
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+#  UT-10-CB: Consecutive days extend the streak, a gap resets it
+def test_record_activity_consecutive_and_gap(db_session):
+    """Test ID: UT-10-CB - Streak grows on consecutive days and resets after a gap."""
+    start = datetime(2025, 3, 1, 9, 0)
+    for offset in (0, 1, 2, 5):
+        record_activity(db_session, 1, start + timedelta(days=offset))
+    db_session.commit()
+
+    streak = db_session.get(UserStreak, 1)
+    assert streak.current_streak == 1
+    assert streak.longest_streak == 3
+    assert streak.last_activity_date == date(2025, 3, 6)
+
+
+#  UT-11-CB: Several logs on the same day count once
+def test_record_activity_same_day_is_idempotent(db_session):
+    """Test ID: UT-11-CB - Multiple logs on one day do not inflate the streak."""
+    when = datetime(2025, 3, 1, 8, 0)
+    record_activity(db_session, 1, when)
+    record_activity(db_session, 1, when + timedelta(hours=6))
+    db_session.commit()
+
+    assert db_session.get(UserStreak, 1).current_streak == 1
+
+
+#  UT-12-OB: A streak lapses once a full day is missed
+def test_active_streak_lapses(db_session):
+    """Test ID: UT-12-OB - Current streak reads as 0 after a missed day."""
+    record_activity(db_session, 1, datetime(2025, 3, 1))
+    record_activity(db_session, 1, datetime(2025, 3, 2))
+    db_session.commit()
+    streak = db_session.get(UserStreak, 1)
+
+    assert active_streak(streak, today=date(2025, 3, 3)) == 2
+    assert active_streak(streak, today=date(2025, 3, 4)) == 0
+    assert get_streak(db_session, 2)["streak"] == 0
+
+
+#  IT-09: Backfill rebuilds the incremental counters from history
+def test_backfill_matches_incremental(db_session):
+    """Test ID: IT-09 - Backfill from progress and workout logs matches incremental updates."""
+    start = datetime(2025, 1, 10, 7, 30)
+    days = [0, 1, 1, 2, 4, 5, 6, 7]
+    for i, offset in enumerate(days):
+        when = start + timedelta(days=offset)
+        if i % 2:
+            db_session.add(WorkoutLog(user_id=1, exercise_id=1, completed_at=when))
+        else:
+            db_session.add(ProgressLog(user_id=1, date=when, height=180, weight=80))
+    db_session.commit()
+
+    assert backfill_streaks(db_session) == 1
+    streak = db_session.get(UserStreak, 1)
+    assert (streak.current_streak, streak.longest_streak) == (4, 4)
+    assert streak.last_activity_date == date(2025, 1, 17)
+
+
+#  UT-12-AT: A session holding a stale streak row folds its day into the current one
+def test_record_activity_from_two_sessions(tmp_path):
+    """Test ID: UT-12-AT - Activity recorded through a stale session extends the streak another session wrote."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'streaks.db'}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    with Session() as setup:
+        setup.add(User(id=1, username="streaker", email="streak@example.com", password_hash="x"))
+        setup.commit()
+
+    first, second = Session(), Session()
+    try:
+        start = datetime(2025, 3, 1, 9, 0)
+        record_activity(first, 1, start)
+        first.commit()
+        stale = first.get(UserStreak, 1)  # held, so it stays in the identity map
+        assert stale.current_streak == 1
+        record_activity(second, 1, start + timedelta(days=1))
+        second.commit()
+        record_activity(first, 1, start + timedelta(days=2))
+        first.commit()
+        streak = second.get(UserStreak, 1, populate_existing=True)
+        assert (streak.current_streak, streak.longest_streak) == (3, 3)
+    finally:
+        first.close()
+        second.close()
+        engine.dispose()
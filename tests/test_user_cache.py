@@ -0,0 +1,49 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.database import Base, get_user_data, mark_user_write, user_profiles
+from backend.models import User
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def sample_user(db_session):
+    user = User(id=1, username="test", full_name="Test User", email="testuser@example.com",
+                password_hash="hashed_pwd", height="5'9", weight="70kg", gender="Male", role="user")
+    db_session.add(user)
+    db_session.commit()
+    return user
+
+
+#  UT-28-PC: Profiles are cached per engine, including unknown ids, until mark_user_write invalidates them
+def test_get_user_data_cache(db_session, sample_user):
+    """Test ID: UT-28-PC - Repeat reads skip the DB; an update shows after mark_user_write; 404s are cached too."""
+    mark_user_write(1)
+    misses = user_profiles.cache.misses
+    assert get_user_data(db_session, 1)["weight"] == "70kg"
+    assert get_user_data(db_session, 1)["weight"] == "70kg"
+    assert user_profiles.cache.misses == misses + 1
+
+    sample_user.weight = "72kg"
+    db_session.commit()
+    assert get_user_data(db_session, 1)["weight"] == "70kg"
+    mark_user_write(1)
+    assert get_user_data(db_session, 1)["weight"] == "72kg"
+
+    assert get_user_data(db_session, 404) is None
+    db_session.add(User(id=404, username="late", email="late@example.com"))
+    db_session.commit()
+    assert get_user_data(db_session, 404) is None
+    mark_user_write(404)
+    assert get_user_data(db_session, 404)["username"] == "late"
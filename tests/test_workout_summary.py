@@ -0,0 +1,52 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.database import Base
+from backend.models import Exercise, User, WorkoutLog
+from backend.routes.workouts import get_workout_summary
+
+
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    for user_id in (1, 2):
+        session.add(User(id=user_id, username=f"lifter{user_id}", email=f"lifter{user_id}@example.com"))
+    for exercise_id, name in enumerate(("Squats", "Lunges", "Burpees"), start=1):
+        session.add(Exercise(id=exercise_id, name=name, description="Desc", toughness="Easy", suggested_reps=10))
+    now = datetime.utcnow()
+    logs = [(1, 1, 1), (1, 1, 2), (1, 1, 40), (1, 2, 1), (1, 2, 50), (1, 3, 3), (2, 3, 1)]
+    for user_id, exercise_id, days_ago in logs:
+        session.add(WorkoutLog(user_id=user_id, exercise_id=exercise_id, completed_at=now - timedelta(days=days_ago)))
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _counts(summary):
+    return [(row["name"], row["times_completed"]) for row in summary]
+
+
+#  UT-31-WS: Completions are counted per exercise in the database and joined to names
+def test_summary_aggregation(db_session):
+    """Test ID: UT-31-WS - One row per exercise, most completed first, ties by name; other users excluded."""
+    summary = get_workout_summary(1, days=None, limit=None, db=db_session)
+    assert _counts(summary) == [("Squats", 3), ("Lunges", 2), ("Burpees", 1)]
+    assert summary[0]["exercise_id"] == 1
+    assert summary[0]["last_completed"] > summary[2]["last_completed"]  # 1 day ago vs 3
+    assert get_workout_summary(3, days=None, limit=None, db=db_session) == []
+
+
+#  UT-31-WP: days and limit narrow the aggregate
+def test_summary_days_and_limit(db_session):
+    """Test ID: UT-31-WP - days drops older logs before counting; limit keeps the N most completed."""
+    assert _counts(get_workout_summary(1, days=30, limit=None, db=db_session)) == [
+        ("Squats", 2), ("Burpees", 1), ("Lunges", 1)]
+    assert _counts(get_workout_summary(1, days=None, limit=2, db=db_session)) == [("Squats", 3), ("Lunges", 2)]
+    assert _counts(get_workout_summary(1, days=30, limit=1, db=db_session)) == [("Squats", 2)]